@@ -0,0 +1,128 @@
+"""
+Benchmark of the connection profiles on the write and read paths
+
+Run from the repository root:
+    python -m Tests.benchmarks.bench_profiles --titles 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from modules.commands.data_insert.data_insert import DataBulkInsert, DataInsert
+from modules.commands.data_sort.data_sort import DataSorter
+from modules.commands.data_update.data_update import DataUpdater
+from modules.db_config.db_config import DBConfig
+from modules.table_renderer.table_renderer import TableRenderer
+
+SCHEMA = """CREATE TABLE MOVIES (
+            ID INTEGER PRIMARY KEY,
+            TITLE text,
+            YEAR integer,
+            RUNTIME integer,
+            GENRE text,
+            DIRECTOR text,
+            CAST text,
+            WRITER text,
+            LANGUAGE text,
+            COUNTRY text,
+            AWARDS text,
+            IMDb_Rating float,
+            IMDb_votes integer,
+            BOX_OFFICE integer)"""
+
+
+def respond(title):
+    """
+    Fake API respond of the numbered title
+    :param title: e.g. 'Title 7'
+    :return:
+    """
+    number = int(title.split()[-1])
+    return {'Title': title, 'Year': str(1950 + number % 70),
+            'Runtime': f'{80 + number % 100} min', 'Genre': 'Drama',
+            'Director': 'Director', 'Writer': 'Writer', 'Actors': 'Actors',
+            'Language': 'English', 'Country': 'USA', 'Awards': 'N/A',
+            'imdbRating': str(number % 100 / 10), 'imdbVotes': f'{number:,}',
+            'BoxOffice': f'${number * 1000:,}', 'Response': 'True'}
+
+
+class StubDataUpdater(DataUpdater):
+    """ Update of the whole pipeline with responds made up instead of the
+    API """
+
+    async def stream_update(self, start_id=None):
+        async def fetch(title):
+            return respond(title)
+
+        await self.run_pipeline(fetch, start_id)
+
+
+def timed(function):
+    """
+    Seconds spent by the function
+    :param function:
+    :return:
+    """
+
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def bench_profile(profile, titles, commits, directory):
+    """
+    Timing every path with a fresh database
+    :param profile:
+    :param titles: number of titles written in batches
+    :param commits: number of titles inserted one transaction each
+    :param directory:
+    :return:
+    """
+
+    path = os.path.join(directory, f'{profile}.sqlite')
+    db = DBConfig(db_name=path, profile=profile)
+    with db.conn:
+        db.c.execute(SCHEMA)
+    db.ensure_indexes()
+    db.ensure_types()
+
+    data_bulk_insert = DataBulkInsert(db=db, batch_size=10000)
+    data_updater = StubDataUpdater(db=db, batch_size=10000, cache_path=None,
+                                   daily_budget=None)
+    data_sorter = DataSorter(db=db)
+
+    def insert_single():
+        for number in range(commits):
+            DataInsert(db=db).handle(f'Single {number}')
+
+    results = {
+        'Profile': profile,
+        'insert (1 tx each)': timed(insert_single),
+        'insert_from': timed(lambda: data_bulk_insert.insert_titles(
+            f'Title {number}' for number in range(titles))),
+        'update': timed(lambda: data_updater.handle(parameter=True)),
+        'sort_by year': timed(lambda: sum(
+            1 for _ in data_sorter.stream(parameter='year')))}
+
+    db.conn.close()
+
+    return {key: value if key == 'Profile' else f'{value:.3f} s'
+            for key, value in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--commits', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [bench_profile(profile, args.titles, args.commits, directory)
+                   for profile in DBConfig.profiles]
+
+    TableRenderer().render(results)
+
+
+if __name__ == '__main__':
+    main()
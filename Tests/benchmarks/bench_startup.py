@@ -0,0 +1,91 @@
+"""
+Benchmark of the startup - import time of movies_db and of the handlers
+of single commands measured by python -X importtime, compared with every
+handler imported at once as the program did before the lazy imports
+
+Run from the repository root:
+    python -m Tests.benchmarks.bench_startup --max_share 0.6
+"""
+import argparse
+import subprocess
+import sys
+
+from modules.table_renderer.table_renderer import TableRenderer
+
+# Imports done by the program for the command
+COMMANDS = {
+    'startup': 'import movies_db',
+    'sort_by': "import movies_db; movies_db.load('DataSorter')",
+    'filter_by': "import movies_db; movies_db.load('DataFilter')",
+    'highscores': "import movies_db; movies_db.load('DataHighscores')",
+    'update': "import movies_db; movies_db.load('DataUpdater')"}
+
+# Every handler imported on startup
+EAGER = 'import movies_db\nfor name in movies_db.LAZY_IMPORTS: movies_db.load(name)'
+
+
+def import_time(code):
+    """
+    Cumulative import time of the code in milliseconds, best of 5 runs
+    :param code:
+    :return:
+    """
+
+    times = []
+    for _ in range(5):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                  code], capture_output=True, text=True,
+                                 check=True)
+
+        # Every top level import, cumulative time in microseconds
+        total = 0
+        for line in process.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].startswith(' ') and \
+                    not fields[2].startswith('  ') and fields[1].strip().isdigit():
+                total += int(fields[1])
+        times.append(total / 1000)
+
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max_share', type=float, default=0.6,
+                        help='max import time of read-only commands as a '
+                             'share of every handler imported at once')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='max milliseconds of read-only commands, '
+                             'depends on the machine')
+    args = parser.parse_args()
+
+    # Imports of the interpreter itself, e.g. site
+    baseline = import_time('pass')
+    eager = import_time(EAGER) - baseline
+
+    results = [{'Command': 'every handler',
+                'Import time': f'{eager:.1f} ms', 'Share': '100%',
+                'Status': '-'}]
+    over_budget = False
+    for command, code in COMMANDS.items():
+        milliseconds = import_time(code) - baseline
+        share = milliseconds / eager if eager > 0 else 0.0
+
+        checked = command != 'update'  # Update imports the network stack
+        within = not checked or share <= args.max_share and (
+            args.budget is None or milliseconds <= args.budget)
+        over_budget = over_budget or not within
+
+        results.append({'Command': command,
+                        'Import time': f'{milliseconds:.1f} ms',
+                        'Share': f'{share:.0%}',
+                        'Status': 'OK' if within else 'Over budget'})
+
+    TableRenderer().render(results)
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of repeated commands - values formatted into the statement text
+versus bound to the cached prepared statement of the handler
+
+Run from the repository root:
+    python -m Tests.benchmarks.bench_statements --calls 20000
+"""
+import argparse
+import time
+
+from Tests.benchmarks.bench_profiles import SCHEMA
+from modules.commands.data_delete.data_delete import DataDelete
+from modules.commands.data_filter.data_filter import DataFilter
+from modules.commands.data_insert.data_insert import DataInsert
+from modules.db_config.db_config import DBConfig
+from modules.table_renderer.table_renderer import TableRenderer
+
+
+def per_call(function, calls):
+    """
+    Microseconds spent by single call of the function
+    :param function: called with the number of the call
+    :param calls:
+    :return:
+    """
+
+    start = time.perf_counter()
+    for number in range(calls):
+        function(number)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def literal_calls(db):
+    """
+    Commands of the statements with formatted values, every text is new
+    :param db:
+    :return:
+    """
+    table = db.movies_table
+
+    return {
+        'insert': lambda number: db.c.execute(
+            f"INSERT INTO {table}(title) VALUES('Title {number}')"),
+        'filter_by title': lambda number: db.c.execute(
+            f"SELECT {table}.title, {table}.title FROM {table} "
+            f"WHERE {table}.title LIKE '%Title {number}%';").fetchall(),
+        'delete': lambda number: db.c.execute(
+            f"DELETE FROM {table} WHERE title = 'Title {number}'")}
+
+
+def handler_calls(db):
+    """
+    Commands of the handlers with bound values
+    :param db:
+    :return:
+    """
+    data_insert = DataInsert(db=db)
+    data_filter = DataFilter(db=db)
+    data_delete = DataDelete(db=db)
+
+    return {
+        'insert': lambda number: data_insert.insert_title(f'Title {number}'),
+        'filter_by title': lambda number: data_filter.handle(
+            ['title', f'Title {number}']),
+        'delete': lambda number: data_delete.delete_title(f'Title {number}')}
+
+
+def bench(calls, filters):
+    """
+    Timing every command both ways with a fresh database
+    :param calls: number of inserted and deleted titles
+    :param filters: number of filters, each one scans the table
+    :return:
+    """
+
+    results = []
+    for name, create_calls in (('before', literal_calls),
+                               ('after', handler_calls)):
+        db = DBConfig(db_name=':memory:')
+        with db.conn:
+            db.c.execute(SCHEMA)
+        db.ensure_indexes()
+
+        commands = create_calls(db)
+        with db.transaction():
+            timings = {
+                'insert': per_call(commands['insert'], calls),
+                'filter_by title': per_call(commands['filter_by title'],
+                                            filters),
+                'delete': per_call(commands['delete'], calls)}
+
+        results.append({'Statements': name, **{
+            command: f'{value:.1f} us' for command, value in timings.items()}})
+        db.conn.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--filters', type=int, default=200)
+    args = parser.parse_args()
+
+    TableRenderer().render(bench(args.calls, args.filters))
+
+
+if __name__ == '__main__':
+    main()
@@ -67,10 +67,11 @@ def commands_working():
 
 
 @pytest.fixture(scope='module')
-def handlers(database):
+def handlers(database, tmp_path_factory):
     """ Fixture of handlers to test """
 
-    handlers = [DataUpdater(database), DataSorter(database), DataFilter(database),
+    cache_path = str(tmp_path_factory.mktemp('cache') / 'omdb_cache.sqlite')
+    handlers = [DataUpdater(database, cache_path=cache_path), DataSorter(database), DataFilter(database),
                 DataCompare(database), DataInsert(database), DataDelete(database)]
 
     yield handlers
@@ -86,3 +87,54 @@ def test_handle_commands(commands_working, handlers):
     end = timer()
     print(timedelta(seconds=end - start))
 
+
+
+def test_lazy_imports():
+    """
+    Testing handlers are imported only when they are used
+    """
+
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    code = ("import sys, movies_db\n"
+            "assert 'requests' not in sys.modules\n"
+            "assert 'modules.commands.data_update.data_update' not in sys.modules\n"
+            "from movies_db import DataFilter\n"
+            "assert 'modules.commands.data_filter.data_filter' in sys.modules\n"
+            "assert 'requests' not in sys.modules\n")
+
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+
+
+def test_read_command_doesnt_write(tmp_path):
+    """
+    Testing read commands open the database as it is
+    :param tmp_path:
+    """
+
+    import os
+    import subprocess
+    import sys
+
+    db_name = str(tmp_path / 'movies.sqlite')
+    conn = sqlite3.connect(db_name)
+    with conn:
+        conn.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, YEAR integer, DIRECTOR text)""")
+        conn.execute("INSERT INTO MOVIES(TITLE, YEAR) VALUES ('Memento', 2000)")
+    conn.close()
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    subprocess.run([sys.executable, 'movies_db.py', '--db_name', db_name,
+                    '--sort_by', 'year', '--highscores'], cwd=root,
+                   check=True, stdout=subprocess.DEVNULL)
+
+    conn = sqlite3.connect(db_name)
+    names = [row[0] for row in conn.execute('SELECT name FROM sqlite_master')]
+    conn.close()
+    assert names == ['MOVIES']
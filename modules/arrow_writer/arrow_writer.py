@@ -0,0 +1,239 @@
+import itertools
+import os
+import sqlite3
+from datetime import datetime
+
+
+class ArrowWriter:
+    """ Creating parquet or arrow IPC file with typed columns """
+
+    def __init__(self, path=None, file_format='parquet', batch_size=10000,
+                 declared_types=None):
+        self.title = 'None'
+        self.path = path  # Timestamped file in the current dir if None
+        self.file_format = file_format  # 'parquet' or 'arrow'
+        self.batch_size = batch_size  # Rows of single row group / batch
+
+        # Declared types of the movies table by upper column name
+        self.declared_types = declared_types or {}
+
+        self.rows_written = 0
+        self.bytes_written = 0
+
+    @staticmethod
+    def import_pyarrow():
+        """
+        Optional dependency imported only for the export
+        :return:
+        """
+
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError('parquet and arrow export requires the pyarrow '
+                             'package')
+
+        return pyarrow
+
+    @staticmethod
+    def declared_type(declared_type):
+        """
+        Arrow type of the column by its declared type, see
+        https://www.sqlite.org/datatype3.html#determination_of_column_affinity
+        :param declared_type:
+        :return:
+        """
+
+        declared_type = declared_type.upper()
+
+        if 'INT' in declared_type:
+            return 'int64'
+        if any(real in declared_type for real in ('REAL', 'FLOA', 'DOUB')):
+            return 'float64'
+
+        return 'string'
+
+    @classmethod
+    def column_types(cls, fieldnames, rows, declared_types=None):
+        """
+        Arrow type of every column by its declared type, other columns by
+        the values of the rows, integers mixed with floats are floats, any
+        other mix is a string
+        :param fieldnames:
+        :param rows: sequences of values
+        :param declared_types: declared types by upper column name
+        :return:
+        """
+
+        declared_types = declared_types or {}
+
+        types = []
+        for index, name in enumerate(fieldnames):
+            if name.upper() in declared_types:
+                types.append(cls.declared_type(declared_types[name.upper()]))
+                continue
+
+            value_types = {type(row[index]) for row in rows
+                           if row[index] is not None}
+
+            if value_types and value_types <= {int}:
+                types.append('int64')
+            elif value_types and value_types <= {int, float}:
+                types.append('float64')
+            elif value_types and value_types <= {bytes}:
+                types.append('binary')
+            else:
+                types.append('string')
+
+        return types
+
+    @staticmethod
+    def unique_names(fieldnames):
+        """
+        Column names of the file, e.g. filtering by title selects it twice
+        :param fieldnames:
+        :return:
+        """
+
+        names = []
+        for name in fieldnames:
+            unique_name, number = name, 1
+            while unique_name in names:
+                unique_name = f'{name}_{number}'
+                number += 1
+            names.append(unique_name)
+
+        return names
+
+    def write(self, keyword, data):
+        """
+        Saving results query batch by batch
+        :param keyword:
+        :param data: iterable of rows
+        :return:
+        """
+
+        pyarrow = self.import_pyarrow()
+
+        rows = iter(data)
+        try:
+            first_row = next(rows)
+        except StopIteration:
+            raise IndexError('No results to write')
+
+        fieldnames = list(first_row.keys())
+
+        # Values in order of the header
+        if isinstance(first_row, sqlite3.Row):
+            row_values = tuple
+        else:
+            def row_values(row):
+                return [row[key] for key in fieldnames]
+
+        values = map(row_values, itertools.chain([first_row], rows))
+
+        # Columns computed by the statement, e.g. counts, are typed by the
+        # first batch, integers mixed with floats in it are floats, a value
+        # of other type in the next batches fails the export
+        batch = list(itertools.islice(values, self.batch_size))
+        types = self.column_types(fieldnames, batch, self.declared_types)
+
+        schema = pyarrow.schema(
+            [(name, getattr(pyarrow, column_type)())
+             for name, column_type in zip(self.unique_names(fieldnames), types)])
+
+        self.title = self.path or self.create_title(keyword)
+        self.rows_written = 0
+
+        writer = self.open_writer(pyarrow, schema)
+        try:
+            while batch:
+                self.write_batch(pyarrow, writer, schema, types, batch)
+                batch = list(itertools.islice(values, self.batch_size))
+        except BaseException:
+            # No partial file is left
+            writer.close()
+            os.remove(self.title)
+            raise
+
+        writer.close()
+
+        self.bytes_written = os.path.getsize(self.title)
+
+    def open_writer(self, pyarrow, schema):
+        """
+        Writer of the chosen file format
+        :param pyarrow:
+        :param schema:
+        :return:
+        """
+
+        if self.file_format == 'parquet':
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(self.title, schema)
+
+        if self.file_format == 'arrow':
+            import pyarrow.ipc
+            return pyarrow.ipc.new_file(self.title, schema)
+
+        raise ValueError(f'Unknown export format: {self.file_format}')
+
+    def write_batch(self, pyarrow, writer, schema, types, batch):
+        """
+        Writing single batch of rows as a row group / record batch
+        :param pyarrow:
+        :param writer:
+        :param schema:
+        :param types:
+        :param batch:
+        :return:
+        """
+
+        arrays = []
+        for column_type, field, column in zip(types, schema, zip(*batch)):
+            if column_type == 'string':
+                column = [None if value is None else str(value)
+                          for value in column]
+
+            # Floats would be truncated silently
+            if column_type == 'int64' and \
+                    any(isinstance(value, float) for value in column):
+                raise ValueError(f'Column {field.name} changed its type: '
+                                 f'float in an integer column')
+
+            try:
+                arrays.append(pyarrow.array(column, type=field.type))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as e:
+                raise ValueError(f'Column {field.name} changed its type: {e}')
+
+        table = pyarrow.Table.from_arrays(arrays, schema=schema)
+
+        if self.file_format == 'parquet':
+            writer.write_table(table)
+        else:
+            for record_batch in table.to_batches():
+                writer.write_batch(record_batch)
+
+        self.rows_written += len(batch)
+
+    def create_title(self, keyword):
+        """
+        Creating title for every operation with timestamp
+        :param keyword:
+        :return:
+        """
+
+        date = str(datetime.now().strftime('%Y-%m-%d_%H:%M:%S'))
+        title = date
+
+        title += '_' + keyword + '.' + self.file_format
+
+        return title
+
+    def report(self):
+        """
+        Summary of written file
+        :return:
+        """
+        return (f'Written {self.rows_written} rows, {self.bytes_written} bytes '
+                f'to {self.title}')
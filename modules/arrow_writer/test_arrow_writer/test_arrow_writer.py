@@ -0,0 +1,150 @@
+import sqlite3
+
+import pytest
+
+from modules.arrow_writer.arrow_writer import ArrowWriter
+
+
+@pytest.fixture(scope='module')
+def database():
+    """ Setup of the database before tests """
+
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    with conn:
+        conn.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, RUNTIME text, IMDb_Rating float,
+                        BOX_OFFICE integer)""")
+        conn.executemany("""INSERT INTO MOVIES(TITLE, RUNTIME, IMDb_Rating,
+                            BOX_OFFICE) VALUES (?, ?, ?, ?)""",
+                         [('Memento', '113 min', 8.4, 25544867),
+                          ('In Bruges', '107 min', 7.9, None),
+                          ('Gods', None, None, None)])
+
+    yield conn
+
+
+def test_column_types(database):
+    """
+    Testing types of the columns inferred from the rows
+    :param database:
+    """
+
+    rows = [tuple(row) for row in database.execute(
+        'SELECT title, runtime, imdb_rating, box_office FROM MOVIES')]
+    types = ArrowWriter.column_types(['title', 'runtime', 'imdb_rating',
+                                      'box_office'], rows)
+    assert types == ['string', 'string', 'float64', 'int64']
+
+    # Mixed values and empty columns
+    assert ArrowWriter.column_types(['a', 'b', 'c'],
+                                    [(1, 1, None), (2.5, 'N/A', None)]) == \
+        ['float64', 'string', 'string']
+
+    # Declared types win over the values, numeric columns of computed
+    # values are typed by every value
+    assert ArrowWriter.column_types(
+        ['box_office', 'imdb_rating', 'runtime', 'max_val'],
+        [(None, None, None, 1), (None, 8, 96, 2.5)],
+        {'BOX_OFFICE': 'integer', 'IMDB_RATING': 'float',
+         'RUNTIME': 'text'}) == ['int64', 'float64', 'string', 'float64']
+    assert ArrowWriter.declared_type('DOUBLE PRECISION') == 'float64'
+    assert ArrowWriter.declared_type('') == 'string'
+
+    assert ArrowWriter.unique_names(['TITLE', 'TITLE', 'YEAR']) == \
+        ['TITLE', 'TITLE_1', 'YEAR']
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_write(database, tmp_path, file_format):
+    """
+    Testing typed file written in batches
+    :param database:
+    :param tmp_path:
+    :param file_format:
+    """
+
+    pyarrow = pytest.importorskip('pyarrow')
+
+    path = str(tmp_path / f'movies.{file_format}')
+    arrow_writer = ArrowWriter(path=path, file_format=file_format, batch_size=2)
+    arrow_writer.write(keyword='sort_by', data=database.execute(
+        'SELECT title, imdb_rating, box_office FROM MOVIES ORDER BY id'))
+
+    if file_format == 'parquet':
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(path)
+    else:
+        import pyarrow.ipc
+        table = pyarrow.ipc.open_file(path).read_all()
+
+    assert arrow_writer.rows_written == 3
+    assert str(table.schema.field('IMDb_Rating').type) == 'double'
+    assert str(table.schema.field('BOX_OFFICE').type) == 'int64'
+    assert table.column('BOX_OFFICE').to_pylist() == [25544867, None, None]
+
+
+def test_write_declared(database, tmp_path):
+    """
+    Testing columns typed as declared when the first batch has no values
+    and no partial file left by a value of other type
+    :param database:
+    :param tmp_path:
+    """
+
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    declared_types = {'TITLE': 'text', 'RUNTIME': 'text',
+                      'IMDB_RATING': 'float', 'BOX_OFFICE': 'integer'}
+
+    path = str(tmp_path / 'movies.parquet')
+    arrow_writer = ArrowWriter(path=path, batch_size=1,
+                               declared_types=declared_types)
+    arrow_writer.write(keyword='sort_by', data=database.execute(
+        'SELECT title, imdb_rating, box_office FROM MOVIES ORDER BY id DESC'))
+
+    table = pyarrow.parquet.read_table(path)
+    assert str(table.schema.field('IMDb_Rating').type) == 'double'
+    assert str(table.schema.field('BOX_OFFICE').type) == 'int64'
+    assert table.column('IMDb_Rating').to_pylist() == [None, 7.9, 8.4]
+
+    # Fail case - text in a column declared as integer
+    path = str(tmp_path / 'broken.parquet')
+    arrow_writer = ArrowWriter(path=path, batch_size=1,
+                               declared_types=declared_types)
+    with pytest.raises(ValueError):
+        arrow_writer.write(keyword='sort_by', data=database.execute(
+            """SELECT title, runtime AS box_office FROM MOVIES
+               ORDER BY id DESC"""))
+    assert not (tmp_path / 'broken.parquet').exists()
+
+
+def test_write_computed(tmp_path):
+    """
+    Testing columns computed by the statement typed by the first batch
+    :param tmp_path:
+    """
+
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    rows = [{'col_name': 'YEAR', 'max_val': 2013},
+            {'col_name': 'IMDb_Rating', 'max_val': 8.4},
+            {'col_name': 'RUNTIME', 'max_val': 113}]
+
+    # Integers widened to floats mixed in the first batch
+    path = str(tmp_path / 'stats.parquet')
+    arrow_writer = ArrowWriter(path=path, batch_size=2)
+    arrow_writer.write(keyword='stats', data=iter(rows))
+
+    table = pyarrow.parquet.read_table(path)
+    assert str(table.schema.field('max_val').type) == 'double'
+    assert table.column('max_val').to_pylist() == [2013.0, 8.4, 113.0]
+
+    # Fail case - float after the integers of the first batch
+    path = str(tmp_path / 'broken.parquet')
+    arrow_writer = ArrowWriter(path=path, batch_size=1)
+    with pytest.raises(ValueError):
+        arrow_writer.write(keyword='stats', data=iter(rows))
+    assert not (tmp_path / 'broken.parquet').exists()
@@ -0,0 +1,176 @@
+import json
+import shlex
+import sys
+from contextlib import ExitStack
+
+from modules.cli.cli import CLInterface
+
+
+class BatchRunner:
+    """ Running a script of commands on a single connection """
+
+    def __init__(self, db, create_handler, output, keywords,
+                 transaction_size=1000):
+        self.db = db  # DB shared by every command
+        self.create_handler = create_handler  # (keyword, db, commands)
+        self.output = output  # Writing results of (keyword, results, commands)
+        self.keywords = keywords  # Keywords of commands in order of running
+        self.transaction_size = transaction_size  # Writes committed at once
+
+        # Writes joining the transaction of the batch, other commands
+        # e.g. update manage transactions on their own
+        self.grouped = ('insert', 'delete', 'insert_from', 'delete_from')
+
+        self.group = None  # Open transaction of grouped writes
+        self.commands_run = 0
+        self.writes_pending = 0
+
+    @staticmethod
+    def line_args(line):
+        """
+        Arguments of a single line - json object of options and values,
+        e.g. {"insert": ["Memento"]}, or command line options
+        :param line:
+        :return:
+        """
+
+        if not line.lstrip().startswith('{'):
+            return shlex.split(line, comments=True)
+
+        args = []
+        for option, value in json.loads(line).items():
+            if value is True:
+                args.append(f'--{option}')
+            elif value is False or value is None:
+                continue
+            elif isinstance(value, list):
+                args += [f'--{option}'] + [str(item) for item in value]
+            else:
+                args += [f'--{option}', str(value)]
+
+        return args
+
+    def read_script(self, source):
+        """
+        Commands of the script with their line numbers
+        :param source: path of the file, '-' is stdin
+        :return:
+        """
+
+        if source == '-':
+            yield from self.script_lines(sys.stdin)
+        else:
+            with open(source, encoding='utf-8') as file:
+                yield from self.script_lines(file)
+
+    def script_lines(self, file):
+        """
+        Parsed commands of the not empty lines
+        :param file:
+        :return:
+        """
+
+        for line_number, line in enumerate(file, start=1):
+            try:
+                args = self.line_args(line)
+            except ValueError as e:
+                raise ValueError(f'Line {line_number}: {e}')
+
+            if not args:
+                continue
+
+            try:
+                commands = CLInterface.get_args(args)
+            except SystemExit:
+                # Parser has already printed the reason
+                raise ValueError(f'Line {line_number}: invalid command')
+
+            yield line_number, commands
+
+    def run(self, source):
+        """
+        Running every command of the script, grouped writes are committed
+        every transaction_size commands, error rolls back pending writes
+        :param source:
+        :return: number of commands run
+        """
+
+        line_number = 0
+        try:
+            for line_number, commands in self.read_script(source):
+                for keyword in self.keywords:
+                    if commands.get(keyword):
+                        self.run_command(keyword, commands)
+        except Exception as e:
+            self.abort(e)
+            raise ValueError(f'Line {line_number}: {e}, uncommitted writes '
+                             f'rolled back')
+
+        self.flush()
+
+        return self.commands_run
+
+    def run_command(self, keyword, commands):
+        """
+        Running single command, writes join the transaction of the batch
+        :param keyword:
+        :param commands:
+        :return:
+        """
+
+        if keyword in self.grouped:
+            self.begin()
+        else:
+            self.flush()
+
+        handler = self.create_handler(keyword, self.db, commands)
+        results = handler.stream(parameter=commands[keyword])
+
+        # Results are written before the next command
+        try:
+            self.output(keyword, results, commands)
+        except IndexError:
+            print(f'{keyword} error: No results found for '
+                  f'{commands[keyword]}', file=sys.stderr)
+
+        self.commands_run += 1
+
+        if keyword in self.grouped:
+            self.writes_pending += 1
+            if self.writes_pending >= self.transaction_size:
+                self.flush()
+
+    def begin(self):
+        """
+        Opening transaction of grouped writes
+        :return:
+        """
+
+        if self.group is None:
+            self.group = ExitStack()
+            self.group.enter_context(self.db.transaction())
+
+    def flush(self):
+        """
+        Committing grouped writes
+        :return:
+        """
+
+        if self.group is not None:
+            group, self.group = self.group, None
+            group.close()
+
+        self.writes_pending = 0
+
+    def abort(self, error):
+        """
+        Rolling back grouped writes
+        :param error:
+        :return:
+        """
+
+        if self.group is not None:
+            group, self.group = self.group, None
+            group.__exit__(type(error), error, error.__traceback__)
+
+        self.writes_pending = 0
@@ -0,0 +1,115 @@
+import pytest
+
+from modules.batch_runner.batch_runner import BatchRunner
+from modules.commands.data_delete.data_delete import DataDelete
+from modules.commands.data_filter.data_filter import DataFilter
+from modules.commands.data_insert.data_insert import DataInsert
+from modules.db_config.db_config import DBConfig
+
+HANDLERS = {'insert': DataInsert, 'delete': DataDelete, 'filter_by': DataFilter}
+
+
+@pytest.fixture
+def database():
+    """ Setup of the database before every test """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text UNIQUE, DIRECTOR text)""")
+
+    yield db
+
+
+def batch_runner(db, outputs, transaction_size=1000):
+    """
+    Batch runner collecting the results
+    :param db:
+    :param outputs:
+    :param transaction_size:
+    :return:
+    """
+
+    def output(keyword, results, commands):
+        outputs.append((keyword, [dict(result) for result in results]))
+
+    return BatchRunner(db=db,
+                       create_handler=lambda keyword, db, commands:
+                       HANDLERS[keyword](db=db),
+                       output=output, keywords=tuple(HANDLERS),
+                       transaction_size=transaction_size)
+
+
+def titles(db):
+    """
+    Titles in the db in order of inserting
+    :param db:
+    :return:
+    """
+
+    rows = db.conn.execute('SELECT title FROM MOVIES ORDER BY id').fetchall()
+    return [row['title'] for row in rows]
+
+
+def test_line_args():
+    """
+    Testing both formats of the script lines
+    """
+
+    assert BatchRunner.line_args('--insert "Kac Wawa" 1917') == \
+        ['--insert', 'Kac Wawa', '1917']
+    assert BatchRunner.line_args('# comment') == []
+    assert BatchRunner.line_args('{"compare": ["year", "Memento", "Gods"], '
+                                 '"write_csv": true, "csv_path": null}') == \
+        ['--compare', 'year', 'Memento', 'Gods', '--write_csv']
+
+
+def test_run(database, tmp_path):
+    """
+    Testing commands of the script run in order on one connection
+    :param database:
+    :param tmp_path:
+    """
+
+    script = tmp_path / 'script.txt'
+    script.write_text('--insert Memento Gods\n'
+                      '\n'
+                      '{"insert": ["In Bruges"]}\n'
+                      '--delete Gods\n'
+                      '--filter_by title e\n')
+
+    outputs = []
+    assert batch_runner(database, outputs).run(str(script)) == 4
+
+    keyword, results = outputs[-1]
+    assert keyword == 'filter_by'
+    assert sorted(result['TITLE'] for result in results) == ['In Bruges',
+                                                             'Memento']
+    assert titles(database) == ['Memento', 'In Bruges']
+    assert not database.conn.in_transaction
+
+
+def test_run_error(database, tmp_path):
+    """
+    Testing writes of a failed script are rolled back since the last commit
+    :param database:
+    :param tmp_path:
+    """
+
+    script = tmp_path / 'script.jsonl'
+    script.write_text('{"insert": ["Memento"]}\n'
+                      '{"insert": ["Gods"]}\n'
+                      '{"insert": ["In Bruges"]}\n'
+                      '{"insert": ["Memento"]}\n')
+
+    with pytest.raises(ValueError) as exec_info:
+        batch_runner(database, [], transaction_size=2).run(str(script))
+
+    assert 'Line 4' in str(exec_info.value)
+    assert titles(database) == ['Memento', 'Gods']
+
+    # Fail case - unknown option
+    script.write_text('--insert Kac\n--dance\n')
+    with pytest.raises(ValueError):
+        batch_runner(database, []).run(str(script))
+    assert titles(database) == ['Memento', 'Gods']
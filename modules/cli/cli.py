@@ -5,9 +5,10 @@ class CLInterface(object):
     """ Command Line Interface """
 
     @staticmethod
-    def get_args():
+    def get_args(argv=None):
         """
         Loading arguments given by user
+        :param argv: arguments of a batch line, command line if None
         :return:
         """
 
@@ -18,20 +19,64 @@ class CLInterface(object):
 
         # Updating records
         parser.add_argument('--update', help='update records', action='store_true')
+        parser.add_argument('--update_mode', help='engine downloading the data',
+                            action='store', choices=['threads', 'async'],
+                            default='threads')
+        parser.add_argument('--max_requests', help='max API requests in flight',
+                            action='store', type=int, default=10)
+        parser.add_argument('--timeout', help='seconds per API request',
+                            action='store', type=float, default=10.0)
+        parser.add_argument('--retries', help='retries of failed API request',
+                            action='store', type=int, default=3)
+        parser.add_argument('--batch_size', help='rows written at once',
+                            action='store', type=int, default=500)
+        parser.add_argument('--cache', help='file caching API responds, '
+                                            'next to the database by default',
+                            action='store', default='')
+        parser.add_argument('--cache_ttl', help='days before movie is downloaded '
+                                                'again', action='store', type=int,
+                            default=30)
+        parser.add_argument('--no_cache', help="don't use API responds cache",
+                            action='store_true')
+        parser.add_argument('--rate', help='max API requests per second',
+                            action='store', type=float, default=None)
+        parser.add_argument('--daily_budget', help='max API requests per day, '
+                                                   '0 is unlimited',
+                            action='store', type=int, default=1000)
+        parser.add_argument('--max_attempts', help='failed downloads of a title '
+                                                   'before giving up',
+                            action='store', type=int, default=3)
 
         # Sorting records
-        parser.add_argument('--sort_by', help='sort records', action='store', nargs=1,
+        parser.add_argument('--sort_by', help='sort records', action='store',
                             choices=['id', 'title', 'year', 'runtime', 'genre',
                                      'director', 'cast', 'writer', 'language',
                                      'country',
                                      'awards', 'imdb_rating', 'imdb_votes',
                                      'box_office'],
                             type=str)
+        parser.add_argument('--order', help='direction of sorting',
+                            action='store', choices=['desc', 'asc'],
+                            default='desc')
+        parser.add_argument('--limit', help='rows of a page of sorted records, '
+                                            'ids of rows are shown',
+                            action='store', type=int)
+        parser.add_argument('--after', help='value and id of the last row of '
+                                            'the previous page, NULL is no '
+                                            'value',
+                            action='store', nargs=2, type=str,
+                            metavar=('value', 'id'))
 
         # Filtering records
         parser.add_argument('--filter_by', help='filter records', action='store',
                             nargs=2, type=str,
                             metavar=('column', 'value'))
+        parser.add_argument('--filter_mode', help='substring match, ranked '
+                                                  'full-text search or single '
+                                                  'genre, person, country, '
+                                                  'language or value',
+                            action='store', choices=['like', 'fts', 'exact'],
+                            default='like')
 
         # Comparing records
         parser.add_argument('--compare', help='comparing records', action='store',
@@ -43,35 +88,167 @@ class CLInterface(object):
                             nargs='+', type=str,
                             metavar='title')
 
+        parser.add_argument('--insert_from', help='inserting titles from file, '
+                                                  '- reads stdin',
+                            action='store', type=str, metavar='path')
+        parser.add_argument('--input_format', help='format of titles file, '
+                                                   'guessed from its extension',
+                            action='store', choices=['lines', 'csv', 'jsonl'])
+
         # Deleting titles
         parser.add_argument('--delete', help='deleting records', action='store',
                             nargs='+', type=str,
                             metavar='title')
 
+        parser.add_argument('--delete_from', help='deleting titles from file, '
+                                                  '- reads stdin',
+                            action='store', type=str, metavar='path')
+
         # Highscores
         parser.add_argument('--highscores', help='highscores by every column',
                             action='store_true')
+        parser.add_argument('--highscores_columns', help='numeric columns of '
+                                                         'highscores',
+                            action='store', nargs='+', type=str,
+                            metavar='column')
+        parser.add_argument('--top', help='number of best values in highscores',
+                            action='store', type=int, default=1)
+
+        # Statistics
+        parser.add_argument('--stats', help='max, min, average and count of '
+                                            'numeric columns',
+                            action='store_true')
+
+        # Counts of movies
+        parser.add_argument('--counts', help='number of movies of every genre, '
+                                             'person, country or language',
+                            action='store',
+                            choices=['genre', 'director', 'writer', 'cast',
+                                     'country', 'language'])
+
+        # Indexes
+        parser.add_argument('--ensure_indexes',
+                            help='create missing indexes and report their usage',
+                            action='store_true')
+
+        # Query server
+        parser.add_argument('--serve', help='answering sort_by, filter_by, '
+                                            'compare and highscores over HTTP',
+                            action='store_true')
+        parser.add_argument('--host', help='address of the query server',
+                            action='store', default='127.0.0.1')
+        parser.add_argument('--port', help='port of the query server',
+                            action='store', type=int, default=8080)
+        parser.add_argument('--pool_size', help='read-only connections of the '
+                                                'query server',
+                            action='store', type=int, default=4)
+
+        # Batch of commands
+        parser.add_argument('--batch', help='running commands of the script '
+                                            'file, one per line or json lines, '
+                                            '- reads stdin',
+                            action='store', type=str, metavar='path')
+        parser.add_argument('--transaction_size', help='writes of batch '
+                                                       'committed at once',
+                            action='store', type=int, default=1000)
+
+        # Printing results
+        parser.add_argument('--output_format', help='table, tab separated '
+                                                    'values or json lines',
+                            action='store', choices=['table', 'tsv', 'jsonl'],
+                            default='table')
 
         # Writing csv
         parser.add_argument('--write_csv', help='saving results as csv file',
-                            action='store_true', const=False)
+                            action='store_true')
+        parser.add_argument('--csv_path', help='path of csv file, .gz or .zst '
+                                               'is compressed',
+                            action='store', type=str, metavar='path')
+        parser.add_argument('--compression', help='compression of csv file',
+                            action='store', choices=['gzip', 'zstd'])
+
+        # Writing typed columnar file
+        parser.add_argument('--write_parquet', help='saving results as parquet '
+                                                    'file',
+                            action='store_true')
+        parser.add_argument('--write_arrow', help='saving results as arrow IPC '
+                                                  'file',
+                            action='store_true')
+        parser.add_argument('--export_path', help='path of parquet or arrow file',
+                            action='store', type=str, metavar='path')
+
+        parser.add_argument('--profile', help='tuning of the db connection',
+                            action='store',
+                            choices=['default', 'safe', 'read-heavy',
+                                     'bulk-load'],
+                            default='default')
+        parser.add_argument('--arraysize', help='rows fetched from the db at once',
+                            action='store', type=int, default=1000)
 
         # Writing csv
         parser.add_argument('--db_name', help='select the db', action='store',
                             default='movies.sqlite')
 
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
 
         commands = dict()
 
         commands['update'] = args.update
+        commands['update_mode'] = args.update_mode
+        commands['max_requests'] = args.max_requests
+        commands['timeout'] = args.timeout
+        commands['retries'] = args.retries
+        commands['batch_size'] = args.batch_size
+        commands['cache'] = None if args.no_cache else args.cache
+        commands['cache_ttl'] = args.cache_ttl
+        commands['rate'] = args.rate
+        commands['daily_budget'] = args.daily_budget or None
+        commands['max_attempts'] = args.max_attempts
         commands['sort_by'] = args.sort_by
+        commands['order'] = args.order
+        commands['limit'] = args.limit
+        if args.after:
+            value, row_id = args.after
+            if not row_id.lstrip('-').isdigit():
+                parser.error(f'argument --after: invalid id: {row_id}')
+
+            commands['after'] = (None if value.upper() == 'NULL' else value,
+                                 int(row_id))
+        else:
+            commands['after'] = None
         commands['filter_by'] = args.filter_by
+        commands['filter_mode'] = args.filter_mode
         commands['compare'] = args.compare
         commands['insert'] = args.insert
+        commands['insert_from'] = args.insert_from
+        commands['input_format'] = args.input_format
         commands['delete'] = args.delete
+        commands['delete_from'] = args.delete_from
         commands['highscores'] = args.highscores
-        commands['write_csv'] = args.write_csv
+        commands['highscores_columns'] = args.highscores_columns
+        commands['top'] = args.top
+        commands['stats'] = args.stats
+        commands['counts'] = args.counts
+        commands['ensure_indexes'] = args.ensure_indexes
+        commands['output_format'] = args.output_format
+        commands['write_csv'] = args.write_csv or bool(args.csv_path)
+        commands['csv_path'] = args.csv_path
+        commands['compression'] = args.compression
+        if args.write_arrow:
+            commands['export_format'] = 'arrow'
+        elif args.write_parquet or args.export_path:
+            commands['export_format'] = 'parquet'
+        else:
+            commands['export_format'] = None
+        commands['export_path'] = args.export_path
         commands['db_name'] = args.db_name
+        commands['arraysize'] = args.arraysize
+        commands['profile'] = args.profile
+        commands['serve'] = args.serve
+        commands['batch'] = args.batch
+        commands['transaction_size'] = args.transaction_size
+        commands['host'] = args.host
+        commands['port'] = args.port
+        commands['pool_size'] = args.pool_size
 
         return commands
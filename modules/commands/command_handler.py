@@ -19,6 +19,15 @@ class CommandHandler:
         """
         raise NotImplementedError
 
+    def stream(self, parameter):
+        """
+        Results of the command as an iterator, handlers reading many rows
+        override it to fetch them lazily
+        :param parameter:
+        :return:
+        """
+        return iter(self.handle(parameter))
+
     @abstractmethod
     def get_keyword(self):
         """
@@ -30,7 +30,8 @@ class DataCompare(CommandHandler):
 
         # Getting the results from the db
         try:
-            self.results = self.db.execute_statement(self.sql_statement)
+            self.results = self.db.execute_statement(self.sql_statement,
+                                                    self.parameters)
         except sqlite3.OperationalError as e:
             raise e
 
@@ -43,14 +44,20 @@ class DataCompare(CommandHandler):
         Statement to execute - comparing
         :return:
         """
-        sql_statement = f"""SELECT {self.db.movies_table}.title, 
-                            {self.db.movies_table}.{self.column}
-                            FROM {self.db.movies_table}
-                            WHERE {self.db.movies_table}.title IN ('{self.movie_1}', 
-                            '{self.movie_2}')
-                            ORDER BY {self.db.movies_table}.{self.column} desc
-                            LIMIT 1"""
+        sql_statement = self.db.statements.sql(
+            """SELECT {table}.title, {table}.{column} FROM {table}
+               WHERE {table}.title IN (:movie_1, :movie_2)
+               ORDER BY {table}.{column} desc
+               LIMIT 1""", column=self.column)
         return sql_statement
 
+    @property
+    def parameters(self):
+        """
+        Values bound to the statement
+        :return:
+        """
+        return {'movie_1': self.movie_1, 'movie_2': self.movie_2}
+
     def get_keyword(self):
         return self.keyword
@@ -0,0 +1,63 @@
+import sqlite3
+
+from modules.commands.command_handler import CommandHandler
+
+
+class DataCounts(CommandHandler):
+    """ Counting movies of every genre, person, country or language """
+
+    def __init__(self, db):
+        super().__init__()
+        self.keyword = 'counts'
+        self.db = db
+
+        self.column = None
+
+    @property
+    def sql_statement(self):
+        """
+        Statement to execute - movies of every item read from the junction
+        table in order of its index
+        :return:
+        """
+        relation_table, role = self.db.relations.relation(self.column)
+        role_condition = f'WHERE {relation_table}.role = :role' if role else ''
+
+        sql_statement = f"""SELECT {relation_table}.name,
+                            COUNT(*) AS movies
+                            FROM {relation_table}
+                            {role_condition}
+                            GROUP BY {relation_table}.name
+                            ORDER BY movies DESC, {relation_table}.name"""
+        return sql_statement
+
+    @property
+    def parameters(self):
+        """
+        Values bound to the statement
+        :return:
+        """
+        return {'role': self.db.relations.relation(self.column)[1]}
+
+    def handle(self, parameter):
+        """
+        Handle the counts request
+        :param parameter: column, e.g. genre
+        :return:
+        """
+
+        if parameter:
+            self.column = parameter
+
+            if self.db.relations.relation(self.column) is None:
+                raise sqlite3.OperationalError(
+                    f'no junction table of column: {self.column}')
+
+            self.db.ensure_relations()
+            self.results = self.db.execute_statement(self.sql_statement,
+                                                     self.parameters)
+
+        return self.results
+
+    def get_keyword(self):
+        return self.keyword
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from modules.commands.data_counts.data_counts import DataCounts
+from modules.db_config.db_config import DBConfig
+
+
+@pytest.fixture(scope='module')
+def data_counts():
+    """ Setup of the data counts class before tests """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text UNIQUE, GENRE text, DIRECTOR text,
+                        CAST text, COUNTRY text)""")
+        db.c.executemany("""INSERT INTO MOVIES(TITLE, GENRE, DIRECTOR, CAST,
+                            COUNTRY) VALUES (?, ?, ?, ?, ?)""",
+                         [('Memento', 'Mystery, Thriller', 'Christopher Nolan',
+                           'Guy Pearce, Carrie-Anne Moss', 'United States'),
+                          ('In Bruges', 'Comedy, Crime, Drama',
+                           'Martin McDonagh', 'Colin Farrell',
+                           'United Kingdom, United States'),
+                          ('Insomnia', 'Drama, Mystery, Thriller',
+                           'Christopher Nolan', 'Al Pacino', 'N/A')])
+
+    data_counts = DataCounts(db=db)
+
+    yield data_counts
+
+
+def test_handle(data_counts):
+    """
+    Testing movies counted by genre, person and country
+    :param data_counts:
+    """
+
+    results = [tuple(row) for row in data_counts.handle(parameter='genre')]
+    assert results == [('Drama', 2), ('Mystery', 2), ('Thriller', 2),
+                       ('Comedy', 1), ('Crime', 1)]
+
+    results = [tuple(row) for row in data_counts.handle(parameter='director')]
+    assert results == [('Christopher Nolan', 2), ('Martin McDonagh', 1)]
+
+    # Actors only, directors have another role
+    results = data_counts.handle(parameter='cast')
+    assert len(results) == 4
+    assert 'Christopher Nolan' not in [row['name'] for row in results]
+
+    # N/A isn't an item
+    results = [tuple(row) for row in data_counts.handle(parameter='country')]
+    assert results == [('United States', 2), ('United Kingdom', 1)]
+
+    # Fail case - column without junction table
+    with pytest.raises(sqlite3.OperationalError):
+        data_counts.handle(parameter='year')
@@ -1,6 +1,10 @@
 import sqlite3
+import sys
+import time
 
 from modules.commands.command_handler import CommandHandler
+from modules.commands.data_update.batch_writer import BatchWriter
+from modules.title_reader.title_reader import TitleReader
 
 
 class DataDelete(CommandHandler):
@@ -20,9 +24,17 @@ class DataDelete(CommandHandler):
         :return:
         """
         sql_statement = f"""DELETE FROM {self.db.movies_table}
-                            WHERE title = '{self.title_to_delete}'"""
+                            WHERE title = :title"""
         return sql_statement
 
+    @property
+    def parameters(self):
+        """
+        Values bound to the statement
+        :return:
+        """
+        return {'title': self.title_to_delete}
+
     def handle(self, parameter):
         """
         Handle the delete title request
@@ -31,17 +43,18 @@ class DataDelete(CommandHandler):
         """
 
         # Inserting every title given by user
-        if type(parameter) is list:
-            for title in parameter:
-                self.delete_title(title)
+        with self.db.transaction():
+            if type(parameter) is list:
+                for title in parameter:
+                    self.delete_title(title)
 
-                info = {'Title': title, 'Status': 'Deleted'}
-                self.results.append(info)
-        else:
-            self.delete_title(parameter)
+                    info = {'Title': title, 'Status': 'Deleted'}
+                    self.results.append(info)
+            else:
+                self.delete_title(parameter)
 
-            info = {'Title': parameter, 'Status': 'Deleted'}
-            self.results.append(info)
+                info = {'Title': parameter, 'Status': 'Deleted'}
+                self.results.append(info)
 
         return self.results
 
@@ -54,7 +67,7 @@ class DataDelete(CommandHandler):
         self.title_to_delete = title
 
         try:
-            self.db.c.execute(self.sql_statement)
+            self.db.c.execute(self.sql_statement, self.parameters)
         except sqlite3.OperationalError as e:
             raise e
         except sqlite3.IntegrityError as e:
@@ -62,3 +75,97 @@ class DataDelete(CommandHandler):
 
     def get_keyword(self):
         return self.keyword
+
+
+class DataBulkDelete(DataDelete):
+    """ Deleting titles streamed from a file or stdin at once """
+
+    def __init__(self, db, batch_size=10000, input_format=None):
+        super().__init__(db=db)
+
+        self.keyword = 'delete_from'
+        self.batch_size = batch_size  # Titles loaded by single executemany
+        self.input_format = input_format  # Guessed from the file if None
+
+        self.titles_table = 'temp.DELETE_TITLES'
+
+    @property
+    def sql_statements(self):
+        """
+        Statements to execute - temp table of titles, rows matching every
+        title and deleting all of them by single statement
+        :return:
+        """
+        table = self.db.movies_table
+        titles = self.titles_table
+
+        sql_statements = {
+            'create': f"""CREATE TABLE IF NOT EXISTS {titles} (
+                          TITLE text UNIQUE)""",
+            'load': f'INSERT OR IGNORE INTO {titles}(title) VALUES (:title)',
+            'count': f"""SELECT {titles}.title,
+                         COUNT({table}.id) AS deleted
+                         FROM {titles} LEFT JOIN {table}
+                         ON {table}.title = {titles}.title
+                         GROUP BY {titles}.rowid
+                         ORDER BY {titles}.rowid""",
+            'delete': f"""DELETE FROM {table} WHERE title IN (
+                          SELECT title FROM {titles})""",
+            'drop': f'DROP TABLE IF EXISTS {titles}'}
+        return sql_statements
+
+    def handle(self, parameter):
+        """
+        Handle the bulk delete request
+        :param parameter: path of the file, '-' is stdin
+        :return:
+        """
+
+        if parameter:
+            # Title lookups use the index, stats follow the deleted rows
+            self.db.ensure_indexes()
+            self.db.ensure_stats()
+
+            reader = TitleReader(parameter, input_format=self.input_format)
+            self.results = self.delete_titles(reader)
+
+        return self.results
+
+    def delete_titles(self, titles):
+        """
+        Deleting titles in a single transaction
+        :param titles:
+        :return: number of deleted rows of every title
+        """
+
+        sql_statements = self.sql_statements
+        start = time.perf_counter()
+
+        try:
+            with self.db.transaction():
+                self.db.c.execute(sql_statements['drop'])
+                self.db.c.execute(sql_statements['create'])
+
+                writer = BatchWriter(self.db, sql_statements['load'],
+                                     batch_size=self.batch_size)
+                for title in titles:
+                    writer.add({'title': title})
+                writer.flush()
+
+                counts = self.db.c.execute(sql_statements['count']).fetchall()
+                self.db.c.execute(sql_statements['delete'])
+                rows_deleted = self.db.c.rowcount
+
+                self.db.c.execute(sql_statements['drop'])
+        except (sqlite3.OperationalError, ValueError) as e:
+            # Nothing is deleted
+            raise e
+
+        print(f'Deleted {rows_deleted} rows of {len(counts)} titles in '
+              f'{time.perf_counter() - start:.3f} s', file=sys.stderr)
+
+        results = [{'Title': row['title'],
+                    'Status': 'Deleted' if row['deleted'] else 'Not found',
+                    'Deleted': row['deleted']}
+                   for row in counts]
+        return results
@@ -1,7 +1,7 @@
 import sqlite3
 
 import pytest
-from movies_db import DBConfig, DataDelete
+from movies_db import DBConfig, DataDelete, DataBulkDelete
 
 
 @pytest.fixture(scope='module')
@@ -97,3 +97,32 @@ def test_handle(data_delete, titles_to_delete, database):
     results = [result['Title'] for result in results]
 
     assert titles_to_delete not in results
+
+
+def test_handle_bulk(tmp_path):
+    """
+    Testing deleting titles from the file with number of deleted rows
+    :param tmp_path:
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, DIRECTOR text)""")
+        db.c.executemany('INSERT INTO MOVIES(TITLE) VALUES (?)',
+                         [('Memento',), ('Gods',), ('Gods',), ('In Bruges',)])
+
+    titles = tmp_path / 'titles.jsonl'
+    titles.write_text('"Gods"\n{"Title": "Kac Wawa"}\n"Memento"\n"Gods"\n')
+
+    data_bulk_delete = DataBulkDelete(db=db, batch_size=2)
+    results = data_bulk_delete.handle(parameter=str(titles))
+
+    assert results == [{'Title': 'Gods', 'Status': 'Deleted', 'Deleted': 2},
+                       {'Title': 'Kac Wawa', 'Status': 'Not found',
+                        'Deleted': 0},
+                       {'Title': 'Memento', 'Status': 'Deleted', 'Deleted': 1}]
+
+    db.conn.rollback()  # Deleting is already committed
+    rows = db.execute_statement('SELECT title FROM MOVIES')
+    assert [row['Title'] for row in rows] == ['In Bruges']
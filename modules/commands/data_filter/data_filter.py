@@ -6,11 +6,12 @@ from modules.commands.command_handler import CommandHandler
 class DataFilter(CommandHandler):
     """ Handling the filtering command request """
 
-    def __init__(self, db):
+    def __init__(self, db, mode='like'):
         super().__init__()
 
         self.keyword = 'filter_by'
         self.db = db
+        self.mode = mode  # 'like' substring, 'fts' full-text or 'exact' value
 
         self.column = None
         self.value = None
@@ -22,18 +23,52 @@ class DataFilter(CommandHandler):
         :return:
         """
 
+        self.results = list(self.stream(parameter))
+
+        # Return the results
+        return self.results
+
+    def stream(self, parameter):
+        """
+        Filtered rows fetched lazily
+        :param parameter:
+        :return:
+        """
+
         # Retreiving column name and value to filter by
         self.column = parameter[0]
         self.value = parameter[1]
 
+        # Full-text search covers only text columns
+        use_fts = self.mode == 'fts' and \
+            str(self.column).upper() in self.db.fts_index.columns
+
+        # Single genre, person, country or language is looked up by index
+        relation = self.db.relations.relation(self.column) \
+            if self.mode == 'exact' else None
+
         # Getting the results from the db
         try:
-            self.results = self.db.execute_statement(self.sql_statement)
+            if relation:
+                self.db.ensure_relations()
+                rows = self.db.iterate_statement(self.sql_relation_statement,
+                                                 self.parameters)
+            elif self.mode == 'exact':
+                rows = self.db.iterate_statement(self.sql_exact_statement,
+                                                 self.parameters)
+            elif use_fts:
+                self.db.ensure_fts()
+                rows = self.db.iterate_statement(
+                    self.sql_fts_statement,
+                    {'query': self.db.fts_index.match_query(self.column,
+                                                            self.value)})
+            else:
+                rows = self.db.iterate_statement(self.sql_statement,
+                                                 self.parameters)
         except sqlite3.OperationalError as e:
             raise e
 
-        # Return the results
-        return self.results
+        return rows
 
     @property
     def sql_statement(self):
@@ -41,11 +76,67 @@ class DataFilter(CommandHandler):
         Statement to execute - filtering
         :return:
         """
-        sql_statement = f"""SELECT {self.db.movies_table}.title, 
-                            {self.db.movies_table}.{self.column}
-                            FROM {self.db.movies_table}
-                            WHERE {self.db.movies_table}.{self.column} 
-                            LIKE '%{self.value}%';"""
+        sql_statement = self.db.statements.sql(
+            """SELECT {table}.title, {table}.{column} FROM {table}
+               WHERE {table}.{column} LIKE :pattern;""", column=self.column)
+        return sql_statement
+
+    @property
+    def sql_exact_statement(self):
+        """
+        Statement to execute - filtering by equal value
+        :return:
+        """
+        sql_statement = self.db.statements.sql(
+            """SELECT {table}.title, {table}.{column} FROM {table}
+               WHERE {table}.{column} = :value
+               ORDER BY {table}.title;""", column=self.column)
+        return sql_statement
+
+    @property
+    def sql_relation_statement(self):
+        """
+        Statement to execute - titles of the single item of the column
+        found in its junction table
+        :return:
+        """
+        relation_table, role = self.db.relations.relation(self.column)
+        role_condition = f'AND {relation_table}.role = :role' if role else ''
+
+        sql_statement = self.db.statements.sql(
+            f"""SELECT {{table}}.title, {{table}}.{{column}}
+                FROM {relation_table}
+                JOIN {{table}} ON {{table}}.id = {relation_table}.movie_id
+                WHERE {relation_table}.name = :value {role_condition}
+                ORDER BY {{table}}.title;""", column=self.column)
+        return sql_statement
+
+    @property
+    def parameters(self):
+        """
+        Values bound to the statement
+        :return:
+        """
+        relation = self.db.relations.relation(self.column)
+
+        return {'pattern': f'%{self.value}%', 'value': self.value,
+                'role': relation[1] if relation else None}
+
+    @property
+    def sql_fts_statement(self):
+        """
+        Statement to execute - full-text search ranked by relevance
+        :return:
+        """
+        fts_table = self.db.fts_index.fts_table
+        column = self.db.statements.column(self.column)
+        sql_statement = f"""SELECT {self.db.movies_table}.title,
+                            {self.db.movies_table}."{column}"
+                            FROM {fts_table}
+                            JOIN {self.db.movies_table}
+                            ON {self.db.movies_table}.id = {fts_table}.rowid
+                            WHERE {fts_table} MATCH :query
+                            ORDER BY {fts_table}.rank;"""
         return sql_statement
 
     def get_keyword(self):
@@ -56,3 +56,114 @@ def test_handle(data_filter):
         results = data_filter.handle(parameter=['metascore', '5'])
     print(exec_info.value)
 
+
+
+@pytest.fixture(scope='module')
+def fts_filter():
+    """ Setup of the full-text data filter before tests """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE IF NOT EXISTS MOVIES (
+                    ID INTEGER PRIMARY KEY,
+                    TITLE text,
+                    YEAR integer,
+                    GENRE text,
+                    DIRECTOR text,
+                    CAST text,
+                    WRITER text,
+                    LANGUAGE text,
+                    COUNTRY text,
+                    AWARDS text,
+                    UNIQUE(TITLE));
+                    """)
+        db.c.execute("""INSERT INTO MOVIES(TITLE, YEAR, CAST, LANGUAGE)
+                        VALUES ('The Shawshank Redemption', 1994,
+                        'Tim Robbins, Morgan Freeman', 'English')""")
+
+    data_filter = DataFilter(db=db, mode='fts')
+
+    yield data_filter
+
+
+def test_handle_fts(fts_filter):
+    """
+    Testing full-text filtering kept in sync by triggers
+    :param fts_filter:
+    """
+
+    # Index is filled with the existing rows
+    results = fts_filter.handle(parameter=['cast', 'tim robbins'])
+    assert [result['Title'] for result in results] == ['The Shawshank Redemption']
+
+    # Triggers keep the index in sync
+    db = fts_filter.db
+    with db.conn:
+        db.c.execute("""INSERT INTO MOVIES(TITLE, YEAR, CAST, LANGUAGE)
+                        VALUES ('Mystic River', 2003,
+                        'Sean Penn, Tim Robbins', 'English')""")
+        db.c.execute("""UPDATE MOVIES SET LANGUAGE = 'English, Polish'
+                        WHERE TITLE = 'Mystic River'""")
+        db.c.execute("""DELETE FROM MOVIES
+                        WHERE TITLE = 'The Shawshank Redemption'""")
+
+    results = fts_filter.handle(parameter=['cast', 'Tim Robbins'])
+    assert [result['Title'] for result in results] == ['Mystic River']
+
+    # Last word is a prefix
+    results = fts_filter.handle(parameter=['language', 'pol'])
+    assert [result['Title'] for result in results] == ['Mystic River']
+
+    results = fts_filter.handle(parameter=['title', 'Shawshank'])
+    assert not results
+
+    # Not text column falls back to substring match
+    results = fts_filter.handle(parameter=['year', '200'])
+    assert [result['Title'] for result in results] == ['Mystic River']
+
+
+def test_handle_exact():
+    """
+    Testing single genre and person looked up in the junction tables
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text UNIQUE, YEAR integer, GENRE text,
+                        DIRECTOR text, WRITER text, CAST text)""")
+        db.c.executemany("""INSERT INTO MOVIES(TITLE, YEAR, GENRE, DIRECTOR,
+                            WRITER, CAST) VALUES (?, ?, ?, ?, ?, ?)""",
+                         [('Memento', 2000, 'Mystery, Thriller',
+                           'Christopher Nolan', 'Christopher Nolan, '
+                           'Jonathan Nolan', 'Guy Pearce'),
+                          ('Insomnia', 2002, 'Drama, Mystery, Thriller',
+                           'Christopher Nolan', 'Hillary Seitz', 'Al Pacino'),
+                          ('Following', 1998, 'N/A', 'Christopher Nolan',
+                           'N/A', 'Jeremy Theobald')])
+
+    data_filter = DataFilter(db=db, mode='exact')
+
+    # Whole items only, substring of another item doesn't match
+    results = data_filter.handle(parameter=['genre', 'thriller'])
+    assert [result['Title'] for result in results] == ['Insomnia', 'Memento']
+    assert not data_filter.handle(parameter=['writer', 'Nolan'])
+
+    # Role of the person is kept
+    results = data_filter.handle(parameter=['writer', 'Christopher Nolan'])
+    assert [result['Title'] for result in results] == ['Memento']
+    results = data_filter.handle(parameter=['director', 'Christopher Nolan'])
+    assert len(results) == 3
+
+    # Triggers keep the tables in sync
+    with db.conn:
+        db.c.execute("""UPDATE MOVIES SET genre = 'Crime, Thriller'
+                        WHERE title = 'Following'""")
+        db.c.execute("DELETE FROM MOVIES WHERE title = 'Memento'")
+
+    results = data_filter.handle(parameter=['genre', 'Thriller'])
+    assert [result['Title'] for result in results] == ['Following', 'Insomnia']
+
+    # Other columns are compared by value
+    results = data_filter.handle(parameter=['year', '2002'])
+    assert [result['Title'] for result in results] == ['Insomnia']
@@ -4,28 +4,130 @@ from modules.commands.command_handler import CommandHandler
 class DataHighscores(CommandHandler):
     """ Showing highscores """
 
-    def __init__(self, db):
+    def __init__(self, db, columns=None, top_n=1):
         super().__init__()
         self.keyword = 'highscores'
         self.db = db
 
-        self.columns = ('RUNTIME', 'IMDb_Rating', 'BOX_OFFICE', 'IMDb_votes')
-        self.col_name = None
+        self.columns = tuple(columns or ('RUNTIME', 'IMDb_Rating', 'BOX_OFFICE',
+                                         'IMDb_votes'))
+        self.top_n = top_n  # Number of best distinct values, ties included
+
+    def sql_column_statement(self, position, column):
+        """
+        Statement of a single column - titles with one of the top n values,
+        the n-th value is found by walking the index of the column
+        :param position:
+        :param column:
+        :return:
+        """
+        sql_statement = self.db.statements.sql(
+            f"""SELECT {int(position)} AS col_order,
+                :col_name_{int(position)} AS col_name,
+                {{table}}.{{column}} AS max_val, {{table}}.title
+                FROM {{table}}
+                WHERE {{table}}.{{column}} >= (
+                    SELECT MIN(value) FROM (
+                        SELECT DISTINCT {{column}} AS value
+                        FROM {{table}}
+                        WHERE {{column}} IS NOT NULL
+                        ORDER BY {{column}} DESC
+                        LIMIT :top_n))""", column=column)
+        return sql_statement
+
+    def sql_stats_column_statement(self, position, column):
+        """
+        Statement of a single column - titles with one of the top n values
+        kept in the leaders of the stats, found by a range of the index of
+        the column
+        :param position:
+        :param column:
+        :return:
+        """
+        leaders = self.db.stats_table.leaders_table
+        sql_statement = self.db.statements.sql(
+            f"""SELECT {int(position)} AS col_order,
+                :col_name_{int(position)} AS col_name,
+                {{table}}.{{column}} AS max_val, {{table}}.title
+                FROM {{table}}
+                WHERE {{table}}.{{column}} >= (
+                    SELECT MIN(value) FROM (
+                        SELECT value FROM {leaders}
+                        WHERE col_name = :stats_column_{int(position)}
+                        ORDER BY value DESC
+                        LIMIT :top_n))""", column=column)
+        return sql_statement
+
+    def use_stats(self):
+        """
+        Leaders of the stats are used if they exist and are enough, they
+        are created by the writes, not by reading
+        :return:
+        """
+
+        stats = self.db.stats_table
+
+        if not 1 <= int(self.top_n) <= stats.leaders:
+            return False
+
+        return stats.exists() and all(stats.canonical_column(column)
+                                      for column in self.columns)
+
+    @property
+    def sql_stats_statement(self):
+        """
+        Statement to execute - highscores of every column read from the
+        leaders of the stats
+        :return:
+        """
+        column_statements = [self.sql_stats_column_statement(position, column)
+                             for position, column in enumerate(self.columns)]
+
+        sql_statement = f"""SELECT col_name, max_val, title FROM (
+                            {' UNION ALL '.join(column_statements)})
+                            ORDER BY col_order, max_val DESC, title"""
+        return sql_statement
 
     @property
     def sql_statement(self):
         """
-        Statement to execute - get highscore with column name
+        Statement to execute - highscores of every column at once
         :return:
         """
-        sql_statement = f"""SELECT name as col_name, 
-                            MAX({self.db.movies_table}.{self.col_name}) as max_val, 
-                            {self.db.movies_table}.title
-                            FROM PRAGMA_TABLE_INFO('{self.db.movies_table}')
-                            JOIN {self.db.movies_table}
-                            ON name = '{self.col_name}';"""
+        column_statements = [self.sql_column_statement(position, column)
+                             for position, column in enumerate(self.columns)]
+
+        sql_statement = f"""SELECT col_name, max_val, title FROM (
+                            {' UNION ALL '.join(column_statements)})
+                            ORDER BY col_order, max_val DESC, title"""
         return sql_statement
 
+    @property
+    def parameters(self):
+        """
+        Values bound to the statements - names of the columns as given by
+        user, their names in the stats table and the number of values
+        :return:
+        """
+        stats = self.db.stats_table
+
+        parameters = {'top_n': int(self.top_n)}
+        for position, column in enumerate(self.columns):
+            parameters[f'col_name_{position}'] = column
+            parameters[f'stats_column_{position}'] = \
+                stats.canonical_column(column)
+
+        return parameters
+
+    def validate_columns(self):
+        """
+        Only existing columns are allowed since they are part of the statement
+        :return:
+        """
+
+        for column in self.columns:
+            self.db.statements.column(column)
+
     def handle(self, parameter):
         """
         Handle the highscores request
@@ -34,11 +136,15 @@ class DataHighscores(CommandHandler):
         """
 
         if parameter:
+            self.validate_columns()
+
+            if self.use_stats():
+                sql_statement = self.sql_stats_statement
+            else:
+                sql_statement = self.sql_statement
 
-            for column in self.columns:
-                self.col_name = column
-                result = self.db.execute_statement(self.sql_statement)
-                self.results.append(result[0])
+            self.results = self.db.execute_statement(sql_statement,
+                                                     self.parameters)
 
         return self.results
 
@@ -1,3 +1,5 @@
+import sqlite3
+
 import pytest
 
 from movies_db import DBConfig, DataHighscores
@@ -37,3 +39,33 @@ def test_handle(data_highscores):
     assert results[3]['col_name'] == 'IMDb_votes'
     assert results[3]['max_val'] == 2188727
     assert results[3]['Title'] == 'The Shawshank Redemption'
+
+
+def test_handle_top_n():
+    """
+    Testing top n values of chosen columns including ties
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY, TITLE text,
+                        YEAR integer, IMDb_Rating float)""")
+        db.c.executemany("""INSERT INTO MOVIES(TITLE, YEAR, IMDb_Rating)
+                            VALUES (?, ?, ?)""",
+                         [('Memento', 2000, 8.4), ('In Bruges', 2008, 7.9),
+                          ('Gods', 2008, None), ('The Godfather', 1972, 9.2)])
+
+    data_highscores = DataHighscores(db=db, columns=['year', 'imdb_rating'],
+                                     top_n=2)
+    results = [tuple(result) for result in data_highscores.handle(parameter=True)]
+
+    assert results == [('year', 2008, 'Gods'),
+                       ('year', 2008, 'In Bruges'),
+                       ('year', 2000, 'Memento'),
+                       ('imdb_rating', 9.2, 'The Godfather'),
+                       ('imdb_rating', 8.4, 'Memento')]
+
+    # Fail case - column which doesn't exist
+    data_highscores = DataHighscores(db=db, columns=['metascore'])
+    with pytest.raises(sqlite3.OperationalError):
+        data_highscores.handle(parameter=True)
@@ -0,0 +1,102 @@
+from modules.commands.command_handler import CommandHandler
+from modules.commands.data_compare.data_compare import DataCompare
+from modules.commands.data_delete.data_delete import DataDelete
+from modules.commands.data_filter.data_filter import DataFilter
+from modules.commands.data_highscores.data_highscores import DataHighscores
+from modules.commands.data_sort.data_sort import DataSorter
+from modules.commands.data_update.data_update import DataUpdater
+
+
+class DataIndexes(CommandHandler):
+    """ Ensuring indexes and reporting which commands use them """
+
+    def __init__(self, db):
+        super().__init__()
+
+        self.keyword = 'ensure_indexes'
+        self.db = db
+
+    def handle(self, parameter):
+        """
+        Handle the ensure indexes request
+        :param parameter:
+        :return:
+        """
+
+        if parameter:
+            created = self.db.ensure_indexes()
+            self.db.ensure_stats()
+
+            for command, sql_statement, parameters in self.statements():
+                if sql_statement is None:
+                    # Report doesn't create tables of other commands
+                    self.results.append({'Command': command,
+                                         'Index': 'None (table not created)',
+                                         'Plan': ''})
+                    continue
+
+                index, plan = self.db.index_manager.explain(sql_statement,
+                                                            parameters)
+
+                if index is None:
+                    index = 'None (full scan)'
+                elif index in created:
+                    index += ' (created)'
+
+                info = {'Command': command, 'Index': index, 'Plan': plan}
+                self.results.append(info)
+
+        return self.results
+
+    def statements(self):
+        """
+        Sample statements of every command with their parameters, None
+        if the statement reads a table which doesn't exist yet
+        :return:
+        """
+
+        statements = []
+
+        data_sorter = DataSorter(db=self.db)
+        for column in ('year', 'runtime', 'imdb_rating', 'imdb_votes',
+                       'box_office'):
+            data_sorter.parameter = column
+            statements.append((f'sort_by {column}', data_sorter.sql_statement,
+                               data_sorter.parameters))
+
+        data_filter = DataFilter(db=self.db)
+        data_filter.column, data_filter.value = 'title', 'Memento'
+        statements.append(('filter_by title', data_filter.sql_statement,
+                           data_filter.parameters))
+
+        data_compare = DataCompare(db=self.db)
+        data_compare.column = 'imdb_rating'
+        data_compare.movie_1, data_compare.movie_2 = 'Memento', 'Gods'
+        statements.append(('compare imdb_rating', data_compare.sql_statement,
+                           data_compare.parameters))
+
+        data_delete = DataDelete(db=self.db)
+        data_delete.title_to_delete = 'Memento'
+        statements.append(('delete', data_delete.sql_statement,
+                           data_delete.parameters))
+
+        data_highscores = DataHighscores(db=self.db)
+        for position, column in enumerate(data_highscores.columns):
+            statements.append((f'highscores {column}',
+                               data_highscores.sql_column_statement(position,
+                                                                    column),
+                               data_highscores.parameters))
+
+        data_updater = DataUpdater(db=self.db)
+        if self.db.index_manager.table_exists(data_updater.journal_table):
+            statements.append(('update',
+                               data_updater.sql_empty_titles_page_statement,
+                               {'first_id': 0, 'last_id': 0, 'max_attempts': 0,
+                                'page_size': 0}))
+        else:
+            statements.append(('update', None, None))
+
+        return statements
+
+    def get_keyword(self):
+        return self.keyword
@@ -0,0 +1,76 @@
+import pytest
+
+from modules.commands.data_indexes.data_indexes import DataIndexes
+from modules.commands.data_update.data_update import DataUpdater
+from modules.db_config.db_config import DBConfig
+
+
+@pytest.fixture(scope='module')
+def database():
+    """ Setup of the database before tests """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE IF NOT EXISTS MOVIES (
+                    ID INTEGER PRIMARY KEY,
+                    TITLE text,
+                    YEAR integer,
+                    RUNTIME text,
+                    GENRE text,
+                    DIRECTOR text,
+                    CAST text,
+                    WRITER text,
+                    LANGUAGE text,
+                    COUNTRY text,
+                    AWARDS text,
+                    IMDb_Rating float,
+                    IMDb_votes integer,
+                    BOX_OFFICE integer,
+                    UNIQUE(TITLE));
+                    """)
+
+    yield db
+
+
+def test_ensure_indexes(database):
+    """
+    Testing creating the indexes only once
+    :param database:
+    :return:
+    """
+
+    created = database.ensure_indexes()
+
+    # Title is indexed by UNIQUE constraint already
+    assert 'MOVIES_TITLE' not in created
+    assert 'MOVIES_EMPTY_TITLES' in created
+    assert 'MOVIES_BOX_OFFICE' in created
+
+    assert database.ensure_indexes() == []
+
+    # Missing table is not an error
+    assert DBConfig(db_name=':memory:', ensure_indexes=True)
+
+
+def test_handle(database):
+    """
+    Testing the report of used indexes
+    :param database:
+    :return:
+    """
+
+    results = DataIndexes(db=database).handle(parameter=True)
+    results = {result['Command']: result['Index'] for result in results}
+
+    assert results['sort_by year'] == 'MOVIES_YEAR'
+    assert results['highscores BOX_OFFICE'] == 'MOVIES_BOX_OFFICE'
+    assert results['delete'] == 'sqlite_autoindex_MOVIES_1'
+
+    # Read-only report doesn't create the journal of the update
+    assert results['update'] == 'None (table not created)'
+    assert not database.index_manager.table_exists('UPDATE_JOURNAL')
+
+    DataUpdater(db=database).create_journal()
+    results = DataIndexes(db=database).handle(parameter=True)
+    results = {result['Command']: result['Index'] for result in results}
+    assert results['update'] == 'MOVIES_EMPTY_TITLES'
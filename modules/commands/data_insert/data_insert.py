@@ -1,6 +1,10 @@
 import sqlite3
+import sys
+import time
 
 from modules.commands.command_handler import CommandHandler
+from modules.commands.data_update.batch_writer import BatchWriter
+from modules.title_reader.title_reader import TitleReader
 
 
 class DataInsert(CommandHandler):
@@ -20,9 +24,17 @@ class DataInsert(CommandHandler):
         :return:
         """
         sql_statement = f"""INSERT INTO {self.db.movies_table}(title)
-                            VALUES('{self.title_to_write}')"""
+                            VALUES(:title)"""
         return sql_statement
 
+    @property
+    def parameters(self):
+        """
+        Values bound to the statement
+        :return:
+        """
+        return {'title': self.title_to_write}
+
     def handle(self, parameter):
         """
         Handle the insert title request
@@ -31,17 +43,18 @@ class DataInsert(CommandHandler):
         """
 
         # Inserting every or single title given by user
-        if type(parameter) is list:
-            for title in parameter:
-                self.insert_title(title)
+        with self.db.transaction():
+            if type(parameter) is list:
+                for title in parameter:
+                    self.insert_title(title)
 
-                info = {'Title': title, 'Status': 'Inserted'}
-                self.results.append(info)
-        else:
-            self.insert_title(parameter)
+                    info = {'Title': title, 'Status': 'Inserted'}
+                    self.results.append(info)
+            else:
+                self.insert_title(parameter)
 
-            info = {'Title': parameter, 'Status': 'Inserted'}
-            self.results.append(info)
+                info = {'Title': parameter, 'Status': 'Inserted'}
+                self.results.append(info)
 
         return self.results
 
@@ -54,7 +67,7 @@ class DataInsert(CommandHandler):
         self.title_to_write = title
 
         try:
-            self.db.c.execute(self.sql_statement)
+            self.db.c.execute(self.sql_statement, self.parameters)
         except sqlite3.OperationalError as e:
             raise e
         except sqlite3.IntegrityError as e:
@@ -62,3 +75,83 @@ class DataInsert(CommandHandler):
 
     def get_keyword(self):
         return self.keyword
+
+
+class DataBulkInsert(DataInsert):
+    """ Inserting titles streamed from a file or stdin """
+
+    def __init__(self, db, batch_size=10000, input_format=None):
+        super().__init__(db=db)
+
+        self.keyword = 'insert_from'
+        self.batch_size = batch_size  # Titles inserted by single executemany
+        self.input_format = input_format  # Guessed from the file if None
+
+    @property
+    def sql_bulk_statement(self):
+        """
+        Statement to execute - inserting title which isn't in the db yet,
+        duplicates are skipped with or without unique title constraint
+        :return:
+        """
+        table = self.db.movies_table
+        sql_statement = f"""INSERT OR IGNORE INTO {table}(title)
+                            SELECT :title WHERE NOT EXISTS (
+                                SELECT 1 FROM {table} WHERE title = :title)"""
+        return sql_statement
+
+    def handle(self, parameter):
+        """
+        Handle the bulk insert request
+        :param parameter: path of the file, '-' is stdin
+        :return:
+        """
+
+        if parameter:
+            # Title lookups of duplicates use the index, stats follow the
+            # inserted rows
+            self.db.ensure_indexes()
+            self.db.ensure_stats()
+
+            reader = TitleReader(parameter, input_format=self.input_format)
+            writer = self.insert_titles(reader)
+
+            print(writer.report(), file=sys.stderr)
+
+            info = {'Status': 'Inserted', 'Titles': reader.titles_read,
+                    'Inserted': writer.rows_written,
+                    'Ignored': reader.titles_read - writer.rows_written}
+            self.results.append(info)
+
+        return self.results
+
+    def insert_titles(self, titles):
+        """
+        Inserting titles in batches, every batch is a single transaction
+        :param titles:
+        :return: writer with the stats of inserting
+        """
+
+        writer = BatchWriter(self.db, self.sql_bulk_statement,
+                             batch_size=self.batch_size)
+        start = time.perf_counter()
+
+        try:
+            for title in titles:
+                writer.add({'title': title})
+
+                # Full batch has been written
+                if not writer.batch:
+                    self.db.commit()
+
+            writer.flush()
+            self.db.commit()
+        except (sqlite3.OperationalError, ValueError) as e:
+            # Titles of the current batch aren't written
+            self.db.rollback()
+            raise e
+
+        # Reading of the source is included in the throughput
+        writer.write_time = time.perf_counter() - start
+
+        return writer
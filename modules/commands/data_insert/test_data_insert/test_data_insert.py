@@ -1,7 +1,7 @@
 import sqlite3
 
 import pytest
-from movies_db import DBConfig, DataInsert
+from movies_db import DBConfig, DataInsert, DataBulkInsert
 
 
 @pytest.fixture(scope='module')
@@ -96,3 +96,31 @@ def test_handle(data_insert, titles_to_add, database):
     with pytest.raises(sqlite3.IntegrityError) as exec_info:
         result = data_insert.handle(parameter='Memento')
     print(exec_info)
+
+
+def test_handle_bulk(tmp_path):
+    """
+    Testing inserting titles from the file, duplicates are skipped
+    :param tmp_path:
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, DIRECTOR text)""")
+        db.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Memento')")
+
+    titles = tmp_path / 'titles.txt'
+    titles.write_text('\n'.join(['Memento', 'In Bruges', 'Gods', 'In Bruges',
+                                 'The Godfather']))
+
+    data_bulk_insert = DataBulkInsert(db=db, batch_size=2)
+    results = data_bulk_insert.handle(parameter=str(titles))
+
+    assert results == [{'Status': 'Inserted', 'Titles': 5, 'Inserted': 3,
+                        'Ignored': 2}]
+
+    db.conn.rollback()  # Every batch is already committed
+    rows = db.execute_statement('SELECT title FROM MOVIES ORDER BY id')
+    assert [row['Title'] for row in rows] == ['Memento', 'In Bruges', 'Gods',
+                                              'The Godfather']
@@ -6,26 +6,131 @@ from modules.commands.command_handler import CommandHandler
 class DataSorter(CommandHandler):
     """ Handling the filter command request """
 
-    def __init__(self, db):
+    def __init__(self, db, order='desc', limit=None, after=None):
         super().__init__()
 
         self.keyword = 'sort_by'
         self.db = db  # DB to update
 
+        self.order = order  # 'desc' or 'asc'
+        self.limit = limit  # Rows of a page, None is every row
+        self.after = after  # Cursor - value and id of the last row seen
+
         self.parameter = None
         self.value = None
 
+    @property
+    def direction(self):
+        """
+        Direction of the sort checked since it's part of the statement
+        :return:
+        """
+
+        direction = str(self.order).upper()
+        if direction not in ('ASC', 'DESC'):
+            raise ValueError(f'Unknown sort order: {self.order}')
+
+        return direction
+
+    @property
+    def paged(self):
+        return self.limit is not None or self.after is not None
+
+    def sql_page_statement(self, where=''):
+        """
+        Statement of the page - rows in order of the column and their ids,
+        read from the index of the column, ids are shown when paging
+        :param where: condition of the rows after the cursor
+        :return:
+        """
+        direction = self.direction
+        id_column = ', {table}.id' if self.paged else ''
+
+        sql_statement = self.db.statements.sql(
+            f"""SELECT {{table}}.title, {{table}}.{{column}}{id_column}
+                FROM {{table}} {where}
+                ORDER BY {{table}}.{{column}} {direction},
+                {{table}}.id {direction}
+                LIMIT :limit""", column=self.parameter)
+        return sql_statement
+
     @property
     def sql_statement(self):
         """
         Statement to execute - sorting
         :return:
         """
-        sql_statement = f"""SELECT {self.db.movies_table}.title, 
-                            {self.db.movies_table}.{self.parameter}
-                            FROM {self.db.movies_table}
-                            ORDER BY {self.parameter} DESC"""
-        return sql_statement
+        return self.sql_page_statement()
+
+    @property
+    def sql_after_statement(self):
+        """
+        Statement to execute - rows after the cursor with a value
+        :return:
+        """
+        operator = '<' if self.direction == 'DESC' else '>'
+        return self.sql_page_statement(
+            f'WHERE ({{table}}.{{column}}, {{table}}.id) {operator} '
+            f'(:value, :id)')
+
+    @property
+    def sql_nulls_after_statement(self):
+        """
+        Statement to execute - rows without value after the cursor without
+        value, ordered by id only
+        :return:
+        """
+        operator = '<' if self.direction == 'DESC' else '>'
+        return self.sql_page_statement(
+            f'WHERE {{table}}.{{column}} IS NULL AND {{table}}.id {operator} :id')
+
+    @property
+    def sql_nulls_statement(self):
+        """
+        Statement to execute - rows without value, last in descending order
+        :return:
+        """
+        return self.sql_page_statement('WHERE {table}.{column} IS NULL')
+
+    @property
+    def sql_values_statement(self):
+        """
+        Statement to execute - rows with value, last in ascending order
+        :return:
+        """
+        return self.sql_page_statement('WHERE {table}.{column} IS NOT NULL')
+
+    @property
+    def parameters(self):
+        """
+        Values bound to the statements, negative limit is no limit
+        :return:
+        """
+        value, row_id = self.after if self.after is not None else (None, None)
+
+        return {'limit': -1 if self.limit is None else int(self.limit),
+                'value': value, 'id': row_id}
+
+    def page_statements(self):
+        """
+        Statements of the page in order, NULL is less than any value so
+        the rows after a cursor are read by one or two index ranges
+        :return:
+        """
+
+        if self.after is None:
+            return [self.sql_statement]
+
+        value = self.after[0]
+
+        if self.direction == 'DESC':
+            if value is None:
+                return [self.sql_nulls_after_statement]
+            return [self.sql_after_statement, self.sql_nulls_statement]
+
+        if value is None:
+            return [self.sql_nulls_after_statement, self.sql_values_statement]
+        return [self.sql_after_statement]
 
     def handle(self, parameter):
         """
@@ -33,15 +138,56 @@ class DataSorter(CommandHandler):
         :return:
         """
 
+        self.results = list(self.stream(parameter))
+
+        return self.results
+
+    def stream(self, parameter):
+        """
+        Sorted rows fetched lazily
+        :param parameter:
+        :return:
+        """
+
         self.parameter = parameter
 
-        # Get the results from db
+        # Get the results from db, first range is read before iterating
         try:
-            self.results = self.db.execute_statement(self.sql_statement)
+            sql_statements = self.page_statements()
+            rows = self.db.iterate_statement(sql_statements[0],
+                                             self.parameters)
         except sqlite3.OperationalError as e:
             raise e
 
-        return self.results
+        return self.fetch_ranges(rows, sql_statements[1:])
+
+    def fetch_ranges(self, rows, sql_statements):
+        """
+        Rows of the first range followed by the next ranges up to the limit
+        :param rows:
+        :param sql_statements: statements of the next ranges
+        :return:
+        """
+
+        fetched = 0
+        try:
+            for row in rows:
+                fetched += 1
+                yield row
+        finally:
+            # Statement of not fully read rows is finished
+            rows.close()
+
+        for sql_statement in sql_statements:
+            parameters = self.parameters
+            if self.limit is not None:
+                parameters['limit'] = int(self.limit) - fetched
+                if parameters['limit'] <= 0:
+                    return
+
+            for row in self.db.iterate_statement(sql_statement, parameters):
+                fetched += 1
+                yield row
 
     def get_keyword(self):
         return self.keyword
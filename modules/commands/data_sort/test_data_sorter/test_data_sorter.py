@@ -57,3 +57,54 @@ def test_handle(data_sorter):
     with pytest.raises(sqlite3.OperationalError) as exec_info:
         no_result = data_sorter.handle('niema')  # No column /niema/
     print(exec_info.value)
+
+
+def test_handle_pages():
+    """
+    Testing pages read after the cursor of the previous page
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text UNIQUE, DIRECTOR text, YEAR integer)""")
+        db.c.executemany("INSERT INTO MOVIES(TITLE, YEAR) VALUES (?, ?)",
+                         [(f'Movie {number}', [2000, 2008, None][number % 3])
+                          for number in range(10)])
+    db.ensure_indexes()
+
+    for order in ('desc', 'asc'):
+        everything = [tuple(row) for row in
+                      DataSorter(db=db, order=order, limit=100).handle('year')]
+        assert len(everything) == 10
+
+        # Pages of 4 rows, ties and NULLs are split between pages
+        pages = []
+        after = None
+        while True:
+            page = DataSorter(db=db, order=order, limit=4,
+                              after=after).handle('year')
+            if not page:
+                break
+
+            assert len(page) <= 4
+            pages.extend(tuple(row) for row in page)
+            after = (page[-1]['year'], page[-1]['id'])
+
+        assert pages == everything
+
+    # NULL is the smallest value
+    results = DataSorter(db=db, order='asc', limit=1).handle('year')
+    assert results[0]['year'] is None
+
+    # Index of the column is read, no sorting of the whole table
+    data_sorter = DataSorter(db=db, limit=4, after=(2008, 5))
+    data_sorter.parameter = 'year'
+    index, plan = db.index_manager.explain(data_sorter.sql_after_statement,
+                                           data_sorter.parameters)
+    assert index == 'MOVIES_YEAR'
+    assert 'TEMP B-TREE' not in plan
+
+    # Fail case - unknown order
+    with pytest.raises(ValueError):
+        DataSorter(db=db, order='up').handle('year')
@@ -0,0 +1,47 @@
+from modules.commands.command_handler import CommandHandler
+
+
+class DataStats(CommandHandler):
+    """ Showing statistics of numeric columns """
+
+    def __init__(self, db):
+        super().__init__()
+        self.keyword = 'stats'
+        self.db = db
+
+    @property
+    def sql_statement(self):
+        """
+        Statement to execute - statistics kept up to date by the triggers,
+        computed from the movies table if the writes haven't created them
+        :return:
+        """
+        stats = self.db.stats_table
+
+        if stats.exists():
+            source = stats.stats_table
+        else:
+            stats.columns = stats.existing_columns()
+            source = f'({stats.sql_fill_statement})'
+
+        sql_statement = f"""SELECT col_name, max_val, min_val,
+                            CASE WHEN cnt > 0 THEN sum_val / cnt END AS avg_val,
+                            cnt AS count
+                            FROM {source}
+                            ORDER BY col_name"""
+        return sql_statement
+
+    def handle(self, parameter):
+        """
+        Handle the stats request
+        :param parameter:
+        :return:
+        """
+
+        if parameter:
+            self.results = self.db.execute_statement(self.sql_statement)
+
+        return self.results
+
+    def get_keyword(self):
+        return self.keyword
@@ -0,0 +1,119 @@
+import pytest
+
+from modules.commands.data_highscores.data_highscores import DataHighscores
+from modules.commands.data_stats.data_stats import DataStats
+from modules.db_config.db_config import DBConfig
+
+
+@pytest.fixture(scope='module')
+def data_stats():
+    """ Setup of the data stats class before tests """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text UNIQUE, DIRECTOR text, YEAR integer,
+                        IMDb_Rating float)""")
+        db.c.executemany("""INSERT INTO MOVIES(TITLE, YEAR, IMDb_Rating)
+                            VALUES (?, ?, ?)""",
+                         [('Memento', 2000, 8.4), ('In Bruges', 2008, 7.9),
+                          ('Gods', None, None), ('The Godfather', 1972, 9.2)])
+
+    data_stats = DataStats(db=db)
+
+    yield data_stats
+
+
+def stats_of(data_stats):
+    """
+    Stats compared with the aggregates computed from scratch
+    :param data_stats:
+    :return:
+    """
+
+    stats = {row['col_name']: tuple(row)[1:]
+             for row in data_stats.handle(parameter=True)}
+
+    for column in stats:
+        expected = data_stats.db.conn.execute(
+            f"""SELECT MAX({column}), MIN({column}), AVG({column}),
+                COUNT({column}) FROM MOVIES""").fetchone()
+        assert stats[column] == pytest.approx(tuple(expected))
+
+    return stats
+
+
+def test_handle(data_stats):
+    """
+    Testing stats of the existing rows, computed by reading only until
+    a write creates the table
+    :param data_stats:
+    """
+
+    stats = stats_of(data_stats)
+    assert not data_stats.db.stats_table.exists()
+
+    assert data_stats.db.ensure_stats()
+    assert stats_of(data_stats) == stats
+
+    assert set(stats) == {'YEAR', 'IMDb_Rating'}
+    assert stats['YEAR'] == (2008, 1972, pytest.approx(1993.33, 0.01), 3)
+
+
+def test_handle_writes(data_stats):
+    """
+    Testing stats maintained by inserts, updates and deletes
+    :param data_stats:
+    """
+
+    db = data_stats.db
+
+    with db.conn:
+        db.c.execute("""INSERT INTO MOVIES(TITLE, YEAR, IMDb_Rating)
+                        VALUES ('Kac Wawa', 2007, 2.0)""")
+    assert stats_of(data_stats)['IMDb_Rating'][1] == 2.0
+
+    with db.conn:
+        db.c.execute("UPDATE MOVIES SET YEAR = 2013 WHERE TITLE = 'Gods'")
+        db.c.execute("DELETE FROM MOVIES WHERE TITLE = 'The Godfather'")
+    stats = stats_of(data_stats)
+    assert stats['YEAR'][:2] == (2013, 2000)
+    assert stats['IMDb_Rating'][0] == 8.4
+
+    # Highscores read the top values from the leaders of the stats
+    data_highscores = DataHighscores(db=db, columns=['year', 'imdb_rating'])
+    assert data_highscores.use_stats()
+    assert 'MOVIES_STATS_LEADERS' in data_highscores.sql_stats_statement
+    results = [tuple(result) for result in data_highscores.handle(parameter=True)]
+    assert results == [('year', 2013, 'Gods'), ('imdb_rating', 8.4, 'Memento')]
+
+    data_highscores = DataHighscores(db=db, columns=['year', 'imdb_rating'],
+                                     top_n=3)
+    assert data_highscores.use_stats()
+    results = [tuple(result) for result in data_highscores.handle(parameter=True)]
+    assert results == [('year', 2013, 'Gods'), ('year', 2008, 'In Bruges'),
+                       ('year', 2007, 'Kac Wawa'),
+                       ('imdb_rating', 8.4, 'Memento'),
+                       ('imdb_rating', 7.9, 'In Bruges'),
+                       ('imdb_rating', 2.0, 'Kac Wawa')]
+
+    # Leaders match the values computed from scratch after every write
+    with db.conn:
+        db.c.execute("UPDATE MOVIES SET YEAR = 1999 WHERE TITLE = 'Gods'")
+        db.c.execute("DELETE FROM MOVIES WHERE TITLE = 'In Bruges'")
+    for column in ('YEAR', 'IMDb_Rating'):
+        leaders = db.conn.execute(
+            """SELECT value FROM MOVIES_STATS_LEADERS WHERE col_name = ?
+               ORDER BY value DESC""", (column,)).fetchall()
+        expected = db.conn.execute(
+            f"""SELECT DISTINCT {column} FROM MOVIES
+                WHERE {column} IS NOT NULL ORDER BY {column} DESC""").fetchall()
+        assert [tuple(row) for row in leaders] == [tuple(row) for row in expected]
+
+    # More values than the leaders keep are read from the movies table
+    data_highscores = DataHighscores(db=db, top_n=11)
+    assert not data_highscores.use_stats()
+
+    with db.conn:
+        db.c.execute('DELETE FROM MOVIES')
+    assert stats_of(data_stats)['YEAR'] == (None, None, None, 0)
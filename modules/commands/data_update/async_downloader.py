@@ -0,0 +1,267 @@
+import asyncio
+import json
+import ssl
+from urllib.parse import urlencode, urljoin, urlsplit
+
+
+class HTTPError(Exception):
+    """ Retryable failure of a single HTTP request """
+
+
+class RedirectError(Exception):
+    """ Redirect which isn't followed, retrying it wouldn't help """
+
+
+class AsyncDownloader:
+    """ Downloading JSON documents with asyncio over a pool of keep-alive
+    connections """
+
+    def __init__(self, url, max_requests=10, timeout=10.0, retries=3,
+                 backoff=0.5):
+
+        # Target of every request
+        self.url = urlsplit(url)
+        self.host = self.url.hostname
+        self.port = self.url.port or (443 if self.url.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if self.url.scheme == 'https' \
+            else None
+
+        # Request tuning
+        self.max_requests = max_requests  # Max requests in flight
+        self.timeout = timeout  # Seconds per single request
+        self.retries = retries  # Extra attempts after the first one
+        self.backoff = backoff  # Base delay between attempts in seconds
+        self.max_redirects = 5  # Redirects followed within the same origin
+
+        self.connections_opened = 0  # Counter of TCP connections made
+        self._idle = []  # Idle keep-alive connections
+        self._semaphore = None
+
+    def download_all(self, queries):
+        """
+        Downloading every query, results are in the order of queries.
+        Inside of a running loop use the downloader as async context manager
+        and await download for every query
+        :param queries: dicts of query string parameters
+        :return:
+        """
+        return asyncio.run(self._download_all(queries))
+
+    async def _download_all(self, queries):
+        """
+        Running all of the downloads concurrently
+        :param queries:
+        :return:
+        """
+
+        async with self:
+            results = await asyncio.gather(
+                *[self.download(query) for query in queries])
+
+        return results
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_requests)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._close_idle()
+
+    async def download(self, query):
+        """
+        Downloading a single document, retrying with exponential backoff
+        :param query:
+        :return:
+        """
+
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                try:
+                    return await asyncio.wait_for(self._request(query),
+                                                  timeout=self.timeout)
+                except RedirectError as e:
+                    return {'Error': str(e), 'Response': 'False'}
+                except (asyncio.TimeoutError, HTTPError, OSError,
+                        asyncio.IncompleteReadError, ValueError) as e:
+                    if attempt >= self.retries:
+                        return {'Error': self._error_message(e),
+                                'Response': 'False'}
+
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+
+    async def _request(self, query, target=None, redirects=0):
+        """
+        Sending GET request on a pooled connection and decoding JSON body
+        :param query:
+        :param target: path and query string, e.g. of the redirect
+        :param redirects: redirects followed so far
+        :return:
+        """
+
+        target = target or self._target(query)
+        reader, writer, reused = await self._acquire()
+
+        try:
+            writer.write(self._build_request(target))
+            await writer.drain()
+            status, headers, body = await self._read_response(reader)
+        except (OSError, asyncio.IncompleteReadError):
+            writer.close()
+            if reused:
+                # Server dropped the idle connection, try with a fresh one
+                return await self._request(query, target, redirects)
+            raise
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get('connection', '').lower() == 'close':
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+
+        if status == 429 or status >= 500:
+            raise HTTPError(f'HTTP {status}')
+
+        if status in (301, 302, 303, 307, 308):
+            target = self._redirect_target(status, headers, target, redirects)
+            return await self._request(query, target, redirects + 1)
+
+        return json.loads(body.decode('utf-8'))
+
+    def _redirect_target(self, status, headers, target, redirects):
+        """
+        Target of the redirect, connections of the pool lead to a single
+        origin, so redirects to other ones aren't followed
+        :param status:
+        :param headers:
+        :param target:
+        :param redirects:
+        :return:
+        """
+
+        if 'location' not in headers:
+            raise RedirectError(f'HTTP {status} without location')
+        if redirects >= self.max_redirects:
+            raise RedirectError(f'HTTP {status} after {redirects} redirects')
+
+        base = f'{self.url.scheme}://{self.url.netloc}{target}'
+        location = urlsplit(urljoin(base, headers['location']))
+
+        if (location.scheme, location.netloc) != (self.url.scheme,
+                                                  self.url.netloc):
+            raise RedirectError(f'HTTP {status} redirect to other origin: '
+                                f'{headers["location"]}')
+
+        target = location.path or '/'
+        if location.query:
+            target += '?' + location.query
+
+        return target
+
+    async def _acquire(self):
+        """
+        Getting idle connection from the pool or opening a new one
+        :return:
+        """
+
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        reader, writer = await asyncio.open_connection(self.host, self.port,
+                                                       ssl=self.ssl)
+        self.connections_opened += 1
+
+        return reader, writer, False
+
+    def _target(self, query):
+        """
+        Path and query string of the request
+        :param query:
+        :return:
+        """
+
+        query_string = urlencode(query)
+        if self.url.query:
+            query_string = self.url.query + '&' + query_string
+
+        return (self.url.path or '/') + '?' + query_string
+
+    def _build_request(self, target):
+        """
+        Creating raw HTTP/1.1 request
+        :param target: path and query string
+        :return:
+        """
+
+        request = (f'GET {target} HTTP/1.1\r\n'
+                   f'Host: {self.url.netloc}\r\n'
+                   f'Accept: application/json\r\n'
+                   f'Connection: keep-alive\r\n\r\n')
+
+        return request.encode('ascii')
+
+    @staticmethod
+    async def _read_response(reader):
+        """
+        Reading status, headers and body of HTTP response
+        :param reader:
+        :return:
+        """
+
+        status_line = await reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if not size:
+                    await reader.readuntil(b'\r\n')
+                    break
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            # Body delimited by closing the connection
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        return status, headers, body
+
+    def _close_idle(self):
+        """
+        Closing every idle connection of the pool
+        :return:
+        """
+
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+    @staticmethod
+    def _error_message(error):
+        """
+        Readable message of the last failure
+        :param error:
+        :return:
+        """
+
+        if isinstance(error, asyncio.TimeoutError):
+            return 'Request timed out'
+
+        return str(error) or error.__class__.__name__
@@ -0,0 +1,69 @@
+import time
+
+
+class BatchWriter:
+    """ Accumulating statement parameters and writing them with executemany """
+
+    def __init__(self, db, sql_statement, batch_size=500, flush_first=()):
+        self.db = db  # DB to write
+        self.sql_statement = sql_statement  # Statement with named parameters
+        self.batch_size = batch_size  # Rows written by single executemany
+        self.flush_first = flush_first  # Writers flushed before this one
+
+        self.batch = []  # Parameters waiting for the flush
+        self.rows_written = 0
+        self.batches_written = 0
+        self.write_time = 0.0  # Seconds spent in executemany
+
+    def add(self, parameters):
+        """
+        Adding parameters of a single row, flushing full batch
+        :param parameters:
+        :return:
+        """
+
+        self.batch.append(parameters)
+
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writing every waiting row, commit is up to the caller
+        :return:
+        """
+
+        for writer in self.flush_first:
+            writer.flush()
+
+        if not self.batch:
+            return
+
+        start = time.perf_counter()
+        self.db.c.executemany(self.sql_statement, self.batch)
+        self.write_time += time.perf_counter() - start
+
+        self.rows_written += self.db.c.rowcount
+        self.batches_written += 1
+        self.batch = []
+
+    @property
+    def rows_per_sec(self):
+        """
+        Write throughput
+        :return:
+        """
+
+        if not self.write_time:
+            return 0.0
+
+        return self.rows_written / self.write_time
+
+    def report(self):
+        """
+        Summary of written rows
+        :return:
+        """
+        return (f'Written {self.rows_written} rows in {self.batches_written} '
+                f'batches, {self.write_time:.3f} s '
+                f'({self.rows_per_sec:.0f} rows/sec)')
@@ -1,43 +1,76 @@
-import concurrent.futures
-import sqlite3
-from decimal import Decimal
-from re import sub
-
-import requests
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
 
 from modules.commands.command_handler import CommandHandler
-from modules.db_config.db_config import DBConfig
+from modules.commands.data_update.async_downloader import AsyncDownloader
+from modules.commands.data_update.batch_writer import BatchWriter
+from modules.commands.data_update.rate_limiter import RateLimiter
+from modules.commands.data_update.response_cache import ResponseCache
+from modules.commands.data_update.update_pipeline import UpdatePipeline
+from modules.field_normalizer.field_normalizer import FieldNormalizer
 
 
 class DataUpdater(CommandHandler):
     """ Handling updating database """
 
-    def __init__(self, db):
+    def __init__(self, db, mode='threads', max_requests=10, timeout=10.0,
+                 retries=3, batch_size=500, cache_path='',
+                 cache_ttl=30, rate=None, daily_budget=1000, max_attempts=3):
         super().__init__()
 
         self.keyword = 'update'  # Constant keyword to recognize handler
         self.db = db  # DB to update
 
+        self.api_url = 'http://www.omdbapi.com/'
         self.api_key = '305043ae'  # static API key to use API
 
-    @property
-    def sql_empty_titles_statement(self):
-        """
-        Statement to execute - if director column is null than everything must be null
-        :return:
-        """
-        sql_statement = f"""SELECT {self.db.movies_table}.title 
-                            FROM {self.db.movies_table} 
-                            WHERE director IS NULL"""
-        return sql_statement
+        # Download engine settings
+        self.mode = mode  # 'threads' or 'async'
+        self.max_requests = max_requests  # Max requests in flight
+        self.timeout = timeout  # Seconds per single request
+        self.retries = retries  # Extra attempts of failed async request
+
+        self.batch_size = batch_size  # Rows written by single executemany
+        self.progress_every = 100  # Titles between progress reports
+
+        # Responds cache settings, empty path is next to the database and
+        # None turns the cache off
+        self.cache_path = cache_path
+        self.cache_name = 'omdb_cache.sqlite'
+        self.cache_ttl = cache_ttl  # Days before movie is downloaded again
+
+        # API limits
+        self.rate = rate  # Requests per second, None is unlimited
+        self.daily_budget = daily_budget  # Requests per day, None is unlimited
+        self.schedule_table = 'UPDATE_SCHEDULE'  # Usage of the API per day
+
+        # Progress journal of every title
+        self.journal_table = 'UPDATE_JOURNAL'
+        self.max_attempts = max_attempts  # Failed attempts before giving up
+
+        self.sessions = None  # Session of every download thread
+        self.opened_sessions = []
+        self.cache = None
+        self.limiter = None
+        self.journal = None
+        self.start_id = None  # Id the update has started from
+        self.last_id = None  # Id of the last title given to the workers
+        self.refused_id = None  # Id of the first title refused by the limits
+        self.writer = None
+        self.statuses = Counter()  # Number of titles by status of the update
+        self.start_time = None
 
     @property
-    def sql_data_update_statement(self):
+    def sql_data_update_by_id_statement(self):
         """
-        Statement to execute - if director column is null than everything must be null
+        Statement to execute - updating the data of the title with given id
         :return:
         """
-        sql_statement = f"""UPDATE {self.db.movies_table} 
+        sql_statement = f"""UPDATE {self.db.movies_table}
                             SET year = :year, runtime = :runtime,
                             genre = :genre, director = :director, writer = :writer,
                             cast = :cast, language = :language,
@@ -45,7 +78,96 @@ class DataUpdater(CommandHandler):
                             awards = :awards, imdb_Rating = :imdbRating,
                             imdb_Votes = :imdbVotes,
                             box_office = :boxoffice
-                            WHERE title = :title"""
+                            WHERE id = :id"""
+        return sql_statement
+
+    @property
+    def sql_empty_titles_page_statement(self):
+        """
+        Statement to execute - next page of empty titles in order of ids,
+        skipping titles finished or given up in the journal
+        :return:
+        """
+        sql_statement = f"""SELECT {self.db.movies_table}.id,
+                            {self.db.movies_table}.title
+                            FROM {self.db.movies_table}
+                            WHERE director IS NULL AND id >= :first_id
+                            AND id <= :last_id
+                            AND NOT EXISTS (
+                                SELECT 1 FROM {self.journal_table}
+                                WHERE {self.journal_table}.movie_id =
+                                {self.db.movies_table}.id
+                                AND ({self.journal_table}.status
+                                IN ('done', 'not_found')
+                                OR {self.journal_table}.attempts >= :max_attempts))
+                            ORDER BY id
+                            LIMIT :page_size"""
+        return sql_statement
+
+    @property
+    def sql_create_journal_statement(self):
+        """
+        Statement to execute - journal of the update
+        :return:
+        """
+        sql_statement = f"""CREATE TABLE IF NOT EXISTS {self.journal_table} (
+                            MOVIE_ID integer PRIMARY KEY,
+                            STATUS text,
+                            ATTEMPTS integer,
+                            LAST_ERROR text,
+                            UPDATED_AT text)"""
+        return sql_statement
+
+    @property
+    def sql_journal_statement(self):
+        """
+        Statement to execute - recording the result of a single title
+        :return:
+        """
+        sql_statement = f"""INSERT INTO {self.journal_table}
+                            (movie_id, status, attempts, last_error, updated_at)
+                            VALUES (:movie_id, :status, 1, :last_error,
+                            datetime('now'))
+                            ON CONFLICT(movie_id) DO UPDATE SET
+                            status = excluded.status,
+                            attempts = attempts + 1,
+                            last_error = excluded.last_error,
+                            updated_at = excluded.updated_at"""
+        return sql_statement
+
+    @property
+    def sql_create_schedule_statement(self):
+        """
+        Statement to execute - table of API usage and position of the last run
+        :return:
+        """
+        sql_statement = f"""CREATE TABLE IF NOT EXISTS {self.schedule_table} (
+                            API_KEY text PRIMARY KEY,
+                            DAY text,
+                            USED integer,
+                            LAST_ID integer)"""
+        return sql_statement
+
+    @property
+    def sql_schedule_statement(self):
+        """
+        Statement to execute - API usage of the key
+        :return:
+        """
+        sql_statement = f"""SELECT day, used, last_id
+                            FROM {self.schedule_table}
+                            WHERE api_key = :api_key"""
+        return sql_statement
+
+    @property
+    def sql_save_schedule_statement(self):
+        """
+        Statement to execute - saving API usage of the key
+        :return:
+        """
+        sql_statement = f"""INSERT OR REPLACE INTO
+                            {self.schedule_table}(api_key, day, used, last_id)
+                            VALUES (:api_key, :day, :used, :last_id)"""
         return sql_statement
 
     def handle(self, parameter):
@@ -58,127 +180,420 @@ class DataUpdater(CommandHandler):
 
         # If user wanted the update
         if parameter:
-            # Getting titles with empty data
-            empty_titles = self.db.execute_statement(
-                sql_statement=self.sql_empty_titles_statement)
-
-            # Convrting SQL Row Objects to str
-            empty_titles = [title['Title'] for title in empty_titles]
+            # Parsed numbers aren't stored in columns declared as text,
+            # stats and highscores follow the written numbers
+            self.db.ensure_types()
+            self.create_journal()
+            self.db.ensure_stats()
+
+            self.writer = BatchWriter(
+                db=self.db, sql_statement=self.sql_data_update_by_id_statement,
+                batch_size=self.batch_size)
+
+            # Journal entries are never saved before the data they describe
+            self.journal = BatchWriter(db=self.db,
+                                       sql_statement=self.sql_journal_statement,
+                                       batch_size=self.batch_size,
+                                       flush_first=[self.writer])
+            self.statuses = Counter()
+            self.start_time = time.perf_counter()
+
+            if self.cache_path is not None:
+                cache_path = self.cache_path or self.default_cache()
+                self.cache = ResponseCache(cache_path,
+                                           ttl=self.cache_ttl * 24 * 3600)
+
+            start_id = self.load_schedule()
+
+            # Streaming empty titles through the API to the database
+            try:
+                asyncio.run(self.stream_update(start_id))
+            finally:
+                if self.cache:
+                    self.cache.close()
+                self.save_schedule()
 
-            # Downloading data for empty titles using API
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                api_data = executor.map(self.download_data, empty_titles)
+            with self.db.conn:
+                self.journal.flush()
 
-            # Updating database with downloaded data
-            results = self.update_data(api_data)
+            self.report_progress()
+            print(self.writer.report(), file=sys.stderr)
+            if self.cache:
+                print(self.cache.report(), file=sys.stderr)
+            if self.limiter.exhausted:
+                print('Daily limit of API requests reached, next update will '
+                      'resume from this point', file=sys.stderr)
 
-            # Changing box office N/A value to null for further conveniance
-            self.na_to_null('box_office')
+            results = [{'Status': status, 'Titles': count}
+                       for status, count in self.statuses.items()]
 
         return results
 
-    def download_data(self, title):
+    def create_journal(self):
         """
-        Downloading data using API
-        :param title:
+        Creating the journal table and the indexes, including the index of
+        empty titles
         :return:
         """
 
-        results = []
+        with self.db.conn:
+            self.db.conn.execute(self.sql_create_journal_statement)
 
-        payload = {'t': title,
-                   'r': 'json'}  # Get full data based on title in json format
-        respond = requests.get(f'http://www.omdbapi.com/?apikey={self.api_key}',
-                               params=payload).json()
+        self.db.ensure_indexes()
 
-        results.append(respond)
+    def load_schedule(self):
+        """
+        Restoring today's API usage, returns id to start the update from
+        :return:
+        """
 
-        return results
+        with self.db.conn:
+            self.db.conn.execute(self.sql_create_schedule_statement)
+
+        row = self.db.conn.execute(self.sql_schedule_statement,
+                                   {'api_key': self.api_key}).fetchone()
 
-    def update_data(self, downloaded_results):
+        used = row['used'] if row and row['day'] == self.today() else 0
+        self.limiter = RateLimiter(rate=self.rate,
+                                   daily_budget=self.daily_budget, used=used)
+        self.start_id = None
+        self.last_id = None
+        self.refused_id = None
+
+        # Resuming after the last title written by the previous run
+        if row and row['last_id'] is not None:
+            self.start_id = row['last_id'] + 1
+
+        return self.start_id
+
+    def save_schedule(self):
         """
-        Updating the data in the database
-        :param downloaded_results:
+        Saving today's API usage and the position of the update
         :return:
         """
 
-        for result in downloaded_results:
+        # Finished update starts from the beginning next time, otherwise
+        # from the first title refused or never given to the workers
+        last_id = None
+        if self.limiter.exhausted:
+            if self.refused_id is not None:
+                last_id = self.refused_id - 1
+            elif self.last_id is not None:
+                last_id = self.last_id
+            elif self.start_id is not None:
+                last_id = self.start_id - 1
 
-            data = result[0]  # Extracting the downloaded data from array
+        with self.db.conn:
+            self.db.conn.execute(self.sql_save_schedule_statement,
+                                 {'api_key': self.api_key, 'day': self.today(),
+                                  'used': self.limiter.used,
+                                  'last_id': last_id})
 
-            try:
-                self.insert_data(data)
-                info = {'Title': data['Title'], 'Status': 'Updated'}
-            except KeyError:
-                info = {'Error': data['Error'], 'Response': data['Response']}
+    @staticmethod
+    def today():
+        return time.strftime('%Y-%m-%d', time.gmtime())
+
+    async def stream_update(self, start_id=None):
+        """
+        Running the update pipeline with the selected download engine
+        :param start_id:
+        :return:
+        """
+
+        if self.mode == 'async':
+            async with AsyncDownloader(url=self.api_url,
+                                       max_requests=self.max_requests,
+                                       timeout=self.timeout,
+                                       retries=self.retries) as downloader:
+
+                async def fetch(title):
+                    return await downloader.download(self.api_query(title))
+
+                await self.run_pipeline(fetch, start_id)
+        else:
+            import concurrent.futures  # Needed only by the threads engine
+
+            loop = asyncio.get_running_loop()
 
-            self.results.append(info)
+            with self.open_sessions(), concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_requests) as executor:
 
-        return self.results
+                async def fetch(title):
+                    respond = await loop.run_in_executor(executor,
+                                                         self.download_data,
+                                                         title)
+                    return respond[0]
 
-    def insert_data(self, result):
+                await self.run_pipeline(fetch, start_id)
+
+    async def run_pipeline(self, fetch, start_id=None):
         """
-        Inserting data to the db
+        Streaming empty titles to fetch workers and downloaded data to writer
+        :param fetch:
+        :param start_id:
         :return:
         """
 
-        try:
-            # Converting money
-            money_str = result['BoxOffice']
-            money_to_insert = self.convert_integers(money_str)
+        # Only requests sent to the API count against the limits
+        fetch = self.limited(fetch)
+        if self.cache:
+            fetch = self.cached(fetch)
 
-            # Converting votes
-            votes_str = result['imdbVotes']
-            votes_to_insert = self.convert_integers(votes_str)
+        async def fetch_row(row):
+            return await fetch(row['Title'])
 
-            with self.db.conn:
-                self.db.c.execute(self.sql_data_update_statement,
-                                  {'title': result['Title'], 'year': result['Year'],
-                                   'runtime': result['Runtime'],
-                                   'genre': result['Genre'],
-                                   'director': result['Director'],
-                                   'writer': result['Writer'],
-                                   'cast': result['Actors'],
-                                   'language': result['Language'],
-                                   'country': result['Country'],
-                                   'awards': result['Awards'],
-                                   'imdbRating': result['imdbRating'],
-                                   'imdbVotes': votes_to_insert,
-                                   'boxoffice': money_to_insert
-                                   })
-        except KeyError as e:
-            raise e
+        pipeline = UpdatePipeline(titles=self.scheduled_titles(start_id),
+                                  fetch=fetch_row,
+                                  write=self.write_data,
+                                  workers=self.max_requests)
+        await pipeline.run()
 
-    def na_to_null(self, column):
+    def cached(self, fetch):
         """
-        Changing all of N/A values to NULL because of further conveniance
-        :param column:
+        Wrapping fetch function to use the responds cache before the API
+        :param fetch:
         :return:
         """
 
-        na_to_null = DBConfig.value_updater(self.db.movies_table)
-        sql_statement = na_to_null(column, "'N/A'", 'NULL')
+        async def cached_fetch(title):
+            respond = self.cache.get(title)
+
+            if respond is None:
+                respond = await fetch(title)
+                self.cache.put(title, respond)
+
+            return respond
+
+        return cached_fetch
+
+    def limited(self, fetch):
+        """
+        Wrapping fetch function to respect the rate and the daily budget
+        :param fetch:
+        :return:
+        """
 
+        async def limited_fetch(title):
+            await self.limiter.acquire()
+            respond = await fetch(title)
+
+            if respond.get('Error') == 'Request limit reached!':
+                # The API has refused the request, no point in trying today
+                self.limiter.exhaust()
+
+            return respond
+
+        return limited_fetch
+
+    def scheduled_titles(self, start_id=None):
+        """
+        Generating rows of empty titles from the start id, wrapping around
+        to the beginning, until the daily budget is used up
+        :param start_id:
+        :return:
+        """
+
+        if start_id is None:
+            ranges = [(-2 ** 63, 2 ** 63 - 1)]
+        else:
+            ranges = [(start_id, 2 ** 63 - 1), (-2 ** 63, start_id - 1)]
+
+        for first_id, last_id in ranges:
+            for row in self.empty_titles(first_id, last_id):
+                if self.limiter.exhausted:
+                    return
+
+                self.last_id = row['ID']
+                yield row
+
+    def schedule_position(self, row_id):
+        """
+        Sort key of the title in order of the schedule, titles before the
+        start id come after the rest
+        :param row_id:
+        :return:
+        """
+        return self.start_id is not None and row_id < self.start_id, row_id
+
+    def empty_titles(self, first_id=-2 ** 63, last_id=2 ** 63 - 1,
+                     page_size=1000):
+        """
+        Generating rows of titles with empty data page by page
+        :param first_id:
+        :param last_id:
+        :param page_size:
+        :return:
+        """
+
+        while True:
+            rows = self.db.conn.execute(self.sql_empty_titles_page_statement,
+                                        {'first_id': first_id,
+                                         'last_id': last_id,
+                                         'max_attempts': self.max_attempts,
+                                         'page_size': page_size}).fetchall()
+
+            yield from rows
+
+            if len(rows) < page_size:
+                return
+
+            first_id = rows[-1]['ID'] + 1
+
+    def write_data(self, row, respond):
+        """
+        Passing downloaded data and journal entry of a single title to
+        the batch writers
+        :param row:
+        :param respond:
+        :return:
+        """
+
+        # Commits only when the writers have flushed a full batch
         with self.db.conn:
             try:
-                self.db.c.execute(sql_statement)
-            except sqlite3.OperationalError:
-                print("Column doesn't exist")
+                parameters = self.data_parameters(respond)
+                parameters['id'] = row['ID']
+                self.writer.add(parameters)
+                status = 'Updated'
+            except KeyError:
+                status = respond.get('Error', 'Invalid response')
+
+            journal_status = self.journal_status(status)
+            if journal_status is None:
+                # Title refused by the limits is the next one to update
+                if self.refused_id is None or self.schedule_position(
+                        row['ID']) < self.schedule_position(self.refused_id):
+                    self.refused_id = row['ID']
+            else:
+                self.journal.add({'movie_id': row['ID'],
+                                  'status': journal_status,
+                                  'last_error': None if status == 'Updated'
+                                  else status})
+
+        self.statuses[status] += 1
+
+        if not sum(self.statuses.values()) % self.progress_every:
+            self.report_progress()
 
     @staticmethod
-    def convert_integers(int_to_convert):
+    def journal_status(status):
         """
-        Converting money to integer
+        Status of the title in the journal, None if the title wasn't
+        really attempted because of the limits
+        :param status:
         :return:
         """
 
+        if status == 'Updated':
+            return 'done'
+        if status == 'Movie not found!':
+            return 'not_found'
+        if status in ('Daily limit reached!', 'Request limit reached!'):
+            return None
+
+        return 'failed'
+
+    def report_progress(self):
+        """
+        Printing the progress of the update
+        :return:
+        """
+
+        processed = sum(self.statuses.values())
+        elapsed = time.perf_counter() - self.start_time
+
+        print(f'Processed {processed} titles, {self.statuses["Updated"]} '
+              f'updated ({processed / elapsed:.1f} titles/sec)',
+              file=sys.stderr)
+
+    def api_query(self, title):
+        """
+        Query string parameters of API request
+        :param title:
+        :return:
+        """
+        return {'apikey': self.api_key, 't': title,
+                'r': 'json'}  # Get full data based on title in json format
+
+    def default_cache(self):
+        """
+        Cache in the directory of the database file, the cache of in-memory
+        database is kept in memory as well
+        :return:
+        """
+
+        db_name = self.db.db_name
+        if db_name in ('', ':memory:'):
+            return ':memory:'
+
+        return os.path.join(os.path.dirname(os.path.abspath(db_name)),
+                            self.cache_name)
+
+    @contextmanager
+    def open_sessions(self):
+        """
+        Keep-alive session of every download thread, sessions aren't
+        thread-safe so they aren't shared
+        :return:
+        """
+
+        import threading  # Needed only by the threads engine
+
+        self.sessions = threading.local()
+        self.opened_sessions = []
+
         try:
-            money_int = Decimal(sub(r'[^\d.]', '', int_to_convert))
-        except Exception:
-            # Tried to handle particular exception but can't catch it
-            return str(int_to_convert)
+            yield self.sessions
+        finally:
+            for session in self.opened_sessions:
+                session.close()
+            self.sessions = None
+            self.opened_sessions = []
+
+    def thread_session(self):
+        """
+        Session of the current download thread, opened on its first request
+        :return:
+        """
+
+        import requests  # Imported on use, it slows down the startup
+
+        session = getattr(self.sessions, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self.sessions.session = session
+            self.opened_sessions.append(session)
+
+        return session
+
+    def download_data(self, title):
+        """
+        Downloading data using API
+        :param title:
+        :return:
+        """
+
+        import requests  # Imported on use, it slows down the startup
+
+        results = []
+
+        client = requests if self.sessions is None else self.thread_session()
+        respond = client.get(self.api_url, params=self.api_query(title),
+                             timeout=self.timeout).json()
+
+        results.append(respond)
+
+        return results
+
+    def data_parameters(self, result):
+        """
+        Converting downloaded data to parameters of the update statement
+        :param result:
+        :return:
+        """
 
-        return str(money_int)
+        # Numbers are parsed, N/A of every field is NULL
+        return FieldNormalizer.normalize(result)
 
     def get_keyword(self):
         return self.keyword
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+
+class QuotaExceeded(Exception):
+    """ Daily budget of requests is used up """
+
+
+class RateLimiter:
+    """ Token bucket limiting requests per second and requests per day """
+
+    def __init__(self, rate=None, daily_budget=None, used=0, burst=None):
+        self.rate = rate  # Requests per second, None is unlimited
+        self.burst = burst or 1.0  # Bucket capacity, requests sent at once
+        self.daily_budget = daily_budget  # Requests per day, None is unlimited
+        self.used = used  # Requests already made today
+
+        self.clock = time.monotonic
+        self._tokens = self.burst
+        self._updated = self.clock()
+
+    @property
+    def remaining(self):
+        """
+        Requests left in today's budget
+        :return:
+        """
+
+        if self.daily_budget is None:
+            return None
+
+        return max(0, self.daily_budget - self.used)
+
+    @property
+    def exhausted(self):
+        return self.remaining == 0
+
+    def exhaust(self):
+        """
+        Marking the budget as used up, e.g. after the API refused a request
+        :return:
+        """
+
+        if self.daily_budget is None:
+            self.daily_budget = self.used
+        self.used = max(self.used, self.daily_budget)
+
+    async def acquire(self):
+        """
+        Waiting for the token of a single request
+        :return:
+        """
+
+        while True:
+            if self.exhausted:
+                raise QuotaExceeded('Daily limit reached!')
+
+            if self.rate is None:
+                break
+
+            now = self.clock()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                break
+
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        self.used += 1
@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import time
+
+
+class ResponseCache:
+    """ Persistent cache of API responds keyed by title """
+
+    def __init__(self, path, ttl=30 * 24 * 3600, negative_ttl=7 * 24 * 3600,
+                 commit_every=100):
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS RESPONSES (
+                             KEY text PRIMARY KEY,
+                             RESPOND text,
+                             FOUND integer,
+                             FETCHED_AT float)""")
+
+        self.ttl = ttl  # Seconds before found movie is downloaded again
+        self.negative_ttl = negative_ttl  # Seconds for not found movie
+        self.commit_every = commit_every  # Puts between commits
+
+        self.clock = time.time
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+
+    @staticmethod
+    def cache_key(title):
+        """
+        Normalized title, the API doesn't care about case and whitespaces
+        :param title:
+        :return:
+        """
+        return ' '.join(str(title).split()).lower()
+
+    @staticmethod
+    def is_cacheable(respond):
+        """
+        Only movies and 'Movie not found!' are cached, errors like
+        exceeded limit or timeout must be downloaded again
+        :param respond:
+        :return:
+        """
+        return respond.get('Response') == 'True' or \
+            respond.get('Error') == 'Movie not found!'
+
+    def get(self, title):
+        """
+        Getting not expired respond or None
+        :param title:
+        :return:
+        """
+
+        row = self.conn.execute("""SELECT RESPOND, FOUND, FETCHED_AT
+                                   FROM RESPONSES WHERE KEY = ?""",
+                                (self.cache_key(title),)).fetchone()
+
+        if row is not None:
+            respond, found, fetched_at = row
+            ttl = self.ttl if found else self.negative_ttl
+
+            if self.clock() - fetched_at < ttl:
+                self.hits += 1
+                return json.loads(respond)
+
+        self.misses += 1
+        return None
+
+    def put(self, title, respond):
+        """
+        Saving downloaded respond
+        :param title:
+        :param respond:
+        :return:
+        """
+
+        if not self.is_cacheable(respond):
+            return
+
+        self.conn.execute("""INSERT OR REPLACE INTO
+                             RESPONSES(KEY, RESPOND, FOUND, FETCHED_AT)
+                             VALUES (?, ?, ?, ?)""",
+                          (self.cache_key(title), json.dumps(respond),
+                           respond.get('Response') == 'True', self.clock()))
+
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        """
+        Saving pending responds on disk
+        :return:
+        """
+
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self):
+        """
+        Committing and closing the cache
+        :return:
+        """
+
+        self.commit()
+        self.conn.close()
+
+    def report(self):
+        """
+        Summary of cache usage
+        :return:
+        """
+        return f'Cache hits: {self.hits}, misses: {self.misses}'
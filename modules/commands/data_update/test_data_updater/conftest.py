@@ -0,0 +1,22 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from modules.commands.data_update.test_data_updater.stub_omdb import \
+    StubOMDbHandler
+
+
+@pytest.fixture(scope='module')
+def stub_server():
+    """ Setup of the stub OMDb server before tests """
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOMDbHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+
+    # Teardown
+    server.shutdown()
+    server.server_close()
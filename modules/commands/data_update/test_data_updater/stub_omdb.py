@@ -0,0 +1,62 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubOMDbHandler(BaseHTTPRequestHandler):
+    """ Local stub of the OMDb API """
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive connections
+    clients = set()  # Client addresses, one per TCP connection
+    failures = {}  # Title -> number of 503 responses left
+    redirects = {}  # Title -> location of 301 response
+
+    @staticmethod
+    def respond(title):
+        """
+        Respond of the API, titles starting with Movie are found
+        :param title:
+        :return:
+        """
+
+        if title.startswith('Movie'):
+            return {'Title': title, 'Year': '2000', 'Runtime': '100 min',
+                    'Genre': 'Drama', 'Director': 'Director', 'Writer': 'Writer',
+                    'Actors': 'Actor', 'Language': 'English', 'Country': 'USA',
+                    'Awards': 'N/A', 'imdbRating': '7.5',
+                    'imdbVotes': '1,234', 'BoxOffice': '$5,000',
+                    'Response': 'True'}
+
+        return {'Response': 'False', 'Error': 'Movie not found!'}
+
+    def do_GET(self):
+        StubOMDbHandler.clients.add(self.client_address)
+        title = parse_qs(urlsplit(self.path).query)['t'][0]
+
+        if title == 'Slow':
+            time.sleep(0.5)
+
+        if title in StubOMDbHandler.redirects:
+            self.send_response(301)
+            self.send_header('Location', StubOMDbHandler.redirects[title])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if StubOMDbHandler.failures.get(title):
+            StubOMDbHandler.failures[title] -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = json.dumps(self.respond(title)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,63 @@
+from modules.commands.data_update.async_downloader import AsyncDownloader
+from modules.commands.data_update.test_data_updater.stub_omdb import \
+    StubOMDbHandler
+
+
+def test_download_all(stub_server):
+    """
+    Testing bounded concurrency and reuse of connections
+    :param stub_server:
+    :return:
+    """
+
+    StubOMDbHandler.clients.clear()
+    downloader = AsyncDownloader(url=stub_server, max_requests=2)
+
+    queries = [{'t': f'Movie {number}'} for number in range(20)]
+    results = downloader.download_all(queries)
+
+    assert [result['Title'] for result in results] == [query['t'] for query in
+                                                       queries]
+    assert downloader.connections_opened <= 2
+    assert len(StubOMDbHandler.clients) <= 2
+
+
+def test_download_retry_and_timeout(stub_server):
+    """
+    Testing retrying of failed requests and the timeout
+    :param stub_server:
+    :return:
+    """
+
+    StubOMDbHandler.failures['Movie flaky'] = 2
+    downloader = AsyncDownloader(url=stub_server, timeout=0.2, retries=2,
+                                 backoff=0.01)
+
+    results = downloader.download_all([{'t': 'Movie flaky'}, {'t': 'Slow'}])
+
+    assert results[0]['Title'] == 'Movie flaky'
+    assert results[1] == {'Error': 'Request timed out', 'Response': 'False'}
+
+
+def test_download_redirect(stub_server):
+    """
+    Testing redirects followed within the same origin only
+    :param stub_server:
+    :return:
+    """
+
+    StubOMDbHandler.redirects.update({
+        'Moved': '/?t=Movie+moved',
+        'Loop': '/?t=Loop',
+        'Away': 'https://www.omdbapi.com/?t=Away'})
+    downloader = AsyncDownloader(url=stub_server, retries=0)
+
+    results = downloader.download_all([{'t': 'Moved'}, {'t': 'Loop'},
+                                       {'t': 'Away'}])
+
+    assert results[0]['Title'] == 'Movie moved'
+    assert results[1] == {'Error': 'HTTP 301 after 5 redirects',
+                          'Response': 'False'}
+    assert results[2] == {'Error': 'HTTP 301 redirect to other origin: '
+                                   'https://www.omdbapi.com/?t=Away',
+                          'Response': 'False'}
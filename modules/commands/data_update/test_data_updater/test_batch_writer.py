@@ -0,0 +1,53 @@
+import pytest
+
+from modules.commands.data_update.batch_writer import BatchWriter
+from modules.db_config.db_config import DBConfig
+
+
+@pytest.fixture(scope='module')
+def database():
+    """ Setup of the database before tests """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE IF NOT EXISTS MOVIES (
+                    ID INTEGER PRIMARY KEY,
+                    TITLE text,
+                    DIRECTOR text,
+                    UNIQUE(TITLE));
+                    """)
+        db.c.executemany("INSERT INTO MOVIES(TITLE) VALUES (?)",
+                         [(f'Movie {number}',) for number in range(10)])
+
+    yield db
+
+
+def test_batch_writer(database):
+    """
+    Testing writing rows in batches
+    :param database:
+    :return:
+    """
+
+    writer = BatchWriter(db=database,
+                         sql_statement="""UPDATE MOVIES SET director = :director
+                                          WHERE title = :title""",
+                         batch_size=4)
+
+    with database.conn:
+        for number in range(10):
+            writer.add({'title': f'Movie {number}', 'director': 'Director'})
+
+        # Two full batches are already written
+        assert writer.batches_written == 2
+        assert len(writer.batch) == 2
+
+        writer.flush()
+
+    assert writer.rows_written == 10
+    assert writer.batches_written == 3
+    assert '10 rows' in writer.report()
+
+    results = database.execute_statement(
+        "SELECT * FROM MOVIES WHERE director IS NULL")
+    assert not results
@@ -1,149 +1,315 @@
-import concurrent
-import json
-import sqlite3
-from pprint import pprint as pp
+import concurrent.futures
+import threading
+import time
 
 import pytest
 
+from modules.commands.data_update.batch_writer import BatchWriter
 from modules.commands.data_update.data_update import DataUpdater
+from modules.commands.data_update.test_data_updater.stub_omdb import \
+    StubOMDbHandler
 from modules.db_config.db_config import DBConfig
 
 
-@pytest.fixture(scope='module')
-def database():
-    """ Setup of the database before tests """
+def create_database(titles, db_name=':memory:'):
+    """
+    Database of the given empty titles
+    :param titles:
+    :param db_name:
+    :return:
+    """
 
-    db = DBConfig(
-        db_name='/home/przemek/PycharmProjects/movies_db/modules/commands/data_update/test_data_updater/resources/movies_test.sqlite')  # Creating new db
+    db = DBConfig(db_name=db_name)
     with db.conn:
         db.c.execute("""CREATE TABLE IF NOT EXISTS MOVIES (
                     ID INTEGER PRIMARY KEY,
                     TITLE text,
-                    YEAR integer, 
-                    RUNTIME text, 
-                    GENRE text, 
-                    DIRECTOR text, 
-                    CAST text, 
-                    WRITER text, 
-                    LANGUAGE text, 
-                    COUNTRY text, 
-                    AWARDS text, 
-                    IMDb_Rating float, 
-                    IMDb_votes integer, 
+                    YEAR integer,
+                    RUNTIME text,
+                    GENRE text,
+                    DIRECTOR text,
+                    CAST text,
+                    WRITER text,
+                    LANGUAGE text,
+                    COUNTRY text,
+                    AWARDS text,
+                    IMDb_Rating float,
+                    IMDb_votes integer,
                     BOX_OFFICE integer,
                     UNIQUE(TITLE));
                     """)
+        db.c.executemany("INSERT INTO MOVIES(TITLE) VALUES (?)",
+                         [(title,) for title in titles])
 
-        try:
-            db.c.execute(
-                """INSERT INTO MOVIES(TITLE) VALUES ('The Shawshank Redemption')""")
-            db.c.execute("""INSERT INTO MOVIES(TITLE) VALUES ('Memento')""")
-            db.c.execute("""INSERT INTO MOVIES(TITLE) VALUES ('In Bruges')""")
-            db.c.execute("""INSERT INTO MOVIES(TITLE) VALUES ('Gods')""")
-            db.c.execute("""INSERT INTO MOVIES(TITLE) VALUES ('The Godfather')""")
-            db.c.execute("""INSERT INTO MOVIES(TITLE) VALUES ('Niemategonapewno')""")
-        except sqlite3.IntegrityError:
-            pass
+    return db
 
-    yield db
 
-    # Teardown - deleting the tested table
-    db.c.execute("DROP TABLE MOVIES")
+@pytest.fixture(scope='module')
+def database():
+    """ Setup of the database before tests """
+
+    yield create_database(['Movie 1', 'Movie 2', 'Missing'])
 
 
-@pytest.fixture(scope='module')
-def data_updater(database):
+def test_handle_async(stub_server, database):
     """
-    Setup the data updater class before tests
+    Testing the update command with async engine
+    :param stub_server:
     :param database:
     :return:
     """
 
-    # Setup
-    data_updater = DataUpdater(db=database)
-    yield data_updater
+    data_updater = DataUpdater(db=database, mode='async', cache_path=None,
+                               daily_budget=None)
+    data_updater.api_url = stub_server
 
-    # Teardown
-    del data_updater
+    results = data_updater.handle(parameter=True)
+    assert sorted(results, key=lambda result: result['Status']) == [
+        {'Status': 'Movie not found!', 'Titles': 1},
+        {'Status': 'Updated', 'Titles': 2}]
 
+    row = database.execute_statement(
+        "SELECT * FROM MOVIES WHERE title = 'Movie 1'")[0]
+    assert row['Director'] == 'Director'
+    assert row['BOX_OFFICE'] == 5000
+    assert row['Awards'] is None  # N/A is written as NULL
 
-@pytest.fixture(scope='module')
-def empty_titles(data_updater, database):
+
+def test_handle_threads(stub_server, database):
     """
-    Setup the empty titles before tests
-    :param data_updater:
+    Testing the update command with threads engine
+    :param stub_server:
     :param database:
     :return:
     """
 
-    # Setup
-    empty_titles = database.execute_statement(data_updater.sql_empty_titles_statement)
-    yield empty_titles
+    with database.conn:
+        database.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Movie 3')")
 
-    # Teardown
-    del empty_titles
+    data_updater = DataUpdater(db=database, mode='threads', cache_path=None,
+                               daily_budget=None)
+    data_updater.api_url = stub_server
 
+    # Not found title is skipped thanks to the journal
+    results = data_updater.handle(parameter=True)
+    assert results == [{'Status': 'Updated', 'Titles': 1}]
 
-@pytest.fixture(scope='module')
-def downloaded_data(data_updater, empty_titles):
+
+def test_default_cache(tmp_path):
+    """
+    Testing the cache kept next to the database file
+    :param tmp_path:
+    :return:
+    """
+
+    db = create_database([], db_name=str(tmp_path / 'movies.sqlite'))
+    data_updater = DataUpdater(db=db, daily_budget=None)
+    assert data_updater.default_cache() == str(tmp_path / 'omdb_cache.sqlite')
+
+    data_updater.handle(parameter=True)
+    assert (tmp_path / 'omdb_cache.sqlite').exists()
+
+    # In-memory database has in-memory cache
+    data_updater = DataUpdater(db=DBConfig(db_name=':memory:'))
+    assert data_updater.default_cache() == ':memory:'
+
+
+def test_open_sessions(database):
+    """
+    Testing session of every download thread
+    :param database:
+    :return:
+    """
+
+    data_updater = DataUpdater(db=database, cache_path=None)
+
+    with data_updater.open_sessions(), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        barrier = threading.Barrier(2)
+
+        def thread_session(_):
+            barrier.wait()  # Both threads take a session
+            return data_updater.thread_session()
+
+        sessions = list(executor.map(thread_session, range(2)))
+        assert sessions[0] is not sessions[1]
+        assert data_updater.thread_session() not in sessions
+        assert len(data_updater.opened_sessions) == 3
+
+    assert data_updater.sessions is None
+    assert data_updater.opened_sessions == []
+
+
+def test_handle_daily_budget(stub_server, database):
     """
-    Setup the downloaded data before tests
-    :param empty_titles:
-    :param data_updater:
+    Testing stopping the update at the daily budget and resuming it
+    :param stub_server:
+    :param database:
     :return:
     """
 
-    # Setup
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        downloaded_data = executor.map(data_updater.download_data, empty_titles)
+    with database.conn:
+        database.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Movie 4')")
+        database.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Movie 5')")
 
-    yield downloaded_data
+    data_updater = DataUpdater(db=database, mode='async', cache_path=None,
+                               daily_budget=1)
+    data_updater.api_url = stub_server
+    data_updater.api_key = 'budget'
 
-    # Teardown
-    del downloaded_data
+    data_updater.handle(parameter=True)
+    schedule = database.execute_statement(
+        "SELECT * FROM UPDATE_SCHEDULE WHERE api_key = 'budget'")[0]
+    assert schedule['used'] == 1
+    assert schedule['last_id'] is not None
 
+    # Budget is used up for today
+    results = data_updater.handle(parameter=True)
+    assert results == []
 
-def test_empty_titles(empty_titles):
+    # Unlimited run resumes and finishes the update
+    data_updater.daily_budget = None
+    data_updater.handle(parameter=True)
+    results = database.execute_statement(
+        "SELECT title FROM MOVIES WHERE director IS NULL")
+    assert [result['Title'] for result in results] == ['Missing']
+
+    schedule = database.execute_statement(
+        "SELECT * FROM UPDATE_SCHEDULE WHERE api_key = 'budget'")[0]
+    assert schedule['last_id'] is None
+
+
+def test_handle_daily_budget_refused(stub_server):
     """
-    Testing getting the list of empty titles
-    :param empty_titles:
+    Testing resuming from the first title refused by the daily budget
+    :param stub_server:
     :return:
     """
 
-    # Testing the results of getting list of empty titles
-    assert empty_titles[0]['Title'] == 'The Shawshank Redemption'
-    assert empty_titles[1]['Title'] == 'Memento'
-    assert empty_titles[2]['Title'] == 'In Bruges'
-    assert empty_titles[3]['Title'] == 'Gods'
-    assert empty_titles[4]['Title'] == 'The Godfather'
+    database = create_database([f'Movie {number}' for number in range(1, 7)])
+
+    # More titles are queued than there are workers
+    data_updater = DataUpdater(db=database, mode='async', cache_path=None,
+                               daily_budget=1, max_requests=2)
+    data_updater.api_url = stub_server
 
+    results = data_updater.handle(parameter=True)
+    assert {'Status': 'Updated', 'Titles': 1} in results
+    assert 'Daily limit reached!' in [result['Status'] for result in results]
 
-def test_download_data(downloaded_data):
+    # Next day starts from the refused titles
+    with database.conn:
+        database.c.execute("UPDATE UPDATE_SCHEDULE SET day = '2000-01-01'")
+    data_updater.handle(parameter=True)
+
+    results = database.execute_statement(
+        "SELECT title FROM MOVIES WHERE director IS NOT NULL ORDER BY id")
+    assert [result['Title'] for result in results] == ['Movie 1', 'Movie 2']
+
+
+def test_handle_journal(stub_server, database):
     """
-    Testing downloading the data using API
-    :param downloaded_data:
+    Testing skipping finished and given up titles with the journal
+    :param stub_server:
+    :param database:
     :return:
     """
 
-    # Checking json data corectness
-    # Ignore assertion error if imdbVotes doesn't match
-    with open(
-            '/home/przemek/PycharmProjects/movies_db/modules/commands/data_update/test_data_updater/resources/json_movies.json',
-            'r') as correct_file:
-        correct_json = json.load(correct_file)
-        assert correct_json == next(downloaded_data)[0]
+    StubOMDbHandler.failures['Movie broken'] = 100
+    with database.conn:
+        database.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Movie broken')")
+
+    data_updater = DataUpdater(db=database, mode='async', cache_path=None,
+                               daily_budget=None, retries=0, max_attempts=2)
+    data_updater.api_url = stub_server
+
+    # Not found title is journaled already, broken one fails twice
+    assert data_updater.handle(parameter=True) == [
+        {'Status': 'HTTP 503', 'Titles': 1}]
+    assert data_updater.handle(parameter=True) == [
+        {'Status': 'HTTP 503', 'Titles': 1}]
+    assert data_updater.handle(parameter=True) == []
+
+    journal = database.execute_statement(
+        """SELECT title, status, attempts, last_error FROM UPDATE_JOURNAL
+           JOIN MOVIES ON MOVIES.id = UPDATE_JOURNAL.movie_id
+           ORDER BY title""")
+    journal = {row['Title']: tuple(row)[1:] for row in journal}
+
+    assert journal['Missing'] == ('not_found', 1, 'Movie not found!')
+    assert journal['Movie broken'] == ('failed', 2, 'HTTP 503')
+    assert journal['Movie 1'] == ('done', 1, None)
 
+    # Empty titles are found with the partial index
+    assert 'MOVIES_EMPTY_TITLES' in database.index_manager.index_names()
 
-def test_update_data(data_updater, downloaded_data):
+
+def test_data_parameters(database):
     """
-    Test inserting the data to db
-    :param data_updater:
-    :param downloaded_data:
+    Testing parameters of the update statement parsed from the respond
+    :param database:
     :return:
     """
-    results = data_updater.update_data(downloaded_data)
-    assert results == [{'Title': 'Memento', 'Status': 'Updated'},
-                       {'Title': 'In Bruges', 'Status': 'Updated'},
-                       {'Title': 'Gods', 'Status': 'Updated'},
-                       {'Title': 'The Godfather', 'Status': 'Updated'},
-                       {'Error': 'Movie not found!', 'Response': 'False'}]
+
+    data_updater = DataUpdater(db=database, cache_path=None)
+    parameters = data_updater.data_parameters(
+        {'Title': 'Memento', 'Year': '2000', 'Runtime': '113 min',
+         'Genre': 'Mystery, Thriller', 'Director': 'Christopher Nolan',
+         'Writer': 'N/A', 'Actors': 'Guy Pearce', 'Language': 'English',
+         'Country': 'USA', 'Awards': 'N/A', 'imdbRating': '8.4',
+         'imdbVotes': '1,234,567', 'BoxOffice': '$25,544,867',
+         'Response': 'True'})
+
+    assert parameters['runtime'] == 113
+    assert parameters['imdbRating'] == 8.4
+    assert parameters['imdbVotes'] == 1234567
+    assert parameters['boxoffice'] == 25544867
+    assert parameters['writer'] is None
+
+    # Fail case - error respond of the API
+    with pytest.raises(KeyError):
+        data_updater.data_parameters({'Response': 'False',
+                                      'Error': 'Movie not found!'})
+
+
+def test_write_data():
+    """
+    Testing data and journal of single titles passed to the writers
+    :return:
+    """
+
+    database = create_database(['Movie 1', 'Missing', 'Movie limited'])
+    data_updater = DataUpdater(db=database, cache_path=None)
+    database.ensure_types()
+    data_updater.create_journal()
+
+    data_updater.writer = BatchWriter(
+        db=database, sql_statement=data_updater.sql_data_update_by_id_statement)
+    data_updater.journal = BatchWriter(
+        db=database, sql_statement=data_updater.sql_journal_statement,
+        flush_first=[data_updater.writer])
+    data_updater.start_time = time.perf_counter()
+
+    rows = {row['Title']: row for row in
+            database.execute_statement('SELECT id, title FROM MOVIES')}
+    data_updater.write_data(rows['Movie 1'], StubOMDbHandler.respond('Movie 1'))
+    data_updater.write_data(rows['Missing'], StubOMDbHandler.respond('Missing'))
+    data_updater.write_data(rows['Movie limited'],
+                            {'Response': 'False',
+                             'Error': 'Daily limit reached!'})
+    with database.conn:
+        data_updater.journal.flush()
+
+    assert data_updater.statuses == {'Updated': 1, 'Movie not found!': 1,
+                                     'Daily limit reached!': 1}
+    assert data_updater.refused_id == rows['Movie limited']['ID']
+
+    # Refused title isn't journaled
+    journal = database.execute_statement(
+        """SELECT title, status FROM UPDATE_JOURNAL
+           JOIN MOVIES ON MOVIES.id = UPDATE_JOURNAL.movie_id
+           ORDER BY title""")
+    assert [tuple(row) for row in journal] == [('Missing', 'not_found'),
+                                               ('Movie 1', 'done')]
+    assert database.execute_statement(
+        "SELECT runtime FROM MOVIES WHERE title = 'Movie 1'")[0][0] == 100
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from modules.commands.data_update.rate_limiter import QuotaExceeded, RateLimiter
+
+
+def test_rate():
+    """
+    Testing the number of requests per second
+    :return:
+    """
+
+    limiter = RateLimiter(rate=50)
+
+    async def acquire_all():
+        for _ in range(26):
+            await limiter.acquire()
+
+    start = limiter.clock()
+    asyncio.run(acquire_all())
+
+    # First token is in the bucket, the next 25 take half of a second
+    assert limiter.clock() - start >= 0.45
+    assert limiter.used == 26
+
+
+def test_daily_budget():
+    """
+    Testing the daily budget of requests
+    :return:
+    """
+
+    limiter = RateLimiter(daily_budget=5, used=3)
+    assert limiter.remaining == 2
+
+    asyncio.run(limiter.acquire())
+    asyncio.run(limiter.acquire())
+    assert limiter.exhausted
+
+    with pytest.raises(QuotaExceeded):
+        asyncio.run(limiter.acquire())
+
+    # Refused request exhausts unlimited budget as well
+    limiter = RateLimiter()
+    asyncio.run(limiter.acquire())
+    limiter.exhaust()
+    assert limiter.exhausted
@@ -0,0 +1,60 @@
+import pytest
+
+from modules.commands.data_update.response_cache import ResponseCache
+
+
+@pytest.fixture(scope='module')
+def cache():
+    """ Setup of the responds cache before tests """
+
+    cache = ResponseCache(':memory:', ttl=100, negative_ttl=10)
+    cache.clock = lambda: 1000.0
+
+    yield cache
+
+    # Teardown
+    cache.close()
+
+
+def test_get_put(cache):
+    """
+    Testing caching of found and not found movies
+    :param cache:
+    :return:
+    """
+
+    movie = {'Title': 'Memento', 'Director': 'Christopher Nolan',
+             'Response': 'True'}
+    not_found = {'Error': 'Movie not found!', 'Response': 'False'}
+
+    assert cache.get('Memento') is None
+
+    cache.put('Memento', movie)
+    cache.put('Niemategonapewno', not_found)
+
+    # Key is normalized
+    assert cache.get('  memento ') == movie
+    assert cache.get('Niemategonapewno') == not_found
+
+    # Transient errors are never cached
+    cache.put('Gods', {'Error': 'Request limit reached!', 'Response': 'False'})
+    assert cache.get('Gods') is None
+
+    assert cache.hits == 2
+    assert cache.misses == 2
+
+
+def test_ttl(cache):
+    """
+    Testing expiration of cached responds
+    :param cache:
+    :return:
+    """
+
+    # Not found movie expires sooner than the found one
+    cache.clock = lambda: 1050.0
+    assert cache.get('Niemategonapewno') is None
+    assert cache.get('Memento')['Title'] == 'Memento'
+
+    cache.clock = lambda: 1100.0
+    assert cache.get('Memento') is None
@@ -0,0 +1,40 @@
+import asyncio
+
+from modules.commands.data_update.update_pipeline import UpdatePipeline
+
+
+def test_pipeline_streaming():
+    """
+    Testing that writes start before all of the titles are produced
+    :return:
+    """
+
+    events = []
+
+    def titles():
+        for number in range(50):
+            events.append(('produced', number))
+            yield number
+
+    async def fetch(title):
+        await asyncio.sleep(0)
+        if title == 13:
+            raise ValueError('Broken title')
+        return {'Title': title}
+
+    def write(title, respond):
+        events.append(('written', title, respond))
+
+    pipeline = UpdatePipeline(titles=titles(), fetch=fetch, write=write,
+                              workers=4)
+    asyncio.run(pipeline.run())
+
+    written = [event for event in events if event[0] == 'written']
+    assert sorted(event[1] for event in written) == list(range(50))
+
+    # Failed title is written as error respond
+    assert ('written', 13, {'Error': 'Broken title', 'Response': 'False'}) in \
+        written
+
+    # First write happened before the last title was produced
+    assert events.index(written[0]) < events.index(('produced', 49))
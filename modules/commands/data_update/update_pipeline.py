@@ -0,0 +1,89 @@
+import asyncio
+
+
+class UpdatePipeline:
+    """ Streaming titles through fetch workers to a single writer """
+
+    def __init__(self, titles, fetch, write, workers=10, queue_size=None):
+        self.titles = titles  # Iterable of titles or rows, consumed lazily
+        self.fetch = fetch  # Coroutine function downloading data of a title
+        self.write = write  # Function writing title and its downloaded data
+        self.workers = workers  # Number of concurrent fetch workers
+
+        # Bounded queues keep the memory flat
+        self.queue_size = queue_size or workers * 2
+
+    async def run(self):
+        """
+        Running producer, fetch workers and writer until titles are exhausted
+        :return:
+        """
+
+        titles = asyncio.Queue(maxsize=self.queue_size)
+        responds = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [asyncio.ensure_future(self._produce(titles))]
+        tasks += [asyncio.ensure_future(self._fetch_worker(titles, responds))
+                  for _ in range(self.workers)]
+        tasks.append(asyncio.ensure_future(self._consume(responds)))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Stopping the rest of the tasks after the failure of any of them
+            for task in tasks:
+                task.cancel()
+
+    async def _produce(self, titles):
+        """
+        Putting titles into the queue, one stop signal per worker at the end
+        :param titles:
+        :return:
+        """
+
+        for title in self.titles:
+            await titles.put(title)
+
+        for _ in range(self.workers):
+            await titles.put(None)
+
+    async def _fetch_worker(self, titles, responds):
+        """
+        Downloading data of queued titles
+        :param titles:
+        :param responds:
+        :return:
+        """
+
+        while True:
+            title = await titles.get()
+            if title is None:
+                await responds.put(None)
+                return
+
+            try:
+                respond = await self.fetch(title)
+            except Exception as e:
+                # Single failed title shouldn't stop the whole update
+                respond = {'Error': str(e) or e.__class__.__name__,
+                           'Response': 'False'}
+
+            await responds.put((title, respond))
+
+    async def _consume(self, responds):
+        """
+        Writing downloaded data until every worker has finished
+        :param responds:
+        :return:
+        """
+
+        workers_running = self.workers
+
+        while workers_running:
+            item = await responds.get()
+            if item is None:
+                workers_running -= 1
+                continue
+
+            title, respond = item
+            self.write(title, respond)
@@ -1,37 +1,122 @@
 import csv
+import gzip
+import io
+import os
+import sqlite3
 from datetime import datetime
 
 
 class CSVWriter:
     """ Creating csv file """
 
-    def __init__(self):
+    def __init__(self, path=None, compression=None):
         self.title = 'None'
+        self.path = path  # Timestamped file in the current dir if None
+        self.compression = compression or self.guess_compression(path)
+
+        self.rows_written = 0
+        self.bytes_written = 0
+
+    @staticmethod
+    def guess_compression(path):
+        """
+        Compression of the file by its extension
+        :param path:
+        :return:
+        """
+
+        extension = os.path.splitext(str(path))[1].lower()
+
+        if extension == '.gz':
+            return 'gzip'
+        if extension == '.zst':
+            return 'zstd'
+
+        return None
 
     def write_csv(self, keyword, data):
         """
-        Saving results query as csv file
+        Saving results query as csv file, rows are written as they come
         :param keyword:
-        :param data:
+        :param data: iterable of rows
         :return:
         """
 
+        rows = iter(data)
         try:
-            fieldnames = data[0].keys()  # Getting the csv fieldnames
-        except IndexError as e:
-            raise e
+            first_row = next(rows)
+        except StopIteration:
+            raise IndexError('No results to write')
+
+        fieldnames = list(first_row.keys())  # Getting the csv fieldnames
 
-        self.title = self.create_title(keyword)
+        # Values in order of the header
+        if isinstance(first_row, sqlite3.Row):
+            row_values = tuple
+        else:
+            def row_values(row):
+                return [row[key] for key in fieldnames]
 
-        with open(self.title, 'w') as csv_w:
+        self.title = self.path or self.create_title(keyword) + self.extension
+        self.rows_written = 0
 
-            csv_writer = csv.DictWriter(csv_w, fieldnames=fieldnames, delimiter=',')
-            csv_writer.writeheader()
+        with self.open_file(self.title) as csv_w:
+
+            csv_writer = csv.writer(csv_w, delimiter=',')
+            csv_writer.writerow(fieldnames)
 
             # Writing row in csv file for every result
-            for result in data:
-                row = dict(result)
-                csv_writer.writerow(row)
+            csv_writer.writerow(row_values(first_row))
+            self.rows_written += 1
+
+            for row in rows:
+                csv_writer.writerow(row_values(row))
+                self.rows_written += 1
+
+        self.bytes_written = os.path.getsize(self.title)
+
+    def open_file(self, title):
+        """
+        Opening text file with the chosen compression
+        :param title:
+        :return:
+        """
+
+        if self.compression == 'gzip':
+            return gzip.open(title, 'wt', newline='', encoding='utf-8')
+
+        if self.compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError('zstd compression requires the zstandard '
+                                 'package')
+
+            raw = open(title, 'wb')
+            writer = zstandard.ZstdCompressor().stream_writer(raw,
+                                                              closefd=True)
+            return io.TextIOWrapper(writer, newline='', encoding='utf-8')
+
+        if self.compression is not None:
+            raise ValueError(f'Unknown compression: {self.compression}')
+
+        return open(title, 'w', newline='', encoding='utf-8')
+
+    def report(self):
+        """
+        Summary of written file
+        :return:
+        """
+        return (f'Written {self.rows_written} rows, {self.bytes_written} bytes '
+                f'to {self.title}')
+
+    @property
+    def extension(self):
+        """
+        Extension of compressed file added to the created title
+        :return:
+        """
+        return {'gzip': '.gz', 'zstd': '.zst'}.get(self.compression, '')
 
     @staticmethod
     def create_title(keyword):
@@ -1,3 +1,6 @@
+import csv
+import gzip
+import os
 import sqlite3
 
 import pytest
@@ -83,14 +86,16 @@ def data_filter(database):
 
 
 @pytest.fixture(scope='module')
-def data_update(database):
+def data_update(database, tmp_path_factory):
     """
     Setup of the data sorter class
     :param database:
+    :param tmp_path_factory:
     :return:
     """
 
-    data_update = DataUpdater(database)
+    cache_path = str(tmp_path_factory.mktemp('cache') / 'omdb_cache.sqlite')
+    data_update = DataUpdater(database, cache_path=cache_path)
 
     yield data_update
 
@@ -134,3 +139,36 @@ def test_write_csv(data_sorter, data_filter, csv_writer, data_update):
         updated_data = data_update.handle(parameter=True)
         csv_writer.write_csv(keyword=data_update.get_keyword(), data=updated_data)
     print(exec_info.value)
+
+
+def test_write_csv_stream(data_sorter, tmp_path):
+    """
+    Saving rows of an iterator to the given compressed file
+    :param data_sorter:
+    :param tmp_path:
+    :return:
+    """
+
+    path = str(tmp_path / 'sorted.csv.gz')
+    csv_writer = CSVWriter(path=path)
+
+    csv_writer.write_csv(keyword=data_sorter.get_keyword(),
+                         data=data_sorter.stream(parameter='year'))
+
+    with gzip.open(path, 'rt', newline='') as csv_r:
+        rows = list(csv.reader(csv_r))
+
+    assert csv_writer.title == path
+    assert csv_writer.rows_written == len(rows) - 1
+    assert csv_writer.bytes_written == os.path.getsize(path)
+    assert rows[0] == ['TITLE', 'YEAR']
+
+    # Rows given as dicts
+    path = str(tmp_path / 'inserted.csv')
+    csv_writer = CSVWriter(path=path)
+    csv_writer.write_csv(keyword='insert',
+                         data=[{'Title': 'Memento', 'Status': 'Inserted'}])
+
+    with open(path, newline='') as csv_r:
+        assert list(csv.reader(csv_r)) == [['Title', 'Status'],
+                                           ['Memento', 'Inserted']]
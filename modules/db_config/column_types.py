@@ -0,0 +1,250 @@
+import re
+
+from modules.field_normalizer.field_normalizer import FieldNormalizer
+
+
+class ColumnTypes:
+    """ Numeric columns of the movies table declared and stored as numbers,
+    so sorting and maxima compare numbers and use the indexes """
+
+    def __init__(self, db):
+        self.db = db  # DB to manage
+
+        # Column and its declared type
+        self.columns = (('YEAR', 'integer'), ('RUNTIME', 'integer'),
+                        ('IMDb_Rating', 'float'), ('IMDb_votes', 'integer'),
+                        ('BOX_OFFICE', 'integer'))
+
+        # Version of the conversion recorded in the meta table
+        self.meta_key = 'column_types'
+        self.version = 1
+
+    @property
+    def typed_table(self):
+        return f'{self.db.movies_table}_TYPED'
+
+    @property
+    def meta_table(self):
+        return f'{self.db.movies_table}_META'
+
+    @staticmethod
+    def is_numeric(declared_type):
+        """
+        Checking if the declared type has numeric affinity, see
+        https://www.sqlite.org/datatype3.html#determination_of_column_affinity
+        :param declared_type:
+        :return:
+        """
+
+        declared_type = declared_type.upper()
+
+        if 'INT' in declared_type:
+            return True
+        if any(text in declared_type for text in ('CHAR', 'CLOB', 'TEXT')):
+            return False
+        if not declared_type or 'BLOB' in declared_type:
+            return False
+
+        return True
+
+    @staticmethod
+    def function_name(column):
+        return f'normalize_{column.lower()}'
+
+    def declared_types(self):
+        """
+        Declared types of the columns of the movies table by upper name
+        :return:
+        """
+
+        table_info = self.db.conn.execute(
+            f'PRAGMA table_info({self.db.movies_table})').fetchall()
+        return {row['name'].upper(): (row['name'], row['type'])
+                for row in table_info}
+
+    def converted(self):
+        """
+        Checking if the columns were converted already
+        :return:
+        """
+
+        if not self.db.index_manager.table_exists(self.meta_table):
+            return False
+
+        row = self.db.conn.execute(
+            f'SELECT value FROM {self.meta_table} WHERE key = ?',
+            (self.meta_key,)).fetchone()
+        return row is not None and row['value'] >= self.version
+
+    @property
+    def sql_create_meta_statement(self):
+        """
+        Statement to execute - table of the versions of the conversions
+        :return:
+        """
+        sql_statement = f"""CREATE TABLE IF NOT EXISTS {self.meta_table} (
+                            KEY text PRIMARY KEY,
+                            VALUE integer)"""
+        return sql_statement
+
+    def mark_converted(self):
+        """
+        Recording the version of the conversion, part of its transaction
+        :return:
+        """
+
+        self.db.conn.execute(self.sql_create_meta_statement)
+        self.db.conn.execute(f"""INSERT OR REPLACE INTO
+                                 {self.meta_table}(key, value)
+                                 VALUES (?, ?)""",
+                             (self.meta_key, self.version))
+
+    def register_functions(self):
+        """
+        Parsers of the columns callable from statements
+        :return:
+        """
+
+        parsers = FieldNormalizer.column_parsers()
+        for column, _ in self.columns:
+            self.db.conn.create_function(self.function_name(column), 1,
+                                         parsers[column.upper()])
+
+    def text_columns(self, columns):
+        """
+        Columns with text values, text is greater than any number so the
+        maximum found in the index is enough
+        :param columns:
+        :return:
+        """
+
+        table = self.db.movies_table
+        text_columns = []
+
+        for column in columns:
+            row = self.db.conn.execute(
+                f'SELECT typeof(MAX("{column}")) AS type FROM {table}').fetchone()
+            if row['type'] == 'text':
+                text_columns.append(column)
+
+        return text_columns
+
+    def sql_create_typed_statement(self, mistyped):
+        """
+        Statement to execute - creating the movies table under a new name
+        with numeric types of the given columns, constraints are kept
+        :param mistyped:
+        :return: None if the schema can't be rewritten
+        """
+
+        row = self.db.conn.execute("""SELECT sql FROM sqlite_master
+                                      WHERE type = 'table' AND name = ?""",
+                                   (self.db.movies_table,)).fetchone()
+
+        sql_statement, replaced = re.subn(r'^(\s*CREATE\s+TABLE\s+)[^\s(]+',
+                                          rf'\g<1>{self.typed_table}',
+                                          row['sql'], flags=re.IGNORECASE)
+        if not replaced:
+            return None
+
+        for column, declared_type in mistyped:
+            sql_statement, replaced = re.subn(
+                rf'(?<![\w])([\["`]?{column}[\]"`]?\s+)[A-Za-z]+',
+                rf'\g<1>{declared_type}', sql_statement, count=1,
+                flags=re.IGNORECASE)
+            if not replaced:
+                return None
+
+        return sql_statement
+
+    def rebuild(self, mistyped):
+        """
+        Copying rows to the table with numeric columns, indexes and
+        triggers are created again, stats table is rebuilt on demand
+        :param mistyped: columns and their new types
+        :return: True if the table was rebuilt
+        """
+
+        table = self.db.movies_table
+        create_statement = self.sql_create_typed_statement(mistyped)
+        if create_statement is None:
+            return False
+
+        names = [name for name, _ in self.declared_types().values()]
+        typed = {column.upper() for column, _ in self.columns}
+        select_list = ', '.join(
+            f'{self.function_name(name)}("{name}")' if name.upper() in typed
+            else f'"{name}"' for name in names)
+        column_list = ', '.join(f'"{name}"' for name in names)
+
+        # Stats of the old values are dropped with their triggers
+        stats = self.db.stats_table.stats_table
+        schema = self.db.conn.execute(
+            """SELECT sql FROM sqlite_master
+               WHERE tbl_name = ? AND type IN ('index', 'trigger')
+               AND sql IS NOT NULL AND name NOT LIKE ? ESCAPE '\\'""",
+            (table, f'{stats}\\_%')).fetchall()
+
+        with self.db.transaction() as conn:
+            # Statements of the schema don't open the transaction themselves
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+
+            conn.execute(create_statement)
+            conn.execute(f"""INSERT INTO {self.typed_table}({column_list})
+                             SELECT {select_list} FROM {table}""")
+            conn.execute(f'DROP TABLE {table}')
+            conn.execute(f'ALTER TABLE {self.typed_table} RENAME TO {table}')
+            for row in schema:
+                conn.execute(row['sql'])
+            conn.execute(f'DROP TABLE IF EXISTS {stats}')
+            conn.execute(
+                f'DROP TABLE IF EXISTS {self.db.stats_table.leaders_table}')
+            self.mark_converted()
+
+        return True
+
+    def ensure(self):
+        """
+        Converting numeric columns declared or stored as text once, the
+        conversion is recorded in the meta table
+        :return: names of converted columns
+        """
+
+        if self.converted() or not self.db.index_manager.table_exists():
+            return []
+
+        declared_types = self.declared_types()
+        columns = [(declared_types[column.upper()][0], declared_type)
+                   for column, declared_type in self.columns
+                   if column.upper() in declared_types]
+        if not columns:
+            return []
+
+        self.register_functions()
+
+        mistyped = [(column, declared_type) for column, declared_type in columns
+                    if not self.is_numeric(declared_types[column.upper()][1])]
+        if mistyped:
+            if self.rebuild(mistyped):
+                return [column for column, _ in columns]
+
+            # Numbers parsed into a text column would be stored as text again
+            return []
+
+        # Types are right, values left by older versions are parsed in place
+        text_columns = self.text_columns(column for column, _ in columns)
+        with self.db.transaction() as conn:
+            if text_columns:
+                assignments = ', '.join(
+                    f'"{column}" = {self.function_name(column)}("{column}")'
+                    for column in text_columns)
+                conditions = ' OR '.join(f"typeof(\"{column}\") = 'text'"
+                                         for column in text_columns)
+
+                conn.execute(f"""UPDATE {self.db.movies_table}
+                                 SET {assignments}
+                                 WHERE {conditions}""")
+            self.mark_converted()
+
+        return text_columns
@@ -1,29 +1,171 @@
 import sqlite3
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from modules.db_config.column_types import ColumnTypes
+from modules.db_config.fts_index import FTSIndex
+from modules.db_config.index_manager import IndexManager
+from modules.db_config.relations import Relations
+from modules.db_config.statements import Statements
+from modules.db_config.stats_table import StatsTable
 
 
 class DBConfig:
     """ SQL Database management """
 
-    def __init__(self, db_name):
+    # Pragmas of the connection for the kind of workload, applied in order
+    profiles = {
+        'default': (),
+        'safe': (('journal_mode', 'WAL'),
+                 ('synchronous', 'FULL'),
+                 ('busy_timeout', 5000)),
+        'read-heavy': (('journal_mode', 'WAL'),
+                       ('synchronous', 'NORMAL'),
+                       ('cache_size', -64000),  # KiB
+                       ('mmap_size', 268435456),
+                       ('temp_store', 'MEMORY'),
+                       ('busy_timeout', 5000)),
+        'bulk-load': (('journal_mode', 'WAL'),
+                      ('synchronous', 'OFF'),
+                      ('cache_size', -256000),  # KiB
+                      ('mmap_size', 268435456),
+                      ('temp_store', 'MEMORY'),
+                      ('busy_timeout', 5000))}
+
+    def __init__(self, db_name, ensure_indexes=False, arraysize=1000,
+                 profile='default', read_only=False, statement_cache_size=256):
 
         # DB Config stuff
-        self.conn = sqlite3.connect(db_name)
+        self.db_name = db_name
+        self.read_only = read_only
+        if read_only:
+            # Connection may be handed over between threads of a pool
+            self.conn = sqlite3.connect(f'file:{quote(db_name)}?mode=ro',
+                                        uri=True, check_same_thread=False,
+                                        cached_statements=statement_cache_size)
+        else:
+            self.conn = sqlite3.connect(db_name,
+                                        cached_statements=statement_cache_size)
         self.conn.row_factory = sqlite3.Row  # Accessible object instead of plain tuple
         self.c = self.conn.cursor()
+        self.arraysize = arraysize  # Rows fetched at once by iterating queries
+
+        # Nesting of transactions, only the outermost one commits
+        self.transaction_depth = 0
+
+        # Tuning of the connection
+        self.profile = profile or 'default'
+        self.apply_profile(self.profile)
 
         # DB Tables
         self.movies_table = 'MOVIES'
 
-    def execute_statement(self, sql_statement):
+        # Statements with validated identifiers and bound values
+        self.statements = Statements(self)
+
+        # Indexes of the movies table
+        self.index_manager = IndexManager(self)
+
+        # Full-text search index, created on demand
+        self.fts_index = FTSIndex(self)
+
+        # Statistics of numeric columns, created on demand
+        self.stats_table = StatsTable(self)
+
+        # Junction tables of genres, people, countries and languages,
+        # created on demand
+        self.relations = Relations(self)
+
+        # Numeric columns declared and stored as numbers
+        self.column_types = ColumnTypes(self)
+
+        if ensure_indexes:
+            self.ensure_indexes()
+
+    def apply_profile(self, profile):
+        """
+        Setting pragmas of the connection profile
+        :param profile:
+        :return:
+        """
+
+        try:
+            pragmas = self.profiles[profile]
+        except KeyError:
+            raise ValueError(f'Unknown connection profile: {profile}')
+
+        for pragma, value in pragmas:
+            # Journal mode is a setting of the file, it can't be changed
+            if self.read_only and pragma == 'journal_mode':
+                continue
+
+            self.conn.execute(f'PRAGMA {pragma} = {value}')
+
+        self.profile = profile
+
+    def pragma_values(self):
+        """
+        Current values of the pragmas set by profiles
+        :return:
+        """
+
+        pragmas = {pragma for settings in self.profiles.values()
+                   for pragma, _ in settings}
+
+        return {pragma: self.conn.execute(f'PRAGMA {pragma}').fetchone()[0]
+                for pragma in sorted(pragmas)}
+
+    @contextmanager
+    def transaction(self):
+        """
+        Transaction committed on leaving the outermost block and rolled back
+        on error, inner blocks join the outer transaction
+        :return:
+        """
+
+        self.transaction_depth += 1
+        try:
+            yield self.conn
+        except BaseException:
+            self.transaction_depth -= 1
+            if not self.transaction_depth:
+                self.conn.rollback()
+            raise
+
+        self.transaction_depth -= 1
+        if not self.transaction_depth:
+            self.conn.commit()
+
+    def commit(self):
+        """
+        Committing unless an outer transaction is open
+        :return:
+        """
+
+        if not self.transaction_depth:
+            self.conn.commit()
+
+    def rollback(self):
+        """
+        Rolling back unless an outer transaction is open, it's rolled back
+        by the error leaving its block
+        :return:
+        """
+
+        if not self.transaction_depth:
+            self.conn.rollback()
+
+    def execute_statement(self, sql_statement, parameters=()):
         """
         Execute the given statement
         :param sql_statement:
+        :param parameters:
         :return:
         """
 
         # Statement execution
         try:
-            self.c.execute(sql_statement)
+            self.c.execute(sql_statement, parameters)
         except sqlite3.OperationalError as e:
             # Not existing column
             raise e
@@ -32,13 +174,83 @@ class DBConfig:
 
         return results
 
+    def iterate_statement(self, sql_statement, parameters=(), arraysize=None):
+        """
+        Execute the given statement, rows are fetched lazily in chunks
+        :param sql_statement:
+        :param parameters:
+        :param arraysize: rows fetched at once, default of the db if None
+        :return: iterator of rows
+        """
+
+        # Own cursor, other statements can run while iterating
+        cursor = self.conn.cursor()
+        cursor.arraysize = arraysize or self.arraysize
+
+        # Statement is executed now so errors aren't postponed
+        try:
+            cursor.execute(sql_statement, parameters)
+        except sqlite3.OperationalError as e:
+            # Not existing column
+            cursor.close()
+            raise e
+
+        return self.fetch_chunks(cursor)
+
     @staticmethod
-    def value_updater(table):
+    def fetch_chunks(cursor):
         """
-        Create converter for a given table
-        :param table:
+        Rows of the executed cursor fetched by fetchmany
+        :param cursor:
         :return:
         """
-        return lambda column, value_to_change, new_value: f"""
-                            UPDATE {table} SET {column} = {new_value} 
-                            WHERE {column} = {value_to_change};"""
+
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+
+                yield from rows
+        finally:
+            cursor.close()
+
+    def ensure_indexes(self):
+        """
+        Creating missing indexes of the movies table
+        :return: names of created indexes
+        """
+
+        try:
+            return self.index_manager.ensure()
+        except sqlite3.OperationalError as e:
+            # E.g. read-only database
+            raise e
+
+    def ensure_types(self):
+        """
+        Converting numeric columns of the movies table stored as text
+        :return: names of converted columns
+        """
+        return self.column_types.ensure()
+
+    def ensure_fts(self):
+        """
+        Creating full-text search index of the movies table
+        :return: True if the index was created
+        """
+        return self.fts_index.ensure()
+
+    def ensure_stats(self):
+        """
+        Creating statistics table of the movies table
+        :return: True if the table was created
+        """
+        return self.stats_table.ensure()
+
+    def ensure_relations(self):
+        """
+        Creating junction tables of the comma separated columns
+        :return: True if the tables were created
+        """
+        return self.relations.ensure()
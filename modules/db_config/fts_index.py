@@ -0,0 +1,110 @@
+import sqlite3
+
+
+class FTSIndex:
+    """ FTS5 shadow index of the text columns of the movies table """
+
+    def __init__(self, db):
+        self.db = db  # DB to manage
+
+        self.columns = ('TITLE', 'GENRE', 'DIRECTOR', 'CAST', 'WRITER',
+                        'LANGUAGE', 'COUNTRY', 'AWARDS')
+
+    @property
+    def fts_table(self):
+        return f'{self.db.movies_table}_FTS'
+
+    def column_list(self, prefix=''):
+        """
+        Quoted columns, e.g. CAST is a keyword
+        :param prefix:
+        :return:
+        """
+        return ', '.join(f'{prefix}"{column}"' for column in self.columns)
+
+    @property
+    def sql_create_statements(self):
+        """
+        Statements to execute - external content FTS table and triggers
+        keeping it in sync with the movies table
+        :return:
+        """
+
+        table = self.db.movies_table
+        fts = self.fts_table
+
+        insert_new = f"""INSERT INTO {fts}(rowid, {self.column_list()})
+                         VALUES (new.ID, {self.column_list('new.')});"""
+        delete_old = f"""INSERT INTO {fts}({fts}, rowid, {self.column_list()})
+                         VALUES ('delete', old.ID, {self.column_list('old.')});"""
+
+        sql_statements = (f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+                              USING fts5({self.column_list()},
+                              content='{table}', content_rowid='ID')""",
+                          f"""CREATE TRIGGER IF NOT EXISTS {fts}_AI
+                              AFTER INSERT ON {table} BEGIN
+                              {insert_new}
+                              END""",
+                          f"""CREATE TRIGGER IF NOT EXISTS {fts}_AD
+                              AFTER DELETE ON {table} BEGIN
+                              {delete_old}
+                              END""",
+                          f"""CREATE TRIGGER IF NOT EXISTS {fts}_AU
+                              AFTER UPDATE ON {table} BEGIN
+                              {delete_old}
+                              {insert_new}
+                              END""")
+        return sql_statements
+
+    def exists(self):
+        """
+        Checking if the FTS table exists
+        :return:
+        """
+
+        row = self.db.conn.execute("""SELECT 1 FROM sqlite_master
+                                      WHERE type = 'table' AND name = ?""",
+                                   (self.fts_table,)).fetchone()
+        return row is not None
+
+    def ensure(self):
+        """
+        Creating the FTS table and triggers, new table is filled with
+        the current content of the movies table
+        :return: True if the index was created
+        """
+
+        if self.exists():
+            return False
+
+        try:
+            with self.db.conn:
+                for sql_statement in self.sql_create_statements:
+                    self.db.conn.execute(sql_statement)
+
+                self.rebuild()
+        except sqlite3.OperationalError as e:
+            # E.g. SQLite compiled without FTS5
+            raise e
+
+        return True
+
+    def rebuild(self):
+        """
+        Rebuilding the whole index from the movies table
+        :return:
+        """
+        self.db.conn.execute(
+            f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+
+    @staticmethod
+    def match_query(column, value):
+        """
+        FTS5 query of the phrase in the column, last word is a prefix
+        :param column:
+        :param value:
+        :return:
+        """
+
+        phrase = str(value).replace('"', '""')
+        return f'"{column.upper()}" : "{phrase}" *'
@@ -0,0 +1,148 @@
+import re
+import sqlite3
+
+
+class IndexManager:
+    """ Creating and maintaining indexes of the movies table """
+
+    def __init__(self, db):
+        self.db = db  # DB to manage
+
+        # Index name suffix, column and condition of partial index
+        self.indexes = (('TITLE', 'TITLE', None),
+                        ('EMPTY_TITLES', 'ID', 'DIRECTOR IS NULL'),
+                        ('YEAR', 'YEAR', None),
+                        ('RUNTIME', 'RUNTIME', None),
+                        ('IMDB_RATING', 'IMDb_Rating', None),
+                        ('IMDB_VOTES', 'IMDb_votes', None),
+                        ('BOX_OFFICE', 'BOX_OFFICE', None))
+
+    def index_name(self, suffix):
+        return f'{self.db.movies_table}_{suffix}'
+
+    def sql_create_index_statement(self, suffix, column, where):
+        """
+        Statement to execute - creating single index
+        :param suffix:
+        :param column:
+        :param where:
+        :return:
+        """
+        sql_statement = f"""CREATE INDEX IF NOT EXISTS {self.index_name(suffix)}
+                            ON {self.db.movies_table}({column})"""
+        if where:
+            sql_statement += f' WHERE {where}'
+        return sql_statement
+
+    def table_exists(self, table=None):
+        """
+        Checking if the table exists
+        :param table: the movies table if None
+        :return:
+        """
+
+        row = self.db.conn.execute("""SELECT 1 FROM sqlite_master
+                                      WHERE type = 'table' AND name = ?""",
+                                   (table or self.db.movies_table,)).fetchone()
+        return row is not None
+
+    def table_columns(self):
+        """
+        Columns of the movies table
+        :return:
+        """
+
+        table_info = self.db.conn.execute(
+            f'PRAGMA table_info({self.db.movies_table})').fetchall()
+        return {row['name'].upper() for row in table_info}
+
+    def indexed_columns(self):
+        """
+        Leading columns of the existing full (not partial) indexes
+        :return:
+        """
+
+        columns = set()
+        index_list = self.db.conn.execute(
+            f'PRAGMA index_list({self.db.movies_table})').fetchall()
+
+        for index in index_list:
+            if index['partial']:
+                continue
+
+            info = self.db.conn.execute(
+                f'PRAGMA index_info({index["name"]})').fetchall()
+            if info:
+                columns.add(info[0]['name'].upper())
+
+        return columns
+
+    def ensure(self):
+        """
+        Creating missing indexes and refreshing statistics of the planner
+        :return: names of created indexes
+        """
+
+        if not self.table_exists():
+            return []
+
+        index_names = self.index_names()
+        indexed_columns = self.indexed_columns()
+        table_columns = self.table_columns()
+        created = []
+
+        with self.db.conn:
+            for suffix, column, where in self.indexes:
+                name = self.index_name(suffix)
+                if name in index_names:
+                    continue
+
+                # Column missing in the schema of this database
+                if column.upper() not in table_columns:
+                    continue
+
+                # E.g. UNIQUE(TITLE) already indexes the title
+                if where is None and column.upper() in indexed_columns:
+                    continue
+
+                self.db.conn.execute(
+                    self.sql_create_index_statement(suffix, column, where))
+                created.append(name)
+
+        self.db.conn.execute('PRAGMA optimize')
+
+        return created
+
+    def index_names(self):
+        """
+        Names of every index of the movies table
+        :return:
+        """
+
+        index_list = self.db.conn.execute(
+            f'PRAGMA index_list({self.db.movies_table})').fetchall()
+        return {index['name'] for index in index_list}
+
+    def explain(self, sql_statement, parameters=()):
+        """
+        Index used by the statement according to EXPLAIN QUERY PLAN
+        :param sql_statement:
+        :param parameters:
+        :return: tuple of index name or None and the plan
+        """
+
+        try:
+            plan = self.db.conn.execute('EXPLAIN QUERY PLAN ' + sql_statement,
+                                        parameters).fetchall()
+        except sqlite3.OperationalError as e:
+            raise e
+
+        details = '; '.join(row['detail'] for row in plan)
+
+        match = re.search(r'USING (?:COVERING )?INDEX (\w+)', details)
+        if match:
+            return match.group(1), details
+        if 'INTEGER PRIMARY KEY' in details:
+            return 'PRIMARY KEY', details
+
+        return None, details
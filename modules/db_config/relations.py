@@ -0,0 +1,193 @@
+import sqlite3
+
+
+class Relations:
+    """ Junction tables of the comma separated columns of the movies table,
+    maintained by triggers on every write """
+
+    def __init__(self, db):
+        self.db = db  # DB to manage
+
+        # Column of the movies table, its junction table and role of a person
+        self.columns = (('GENRE', 'MOVIE_GENRE', None),
+                        ('DIRECTOR', 'MOVIE_PERSON', 'director'),
+                        ('WRITER', 'MOVIE_PERSON', 'writer'),
+                        ('CAST', 'MOVIE_PERSON', 'actor'),
+                        ('COUNTRY', 'MOVIE_COUNTRY', None),
+                        ('LANGUAGE', 'MOVIE_LANGUAGE', None))
+
+    @property
+    def trigger_prefix(self):
+        return f'{self.db.movies_table}_RELATIONS'
+
+    @property
+    def tables(self):
+        """
+        Junction tables in order, each one once
+        :return:
+        """
+        return tuple(dict.fromkeys(table for _, table, _ in self.columns))
+
+    def relation(self, column):
+        """
+        Junction table and role of the column or None
+        :param column:
+        :return:
+        """
+
+        for relation_column, table, role in self.columns:
+            if relation_column == str(column).upper():
+                return table, role
+
+        return None
+
+    @staticmethod
+    def split(column):
+        """
+        Table-valued function of the items of comma separated text, the
+        text is quoted as a json string, so commas outside of escapes
+        split it into a valid list
+        :param column: e.g. new."GENRE"
+        :return:
+        """
+        return f"""json_each('[' || replace(json_quote(CAST({column} AS text)),
+                   ',', '","') || ']')"""
+
+    def sql_insert_statement(self, prefix, columns, source=''):
+        """
+        Statements of every junction table - items of the row
+        :param prefix: 'new.' in trigger or the movies table
+        :param columns: existing columns of the relations
+        :param source: tables joined with the items, e.g. 'MOVIES, '
+        :return:
+        """
+
+        sql_statements = []
+        for table in self.tables:
+            selects = []
+            for column, relation_table, role in self.columns:
+                if relation_table != table or column not in columns:
+                    continue
+
+                role_value = f", '{role}'" if role else ''
+                selects.append(
+                    f"""SELECT {prefix}ID, trim(value){role_value}
+                        FROM {source}{self.split(f'{prefix}"{column}"')}
+                        WHERE trim(value) NOT IN ('', 'N/A')""")
+
+            if selects:
+                role_column = ', role' if table == 'MOVIE_PERSON' else ''
+                sql_statements.append(
+                    f"""INSERT OR IGNORE INTO {table}(movie_id, name{role_column})
+                        {' UNION ALL '.join(selects)};""")
+
+        return sql_statements
+
+    def sql_delete_statement(self, prefix):
+        """
+        Statements of every junction table - items of the row
+        :param prefix: 'old.' in trigger
+        :return:
+        """
+        return [f'DELETE FROM {table} WHERE movie_id = {prefix}ID;'
+                for table in self.tables]
+
+    def sql_create_table_statements(self, table):
+        """
+        Statements to execute - junction table looked up by the item and
+        index of its movies
+        :param table:
+        :return:
+        """
+
+        role_column = 'ROLE text, ' if table == 'MOVIE_PERSON' else ''
+        role_key = 'ROLE, ' if table == 'MOVIE_PERSON' else ''
+
+        sql_statements = (f"""CREATE TABLE {table} (
+                              NAME text COLLATE NOCASE,
+                              {role_column}
+                              MOVIE_ID integer,
+                              PRIMARY KEY (NAME, {role_key}MOVIE_ID))
+                              WITHOUT ROWID""",
+                          f"""CREATE INDEX {table}_MOVIE_ID
+                              ON {table}(MOVIE_ID)""")
+        return sql_statements
+
+    def sql_create_statements(self, columns):
+        """
+        Statements to execute - junction tables filled from the movies
+        table and triggers maintaining them
+        :param columns: existing columns of the relations
+        :return:
+        """
+
+        table = self.db.movies_table
+        prefix = self.trigger_prefix
+        quoted = ', '.join(f'"{column}"' for column in columns)
+
+        inserts = ''.join(self.sql_insert_statement('new.', columns))
+        deletes = ''.join(self.sql_delete_statement('old.'))
+
+        sql_statements = []
+        for relation_table in self.tables:
+            sql_statements.extend(
+                self.sql_create_table_statements(relation_table))
+
+        sql_statements.extend(
+            statement.rstrip(';') for statement in
+            self.sql_insert_statement(f'{table}.', columns, f'{table}, '))
+        sql_statements.extend(
+            (f"""CREATE TRIGGER {prefix}_AI
+                 AFTER INSERT ON {table} BEGIN {inserts} END""",
+             f"""CREATE TRIGGER {prefix}_AD
+                 AFTER DELETE ON {table} BEGIN {deletes} END""",
+             f"""CREATE TRIGGER {prefix}_AU
+                 AFTER UPDATE OF {quoted} ON {table} BEGIN
+                 {deletes}
+                 {inserts}
+                 END"""))
+        return sql_statements
+
+    def exists(self):
+        """
+        Checking if the junction tables exist
+        :return:
+        """
+
+        row = self.db.conn.execute("""SELECT 1 FROM sqlite_master
+                                      WHERE type = 'trigger' AND name = ?""",
+                                   (f'{self.trigger_prefix}_AU',)).fetchone()
+        return row is not None
+
+    def existing_columns(self):
+        """
+        Columns of the relations which exist in the movies table
+        :return:
+        """
+
+        existing = self.db.index_manager.table_columns()
+
+        return tuple(column for column, _, _ in self.columns
+                     if column in existing)
+
+    def ensure(self):
+        """
+        Creating the junction tables with their triggers, new tables are
+        filled with the current content of the movies table
+        :return: True if the tables were created
+        """
+
+        columns = self.existing_columns()
+
+        if not columns or self.exists():
+            return False
+
+        try:
+            with self.db.conn:
+                for sql_statement in self.sql_create_statements(columns):
+                    self.db.conn.execute(sql_statement)
+        except sqlite3.OperationalError as e:
+            # E.g. read-only database
+            raise e
+
+        return True
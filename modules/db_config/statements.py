@@ -0,0 +1,67 @@
+import sqlite3
+
+
+class Statements:
+    """ Registry of SQL statements - identifiers are validated columns of
+    the movies table, values are always bound parameters, so the text of a
+    statement repeats and sqlite3 reuses its prepared statement """
+
+    def __init__(self, db):
+        self.db = db  # DB to query
+
+        self.registry = {}  # Statements by template and identifiers
+        self.table_columns = None  # Columns by upper name, read lazily
+
+    def columns(self, refresh=False):
+        """
+        Columns of the movies table by their upper name
+        :param refresh: reading the schema again
+        :return:
+        """
+
+        if self.table_columns is None or refresh:
+            table_info = self.db.conn.execute(
+                f'PRAGMA table_info({self.db.movies_table})').fetchall()
+            self.table_columns = {row['name'].upper(): row['name']
+                                  for row in table_info}
+
+        return self.table_columns
+
+    def column(self, name):
+        """
+        Column of the movies table spelled as in the schema
+        :param name:
+        :return:
+        """
+
+        key = str(name).upper()
+
+        # Schema could have changed since it was read
+        column = self.columns().get(key) or self.columns(refresh=True).get(key)
+        if column is None:
+            raise sqlite3.OperationalError(f'no such column: {name}')
+
+        return column
+
+    def sql(self, template, **columns):
+        """
+        Statement of the template with the table and validated columns
+        :param template: e.g. 'SELECT title FROM {table} ORDER BY {column}'
+        :param columns: names of the placeholders and user given columns
+        :return:
+        """
+
+        key = (template, tuple(sorted(columns.items())))
+
+        try:
+            return self.registry[key]
+        except KeyError:
+            pass
+
+        identifiers = {placeholder: f'"{self.column(name)}"'
+                       for placeholder, name in columns.items()}
+        sql_statement = template.format(table=self.db.movies_table,
+                                        **identifiers)
+
+        self.registry[key] = sql_statement
+        return sql_statement
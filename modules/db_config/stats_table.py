@@ -0,0 +1,269 @@
+import sqlite3
+
+
+class StatsTable:
+    """ Statistics and top values of numeric columns of the movies table,
+    maintained incrementally by triggers on every write """
+
+    def __init__(self, db):
+        self.db = db  # DB to manage
+
+        self.columns = ('YEAR', 'RUNTIME', 'IMDb_Rating', 'IMDb_votes',
+                        'BOX_OFFICE')
+        self.leaders = 10  # Best distinct values kept of every column
+
+    @property
+    def stats_table(self):
+        return f'{self.db.movies_table}_STATS'
+
+    @property
+    def leaders_table(self):
+        return f'{self.db.movies_table}_STATS_LEADERS'
+
+    def canonical_column(self, column):
+        """
+        Column of the stats spelled as in the table or None
+        :param column:
+        :return:
+        """
+
+        for stats_column in self.columns:
+            if stats_column.upper() == str(column).upper():
+                return stats_column
+
+        return None
+
+    def sql_insert_statement(self, column):
+        """
+        Statement of trigger - counting inserted value
+        :param column:
+        :return:
+        """
+        sql_statement = f"""UPDATE {self.stats_table} SET
+                            cnt = cnt + (new.{column} IS NOT NULL),
+                            sum_val = sum_val
+                            + COALESCE(CAST(new.{column} AS REAL), 0),
+                            max_val = CASE WHEN new.{column} IS NOT NULL AND
+                            (max_val IS NULL OR new.{column} > max_val)
+                            THEN new.{column} ELSE max_val END,
+                            min_val = CASE WHEN new.{column} IS NOT NULL AND
+                            (min_val IS NULL OR new.{column} < min_val)
+                            THEN new.{column} ELSE min_val END
+                            WHERE col_name = '{column}';"""
+        return sql_statement
+
+    def sql_delete_statement(self, column):
+        """
+        Statement of trigger - removing deleted value, extremes are looked
+        up in the index only when the deleted value was one of them
+        :param column:
+        :return:
+        """
+        table = self.db.movies_table
+        sql_statement = f"""UPDATE {self.stats_table} SET
+                            cnt = cnt - (old.{column} IS NOT NULL),
+                            sum_val = sum_val
+                            - COALESCE(CAST(old.{column} AS REAL), 0),
+                            max_val = CASE WHEN old.{column} >= max_val
+                            THEN (SELECT MAX({column}) FROM {table})
+                            ELSE max_val END,
+                            min_val = CASE WHEN old.{column} <= min_val
+                            THEN (SELECT MIN({column}) FROM {table})
+                            ELSE min_val END
+                            WHERE col_name = '{column}';"""
+        return sql_statement
+
+    def sql_update_statement(self, column):
+        """
+        Statement of trigger - replacing updated value
+        :param column:
+        :return:
+        """
+        table = self.db.movies_table
+        sql_statement = f"""UPDATE {self.stats_table} SET
+                            cnt = cnt - (old.{column} IS NOT NULL)
+                            + (new.{column} IS NOT NULL),
+                            sum_val = sum_val
+                            - COALESCE(CAST(old.{column} AS REAL), 0)
+                            + COALESCE(CAST(new.{column} AS REAL), 0),
+                            max_val = CASE WHEN old.{column} >= max_val
+                            THEN (SELECT MAX({column}) FROM {table})
+                            WHEN new.{column} IS NOT NULL AND
+                            (max_val IS NULL OR new.{column} > max_val)
+                            THEN new.{column} ELSE max_val END,
+                            min_val = CASE WHEN old.{column} <= min_val
+                            THEN (SELECT MIN({column}) FROM {table})
+                            WHEN new.{column} IS NOT NULL AND
+                            (min_val IS NULL OR new.{column} < min_val)
+                            THEN new.{column} ELSE min_val END
+                            WHERE col_name = '{column}'
+                            AND old.{column} IS NOT new.{column};"""
+        return sql_statement
+
+    def sql_leaders_insert_statement(self, column, condition='1'):
+        """
+        Statement of trigger - new value added to the leaders when it's one
+        of the best, the worst one is dropped when there are too many
+        :param column:
+        :param condition: e.g. the value was changed by the update
+        :return:
+        """
+        leaders = self.leaders_table
+        of_column = f"FROM {leaders} WHERE col_name = '{column}'"
+        sql_statement = f"""INSERT OR IGNORE INTO {leaders}(col_name, value)
+                            SELECT '{column}', new.{column}
+                            WHERE new.{column} IS NOT NULL AND {condition}
+                            AND ((SELECT COUNT(*) {of_column}) < {self.leaders}
+                            OR new.{column} > (SELECT MIN(value) {of_column}));
+                            DELETE {of_column} AND value < (
+                                SELECT MIN(value) FROM (
+                                    SELECT value {of_column}
+                                    ORDER BY value DESC LIMIT {self.leaders}));"""
+        return sql_statement
+
+    def sql_leaders_delete_statement(self, column, condition='1'):
+        """
+        Statement of trigger - leaders are read again from the index of the
+        column when the removed value was one of them
+        :param column:
+        :param condition: e.g. the value was changed by the update
+        :return:
+        """
+        table = self.db.movies_table
+        leaders = self.leaders_table
+        of_column = f"FROM {leaders} WHERE col_name = '{column}'"
+        sql_statement = f"""DELETE {of_column} AND {condition}
+                            AND old.{column} >= (SELECT MIN(value) {of_column});
+                            INSERT OR IGNORE INTO {leaders}(col_name, value)
+                            SELECT '{column}', value FROM (
+                                SELECT DISTINCT {column} AS value FROM {table}
+                                WHERE {column} IS NOT NULL
+                                ORDER BY {column} DESC LIMIT {self.leaders})
+                            WHERE NOT EXISTS (SELECT 1 {of_column});"""
+        return sql_statement
+
+    @property
+    def sql_fill_statement(self):
+        """
+        Statement to execute - statistics computed from the movies table
+        :return:
+        """
+        sql_statement = ' UNION ALL '.join(
+            f"""SELECT '{column}' AS col_name, MAX({column}) AS max_val,
+                MIN({column}) AS min_val,
+                TOTAL(CAST({column} AS REAL)) AS sum_val,
+                COUNT({column}) AS cnt FROM {self.db.movies_table}"""
+            for column in self.columns)
+        return sql_statement
+
+    @property
+    def sql_create_statements(self):
+        """
+        Statements to execute - stats table filled from the movies table
+        and triggers maintaining it
+        :return:
+        """
+
+        table = self.db.movies_table
+        stats = self.stats_table
+        leaders = self.leaders_table
+
+        inserts = ''.join(self.sql_insert_statement(column) +
+                          self.sql_leaders_insert_statement(column)
+                          for column in self.columns)
+        deletes = ''.join(self.sql_delete_statement(column) +
+                          self.sql_leaders_delete_statement(column)
+                          for column in self.columns)
+
+        # Leaders are read again before the new value is added
+        updates = ''.join(
+            self.sql_update_statement(column) +
+            self.sql_leaders_delete_statement(
+                column, f'old.{column} IS NOT new.{column}') +
+            self.sql_leaders_insert_statement(
+                column, f'old.{column} IS NOT new.{column}')
+            for column in self.columns)
+
+        fill_leaders = ' UNION ALL '.join(
+            f"""SELECT * FROM (SELECT DISTINCT '{column}', {column}
+                FROM {table} WHERE {column} IS NOT NULL
+                ORDER BY {column} DESC LIMIT {self.leaders})"""
+            for column in self.columns)
+
+        sql_statements = (f"""CREATE TABLE {stats} (
+                              COL_NAME text PRIMARY KEY,
+                              MAX_VAL,
+                              MIN_VAL,
+                              SUM_VAL float,
+                              CNT integer)""",
+                          f"""INSERT INTO {stats}
+                              (col_name, max_val, min_val, sum_val, cnt)
+                              {self.sql_fill_statement}""",
+                          f"""CREATE TABLE {leaders} (
+                              COL_NAME text,
+                              VALUE,
+                              PRIMARY KEY (COL_NAME, VALUE))
+                              WITHOUT ROWID""",
+                          f"""INSERT INTO {leaders}(col_name, value)
+                              {fill_leaders}""",
+                          f"""CREATE TRIGGER {stats}_AI
+                              AFTER INSERT ON {table} BEGIN {inserts} END""",
+                          f"""CREATE TRIGGER {stats}_AD
+                              AFTER DELETE ON {table} BEGIN {deletes} END""",
+                          f"""CREATE TRIGGER {stats}_AU
+                              AFTER UPDATE ON {table} BEGIN {updates} END""")
+        return sql_statements
+
+    def exists(self):
+        """
+        Checking if the stats table and the leaders exist
+        :return:
+        """
+
+        index_manager = self.db.index_manager
+        return index_manager.table_exists(self.stats_table) and \
+            index_manager.table_exists(self.leaders_table)
+
+    def existing_columns(self):
+        """
+        Columns of the stats which exist in the movies table
+        :return:
+        """
+
+        existing = self.db.index_manager.table_columns()
+
+        return tuple(column for column in self.columns
+                     if column.upper() in existing)
+
+    def ensure(self):
+        """
+        Creating the stats table and the leaders with their triggers and
+        indexes making recalculation of extremes cheap, stats of older
+        versions without the leaders are created again
+        :return: True if the table was created
+        """
+
+        # Only columns of the current schema are tracked
+        self.columns = self.existing_columns()
+
+        if not self.columns or self.exists():
+            return False
+
+        self.db.ensure_indexes()
+
+        try:
+            with self.db.conn:
+                for suffix in ('AI', 'AD', 'AU'):
+                    self.db.conn.execute(
+                        f'DROP TRIGGER IF EXISTS {self.stats_table}_{suffix}')
+                self.db.conn.execute(f'DROP TABLE IF EXISTS {self.stats_table}')
+                self.db.conn.execute(
+                    f'DROP TABLE IF EXISTS {self.leaders_table}')
+
+                for sql_statement in self.sql_create_statements:
+                    self.db.conn.execute(sql_statement)
+        except sqlite3.OperationalError as e:
+            # E.g. read-only database
+            raise e
+
+        return True
@@ -55,6 +55,183 @@ def test_execute_statement(database):
         results = database.execute_statement('fail_case')
     print(exec_info.value)
 
+
+def test_iterate_statement(database):
+    """
+    Testing lazily fetched rows
+    :param database:
+    :return:
+    """
+
+    rows = database.iterate_statement(
+        'SELECT title FROM MOVIES WHERE title LIKE :title ORDER BY title',
+        {'title': '%e%'}, arraysize=2)
+
+    assert next(rows)['Title'] == 'In Bruges'
+    assert [row['Title'] for row in rows] == ['Memento', 'The Godfather',
+                                              'The Shawshank Redemption']
+
+    # Fail case - error is raised before iterating
+    with pytest.raises(sqlite3.OperationalError):
+        database.iterate_statement('SELECT niema FROM MOVIES')
+
+
+def test_profile(tmp_path):
+    """
+    Testing pragmas set by the connection profile
+    :param tmp_path:
+    :return:
+    """
+
+    db = DBConfig(db_name=str(tmp_path / 'movies.sqlite'), profile='bulk-load')
+    pragmas = db.pragma_values()
+
+    assert pragmas['journal_mode'] == 'wal'
+    assert pragmas['synchronous'] == 0  # OFF
+    assert pragmas['cache_size'] == -256000
+    assert pragmas['temp_store'] == 2  # MEMORY
+
+    db.apply_profile('safe')
+    assert db.pragma_values()['synchronous'] == 2  # FULL
+    assert db.profile == 'safe'
+
+    # Fail case - profile which doesn't exist
+    with pytest.raises(ValueError):
+        db.apply_profile('fastest')
+
+
+def test_statements(database):
+    """
+    Testing statements with validated columns and bound values
+    :param database:
+    :return:
+    """
+
+    sql_statement = database.statements.sql(
+        'SELECT {table}.title FROM {table} ORDER BY {table}.{column}',
+        column='title')
+
+    # Column spelled as in the schema, same text of repeated statement
+    assert '"TITLE"' in sql_statement
+    assert database.statements.sql(
+        'SELECT {table}.title FROM {table} ORDER BY {table}.{column}',
+        column='title') is sql_statement
+
+    # Quotes are part of the value, not of the statement
+    with database.conn:
+        database.c.execute('INSERT INTO MOVIES(TITLE) VALUES (:title)',
+                           {'title': "Schindler's List"})
+        database.c.execute(database.statements.sql(
+            'UPDATE {table} SET {column} = NULL WHERE {column} = :title',
+            column='title'), {'title': "Schindler's List"})
+        assert database.c.rowcount == 1
+        database.c.execute('DELETE FROM MOVIES WHERE title IS NULL')
+
+    # Fail case - column which doesn't exist or is an expression
+    with pytest.raises(sqlite3.OperationalError):
+        database.statements.column('niema')
+    with pytest.raises(sqlite3.OperationalError):
+        database.statements.sql('SELECT {column} FROM {table}',
+                                column='title; DROP TABLE MOVIES')
+
+
+def test_ensure_types():
+    """
+    Testing numeric columns declared or stored as text
+    :return:
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, YEAR integer, RUNTIME text,
+                        DIRECTOR text, BOX_OFFICE integer, UNIQUE(TITLE))""")
+        db.c.executemany("""INSERT INTO MOVIES(TITLE, YEAR, RUNTIME, BOX_OFFICE)
+                            VALUES (?, ?, ?, ?)""",
+                         [('Memento', 2000, '113 min', 23844220),
+                          ('12 Angry Men', 1957, '96 min', 'N/A'),
+                          ('Sherlock', '2010–2017', '88 min', None)])
+    db.ensure_indexes()
+
+    # Table is rebuilt with its constraints and indexes, inside the open
+    # transaction, e.g. of the batch script
+    with db.transaction():
+        db.c.execute("DELETE FROM MOVIES WHERE title = 'Gods'")
+        assert db.ensure_types() == ['YEAR', 'RUNTIME', 'BOX_OFFICE']
+    assert 'MOVIES_RUNTIME' in db.index_manager.index_names()
+    with pytest.raises(sqlite3.IntegrityError):
+        db.c.execute("INSERT INTO MOVIES(TITLE) VALUES ('Memento')")
+
+    rows = db.execute_statement("""SELECT title, year, runtime, box_office
+                                   FROM MOVIES ORDER BY runtime DESC""")
+    assert [tuple(row) for row in rows] == [('Memento', 2000, 113, 23844220),
+                                            ('12 Angry Men', 1957, 96, None),
+                                            ('Sherlock', 2010, 88, None)]
+
+    # Conversion runs once, version of the database is left as it is
+    assert db.column_types.converted()
+    assert db.conn.execute('PRAGMA user_version').fetchone()[0] == 0
+    assert db.ensure_types() == []
+
+    # Text left by older versions in numeric columns is parsed in place
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, RUNTIME integer)""")
+        db.c.execute("INSERT INTO MOVIES(TITLE, RUNTIME) VALUES ('Sherlock', '2 h')")
+    assert db.ensure_types() == ['RUNTIME']
+    assert db.execute_statement("SELECT runtime FROM MOVIES")[0][0] == 120
+    assert db.ensure_types() == []
+
+    # Text column which can't be rebuilt isn't parsed
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, RUNTIME)""")
+        db.c.execute("INSERT INTO MOVIES(TITLE, RUNTIME) VALUES ('Sherlock', '2 h')")
+    assert db.ensure_types() == []
+    assert db.execute_statement("SELECT runtime FROM MOVIES")[0][0] == '2 h'
+    assert not db.column_types.converted()
+
+
+def test_ensure_relations():
+    """
+    Testing junction tables of the comma separated columns
+    :return:
+    """
+
+    db = DBConfig(db_name=':memory:')
+    with db.conn:
+        db.c.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, GENRE text, DIRECTOR text)""")
+        db.c.executemany("INSERT INTO MOVIES(TITLE, GENRE, DIRECTOR) VALUES (?, ?, ?)",
+                         [('Memento', 'Mystery, Thriller', 'Christopher Nolan'),
+                          ('Gods', None, 'N/A')])
+    assert db.ensure_relations()
+
+    # Quotes, backslashes and control characters are kept in the items
+    with db.conn:
+        db.c.execute("INSERT INTO MOVIES(TITLE, GENRE, DIRECTOR) VALUES (?, ?, ?)",
+                     ('In Bruges', 'Crime, Comedy, "Drama"\\',
+                      'Martin\tMcDonagh\x01'))
+        db.c.execute("UPDATE MOVIES SET GENRE = 'Drama' WHERE TITLE = 'Gods'")
+
+    rows = db.execute_statement("""SELECT title, name FROM MOVIE_GENRE
+                                   JOIN MOVIES ON MOVIES.ID = movie_id
+                                   ORDER BY title, name""")
+    assert [tuple(row) for row in rows] == [('Gods', 'Drama'),
+                                            ('In Bruges', '"Drama"\\'),
+                                            ('In Bruges', 'Comedy'),
+                                            ('In Bruges', 'Crime'),
+                                            ('Memento', 'Mystery'),
+                                            ('Memento', 'Thriller')]
+
+    rows = db.execute_statement("""SELECT name, role FROM MOVIE_PERSON
+                                   ORDER BY name""")
+    assert [tuple(row) for row in rows] == [
+        ('Christopher Nolan', 'director'), ('Martin\tMcDonagh\x01', 'director')]
+
+
 # @pytest.fixture(scope='module')
 # def titles(database):
 #     """ Getting empty titles from db for all tests """
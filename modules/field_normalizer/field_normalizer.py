@@ -0,0 +1,132 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+
+class FieldNormalizer:
+    """ Converting OMDb fields to typed values of the movies table, missing
+    values like 'N/A' are NULL in every column """
+
+    missing = frozenset(('', 'N/A', 'NONE', 'NULL'))  # Upper, stripped
+
+    year_pattern = re.compile(r'\d{4}')
+    runtime_pattern = re.compile(r'^\s*(?:(\d+)\s*h\w*)?\s*(?:(\d+)\s*(?:min)?)?'
+                                 r'\s*$', re.IGNORECASE)
+    number_pattern = re.compile(r'[^\d.]')
+
+    @classmethod
+    def is_missing(cls, value):
+        """
+        Checking if the value means no data
+        :param value:
+        :return:
+        """
+        return value is None or \
+            (isinstance(value, str) and value.strip().upper() in cls.missing)
+
+    @classmethod
+    def text(cls, value):
+        """
+        Text or None
+        :param value:
+        :return:
+        """
+        if cls.is_missing(value):
+            return None
+        return value
+
+    @classmethod
+    def year(cls, value):
+        """
+        First year of the value, e.g. 2008 of the series '2008–2013'
+        :param value:
+        :return:
+        """
+        if cls.is_missing(value):
+            return None
+        if isinstance(value, int):
+            return value
+
+        match = cls.year_pattern.search(str(value))
+        return int(match.group()) if match else None
+
+    @classmethod
+    def minutes(cls, value):
+        """
+        Runtime in minutes, e.g. 142 of '142 min' or '2 h 22 min'
+        :param value:
+        :return:
+        """
+        if cls.is_missing(value):
+            return None
+        if isinstance(value, int):
+            return value
+
+        match = cls.runtime_pattern.match(str(value))
+        if not match or not any(match.groups()):
+            return None
+
+        hours, minutes = match.groups()
+        return int(hours or 0) * 60 + int(minutes or 0)
+
+    @classmethod
+    def real(cls, value):
+        """
+        Floating point number, e.g. 8.4 of rating
+        :param value:
+        :return:
+        """
+        if cls.is_missing(value):
+            return None
+
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def integer(cls, value):
+        """
+        Integer of a formatted number, e.g. 23844220 of '$23,844,220'
+        :param value:
+        :return:
+        """
+        if cls.is_missing(value):
+            return None
+        if isinstance(value, int):
+            return value
+
+        try:
+            return int(Decimal(cls.number_pattern.sub('', str(value))))
+        except (InvalidOperation, ValueError):
+            return None
+
+    @classmethod
+    def column_parsers(cls):
+        """
+        Parsers of the numeric columns by their upper name
+        :return:
+        """
+        return {'YEAR': cls.year, 'RUNTIME': cls.minutes,
+                'IMDB_RATING': cls.real, 'IMDB_VOTES': cls.integer,
+                'BOX_OFFICE': cls.integer}
+
+    @classmethod
+    def normalize(cls, result):
+        """
+        Parameters of the update statement of the downloaded data
+        :param result: OMDb respond, KeyError if it has no data
+        :return:
+        """
+        return {'title': result['Title'],
+                'year': cls.year(result['Year']),
+                'runtime': cls.minutes(result['Runtime']),
+                'genre': cls.text(result['Genre']),
+                'director': cls.text(result['Director']),
+                'writer': cls.text(result['Writer']),
+                'cast': cls.text(result['Actors']),
+                'language': cls.text(result['Language']),
+                'country': cls.text(result['Country']),
+                'awards': cls.text(result['Awards']),
+                'imdbRating': cls.real(result['imdbRating']),
+                'imdbVotes': cls.integer(result['imdbVotes']),
+                'boxoffice': cls.integer(result['BoxOffice'])}
@@ -0,0 +1,53 @@
+import pytest
+
+from modules.field_normalizer.field_normalizer import FieldNormalizer
+
+
+def test_parsers():
+    """
+    Testing typed values of formatted fields
+    """
+
+    assert FieldNormalizer.minutes('142 min') == 142
+    assert FieldNormalizer.minutes('2 h 22 min') == 142
+    assert FieldNormalizer.year('2008–2013') == 2008
+    assert FieldNormalizer.real('8.4') == 8.4
+    assert FieldNormalizer.integer('1,062,060') == 1062060
+    assert FieldNormalizer.integer('$23,844,220') == 23844220
+
+    # Missing or invalid values are NULL
+    for parser in (FieldNormalizer.minutes, FieldNormalizer.year,
+                   FieldNormalizer.real, FieldNormalizer.integer,
+                   FieldNormalizer.text):
+        assert parser('N/A') is None
+        assert parser(None) is None
+    assert FieldNormalizer.minutes('unknown') is None
+    assert FieldNormalizer.integer('$') is None
+
+
+def test_normalize():
+    """
+    Testing parameters of the update statement
+    """
+
+    respond = {'Title': 'Memento', 'Year': '2000', 'Runtime': '113 min',
+               'Genre': 'Mystery, Thriller', 'Director': 'Christopher Nolan',
+               'Writer': 'N/A', 'Actors': 'Guy Pearce', 'Language': 'English',
+               'Country': 'United States', 'Awards': 'N/A',
+               'imdbRating': '8.4', 'imdbVotes': '1,062,060',
+               'BoxOffice': 'N/A', 'Response': 'True'}
+
+    parameters = FieldNormalizer.normalize(respond)
+
+    assert parameters['year'] == 2000
+    assert parameters['runtime'] == 113
+    assert parameters['imdbRating'] == 8.4
+    assert parameters['imdbVotes'] == 1062060
+    assert parameters['boxoffice'] is None
+    assert parameters['writer'] is None
+    assert parameters['director'] == 'Christopher Nolan'
+
+    # Fail case - respond without data
+    with pytest.raises(KeyError):
+        FieldNormalizer.normalize({'Response': 'False',
+                                   'Error': 'Movie not found!'})
@@ -0,0 +1,222 @@
+import itertools
+import json
+import queue
+import sqlite3
+import sys
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from modules.commands.data_compare.data_compare import DataCompare
+from modules.commands.data_filter.data_filter import DataFilter
+from modules.commands.data_highscores.data_highscores import DataHighscores
+from modules.commands.data_sort.data_sort import DataSorter
+from modules.db_config.db_config import DBConfig
+
+
+class ConnectionPool:
+    """ Read-only connections shared by the threads of the server """
+
+    def __init__(self, db_name, size=4, profile='read-heavy', timeout=30.0):
+        self.timeout = timeout  # Seconds of waiting for a free connection
+
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(DBConfig(db_name=db_name, profile=profile,
+                                          read_only=True))
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrowing a connection for a single query
+        :return:
+        """
+
+        db = self.connections.get(timeout=self.timeout)
+        try:
+            yield db
+        finally:
+            self.connections.put(db)
+
+    def close(self):
+        """
+        Closing every connection of the pool
+        :return:
+        """
+
+        while not self.connections.empty():
+            self.connections.get().conn.close()
+
+
+class QueryServer:
+    """ Long running HTTP server answering read-only commands """
+
+    def __init__(self, db_name, host='127.0.0.1', port=8080, pool_size=4,
+                 filter_mode='like', limit=1000):
+        self.db_name = db_name
+        self.host = host
+        self.port = port  # 0 picks a free port
+        self.pool_size = pool_size  # Queries executed at once
+        self.filter_mode = filter_mode  # Default mode of filtering
+        self.limit = limit  # Default max rows of a single respond
+
+        self.commands = ('sort_by', 'filter_by', 'compare', 'highscores')
+
+        self.pool = None
+        self.httpd = None
+
+    def prepare(self):
+        """
+        Writing everything the read-only connections need - WAL letting
+        readers work next to writers, indexes, stats, FTS and junction
+        tables of the filter mode
+        :return:
+        """
+
+        db = DBConfig(db_name=self.db_name, ensure_indexes=True,
+                      profile='read-heavy')
+        try:
+            db.ensure_stats()
+            if self.filter_mode == 'fts':
+                db.ensure_fts()
+            elif self.filter_mode == 'exact':
+                db.ensure_relations()
+        finally:
+            db.conn.close()
+
+    def start(self):
+        """
+        Opening the pool and binding the socket
+        :return: address of the server
+        """
+
+        self.prepare()
+        self.pool = ConnectionPool(self.db_name, size=self.pool_size)
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port),
+                                         QueryRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.query_server = self
+
+        return self.httpd.server_address
+
+    def serve_forever(self):
+        """
+        Answering requests until interrupted
+        :return:
+        """
+
+        host, port = self.start()
+        print(f'Serving {self.db_name} on http://{host}:{port}', file=sys.stderr)
+
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Closing the socket and connections
+        :return:
+        """
+
+        if self.httpd is not None:
+            self.httpd.server_close()
+        if self.pool is not None:
+            self.pool.close()
+
+    def handler(self, db, command, query):
+        """
+        Handler of the command with its parameter taken from the query
+        :param db:
+        :param command:
+        :param query: parsed query string
+        :return:
+        """
+
+        def value(name):
+            try:
+                return query[name][0]
+            except KeyError:
+                raise ValueError(f'Missing parameter: {name}')
+
+        if command == 'sort_by':
+            after = None
+            if 'after_id' in query:
+                after_value = query.get('after_value', [None])[0]
+                after = (after_value, int(value('after_id')))
+
+            limit = int(query.get('limit', [self.limit])[0])
+            order = query.get('order', ['desc'])[0]
+            return DataSorter(db=db, order=order, limit=limit,
+                              after=after), value('column')
+
+        if command == 'filter_by':
+            mode = query.get('mode', [self.filter_mode])[0]
+            return DataFilter(db=db, mode=mode), [value('column'), value('value')]
+
+        if command == 'compare':
+            movies = query.get('movie', [])
+            if len(movies) != 2:
+                raise ValueError('Two movie parameters are required')
+            return DataCompare(db=db), [value('column')] + movies
+
+        # Highscores
+        top_n = int(query.get('top', [1])[0])
+        return DataHighscores(db=db, columns=query.get('columns'),
+                              top_n=top_n), True
+
+    def query(self, path):
+        """
+        Answering single request
+        :param path: e.g. /filter_by?column=title&value=God
+        :return: tuple of HTTP status and respond
+        """
+
+        url = urlparse(path)
+        command = url.path.strip('/')
+        query = parse_qs(url.query)
+
+        if command not in self.commands:
+            return 404, {'Error': f'Unknown command: {command}'}
+
+        try:
+            limit = int(query.get('limit', [self.limit])[0])
+
+            with self.pool.connection() as db:
+                handler, parameter = self.handler(db, command, query)
+
+                rows = handler.stream(parameter=parameter)
+                try:
+                    results = [dict(row) for row in itertools.islice(rows, limit)]
+                finally:
+                    # Statement of not fully read rows is finished
+                    close = getattr(rows, 'close', None)
+                    if close is not None:
+                        close()
+        except queue.Empty:
+            return 503, {'Error': 'No free connection'}
+        except (sqlite3.OperationalError, ValueError) as e:
+            return 400, {'Error': str(e)}
+
+        return 200, results
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """ Passing GET requests to the query server """
+
+    def do_GET(self):
+        status, respond = self.server.query_server.query(self.path)
+        body = json.dumps(respond, default=str).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Logging every request would slow down busy dashboards
+        pass
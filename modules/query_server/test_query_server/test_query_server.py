@@ -0,0 +1,150 @@
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from modules.query_server.query_server import QueryServer
+
+
+@pytest.fixture(scope='module')
+def query_server(tmp_path_factory):
+    """ Setup of the server of the test database in background thread """
+
+    db_name = str(tmp_path_factory.mktemp('query_server') / 'movies.sqlite')
+
+    conn = sqlite3.connect(db_name)
+    with conn:
+        conn.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, YEAR integer, RUNTIME text, DIRECTOR text,
+                        IMDb_Rating float, IMDb_votes integer,
+                        BOX_OFFICE integer)""")
+        conn.executemany("""INSERT INTO MOVIES(TITLE, YEAR, IMDb_Rating)
+                            VALUES (?, ?, ?)""",
+                         [('Memento', 2000, 8.4), ('In Bruges', 2008, 7.9),
+                          ('Gods', 2008, None), ('The Godfather', 1972, 9.2)])
+    conn.close()
+
+    query_server = QueryServer(db_name=db_name, port=0, pool_size=2)
+    query_server.start()
+    thread = threading.Thread(target=query_server.httpd.serve_forever,
+                              daemon=True)
+    thread.start()
+
+    yield query_server
+
+    # Teardown
+    query_server.httpd.shutdown()
+    query_server.close()
+
+
+def get(query_server, path):
+    """
+    Status and respond of GET request
+    :param query_server:
+    :param path:
+    :return:
+    """
+
+    host, port = query_server.httpd.server_address
+    try:
+        with urlopen(f'http://{host}:{port}{path}') as respond:
+            return respond.status, json.loads(respond.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_query(query_server):
+    """
+    Testing commands answered by the server
+    :param query_server:
+    """
+
+    status, respond = get(query_server, '/sort_by?column=imdb_rating&limit=2')
+    assert status == 200
+    assert [row['TITLE'] for row in respond] == ['The Godfather', 'Memento']
+
+    status, respond = get(query_server,
+                          '/compare?column=imdb_rating&movie=Memento'
+                          '&movie=The%20Godfather')
+    assert respond == [{'TITLE': 'The Godfather', 'IMDb_Rating': 9.2}]
+
+    status, respond = get(query_server, '/highscores?columns=year&top=2')
+    assert respond == [{'col_name': 'year', 'max_val': 2008, 'title': 'Gods'},
+                       {'col_name': 'year', 'max_val': 2008,
+                        'title': 'In Bruges'},
+                       {'col_name': 'year', 'max_val': 2000,
+                        'title': 'Memento'}]
+
+    # Fail cases
+    assert get(query_server, '/sort_by?column=niema')[0] == 400
+    assert get(query_server, '/filter_by?column=title')[0] == 400
+    assert get(query_server, '/delete?title=Memento')[0] == 404
+
+
+def test_concurrent_queries(query_server):
+    """
+    Testing many queries at once sharing the pool
+    :param query_server:
+    """
+
+    paths = ['/filter_by?column=title&value=God', '/highscores'] * 50
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responds = list(executor.map(lambda path: get(query_server, path),
+                                     paths))
+
+    assert all(status == 200 for status, _ in responds)
+    assert responds[0][1] == [{'TITLE': 'Gods'}, {'TITLE': 'The Godfather'}]
+
+
+def test_read_only(query_server):
+    """
+    Testing connections of the pool can't write
+    :param query_server:
+    """
+
+    with query_server.pool.connection() as db:
+        assert db.pragma_values()['journal_mode'] == 'wal'
+
+        with pytest.raises(sqlite3.OperationalError):
+            db.c.execute("DELETE FROM MOVIES")
+
+
+def test_exact_mode(tmp_path):
+    """
+    Testing junction tables written before the read-only pool is opened
+    :param tmp_path:
+    """
+
+    db_name = str(tmp_path / 'movies.sqlite')
+
+    conn = sqlite3.connect(db_name)
+    with conn:
+        conn.execute("""CREATE TABLE MOVIES (ID INTEGER PRIMARY KEY,
+                        TITLE text, GENRE text, DIRECTOR text)""")
+        conn.executemany("INSERT INTO MOVIES(TITLE, GENRE) VALUES (?, ?)",
+                         [('Memento', 'Mystery, Thriller'),
+                          ('In Bruges', 'Comedy, Crime, Drama'),
+                          ('The Godfather', 'Crime, Drama')])
+    conn.close()
+
+    query_server = QueryServer(db_name=db_name, port=0, pool_size=1,
+                               filter_mode='exact')
+    query_server.start()
+    thread = threading.Thread(target=query_server.httpd.serve_forever,
+                              daemon=True)
+    thread.start()
+
+    try:
+        status, respond = get(query_server,
+                              '/filter_by?column=genre&value=crime')
+        assert status == 200
+        assert [row['TITLE'] for row in respond] == ['In Bruges',
+                                                    'The Godfather']
+    finally:
+        query_server.httpd.shutdown()
+        query_server.close()
@@ -0,0 +1,127 @@
+import itertools
+import json
+import sys
+
+
+class TableRenderer:
+    """ Writing results row by row as a table, tsv or json lines """
+
+    def __init__(self, output_format='table', stream=None, sample_size=100,
+                 chunk_size=500, max_width=60):
+        self.output_format = output_format  # 'table', 'tsv' or 'jsonl'
+        self.stream = stream or sys.stdout  # Where the results are written
+        self.sample_size = sample_size  # Rows sizing the columns of table
+        self.chunk_size = chunk_size  # Rows written by single write
+        self.max_width = max_width  # Widest column of table
+
+        self.rows_written = 0
+
+    def render(self, results):
+        """
+        Writing every result, only a chunk of rows is kept in memory
+        :param results: rows, dicts or ready to print string
+        :return: number of written rows
+        """
+
+        if isinstance(results, str):
+            # Ready to print string
+            self.stream.write(results + '\n')
+            return 0
+
+        rows = iter(results)
+        sample = list(itertools.islice(rows, self.sample_size))
+        if not sample:
+            # Empty results case
+            raise IndexError('No results')
+
+        keys = list(sample[0].keys())
+        format_line = self.line_formatter(keys, sample)
+
+        header = self.header(keys, format_line)
+        if header is not None:
+            self.stream.write(header)
+
+        chunk = []
+        for row in itertools.chain(sample, rows):
+            chunk.append(format_line([row[key] for key in keys]))
+
+            if len(chunk) >= self.chunk_size:
+                self.write_chunk(chunk)
+                chunk = []
+
+        self.write_chunk(chunk)
+
+        if self.output_format == 'table':
+            self.stream.write('\n')
+        self.stream.flush()
+
+        return self.rows_written
+
+    def write_chunk(self, chunk):
+        """
+        Writing formatted lines at once
+        :param chunk:
+        :return:
+        """
+
+        if chunk:
+            self.stream.write('\n'.join(chunk) + '\n')
+            self.rows_written += len(chunk)
+
+    def header(self, keys, format_line):
+        """
+        First lines of the output
+        :param keys:
+        :param format_line:
+        :return:
+        """
+
+        if self.output_format == 'table':
+            return '\n' + format_line(keys) + '\n'
+        if self.output_format == 'tsv':
+            return format_line(keys) + '\n'
+
+        # Keys are part of every json line
+        return None
+
+    def line_formatter(self, keys, sample):
+        """
+        Function formatting values of a single row
+        :param keys:
+        :param sample: first rows sizing the columns of table
+        :return:
+        """
+
+        if self.output_format == 'jsonl':
+            return lambda values: json.dumps(dict(zip(keys, values)),
+                                             default=str)
+
+        if self.output_format == 'tsv':
+            return lambda values: '\t'.join(self.tsv_value(value)
+                                            for value in values)
+
+        if self.output_format != 'table':
+            raise ValueError(f'Unknown output format: {self.output_format}')
+
+        # Widths fitting the sampled values, longer values widen their cell
+        widths = []
+        for key in keys:
+            width = max([len(str(key))] + [len(str(row[key])) for row in sample])
+            widths.append(min(width, self.max_width))
+
+        template = ''.join(f'{{:{width}}} | ' for width in widths)
+
+        return lambda values: template.format(*(str(value) for value in values))
+
+    @staticmethod
+    def tsv_value(value):
+        """
+        Value in a single tsv field
+        :param value:
+        :return:
+        """
+
+        if value is None:
+            return ''
+
+        return str(value).replace('\t', ' ').replace('\n', ' ')
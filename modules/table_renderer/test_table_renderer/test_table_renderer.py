@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from modules.table_renderer.table_renderer import TableRenderer
+
+
+@pytest.fixture(scope='module')
+def results():
+    """ Results of a command to render """
+
+    results = [{'Title': 'Memento', 'Year': 2000, 'Box_office': None},
+               {'Title': 'The Shawshank\tRedemption', 'Year': 1994,
+                'Box_office': 28341469}]
+
+    yield results
+
+
+def test_render_table(results):
+    """
+    Testing table sized by the sampled rows
+    :param results:
+    """
+
+    stream = io.StringIO()
+    renderer = TableRenderer(stream=stream, chunk_size=1)
+
+    assert renderer.render(iter(results)) == 2
+
+    lines = stream.getvalue().split('\n')
+    assert lines[1] == 'Title'.ljust(24) + ' | Year | Box_office | '
+    assert lines[2] == 'Memento'.ljust(24) + ' | 2000 | None       | '
+
+    # Values after the sample don't change widths
+    stream = io.StringIO()
+    TableRenderer(stream=stream, sample_size=1).render(results)
+    assert stream.getvalue().split('\n')[1] == 'Title   | Year | Box_office | '
+
+    # Fail case - empty results
+    with pytest.raises(IndexError):
+        TableRenderer(stream=io.StringIO()).render(iter([]))
+
+
+def test_render_machine_formats(results):
+    """
+    Testing tsv and json lines
+    :param results:
+    """
+
+    stream = io.StringIO()
+    TableRenderer(output_format='tsv', stream=stream).render(results)
+    assert stream.getvalue() == ('Title\tYear\tBox_office\n'
+                                 'Memento\t2000\t\n'
+                                 'The Shawshank Redemption\t1994\t28341469\n')
+
+    stream = io.StringIO()
+    TableRenderer(output_format='jsonl', stream=stream).render(results)
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == results
+
+    # Fail case - unknown format
+    with pytest.raises(ValueError):
+        TableRenderer(output_format='xml', stream=io.StringIO()).render(results)
@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from modules.title_reader.title_reader import TitleReader
+
+
+def test_formats(tmp_path):
+    """
+    Testing titles read from every format
+    :param tmp_path:
+    """
+
+    lines = tmp_path / 'titles.txt'
+    lines.write_text('Memento\n\n In Bruges \n')
+    assert list(TitleReader(str(lines))) == ['Memento', 'In Bruges']
+
+    with_header = tmp_path / 'titles.csv'
+    with_header.write_text('year,Title\n2000,Memento\n2008,"Gods, Part 2"\n')
+    assert list(TitleReader(str(with_header))) == ['Memento', 'Gods, Part 2']
+
+    without_header = tmp_path / 'no_header.csv'
+    without_header.write_text('Memento,2000\nIn Bruges,2008\n')
+    assert list(TitleReader(str(without_header))) == ['Memento', 'In Bruges']
+
+    json_lines = tmp_path / 'titles.jsonl'
+    json_lines.write_text('{"Title": "Memento"}\n"In Bruges"\n{"title": 5649}\n')
+    reader = TitleReader(str(json_lines))
+    assert list(reader) == ['Memento', 'In Bruges', '5649']
+    assert reader.titles_read == 3
+
+    # Format given explicitly
+    assert list(TitleReader(str(lines), input_format='csv')) == ['Memento',
+                                                                  'In Bruges']
+
+    # Fail case - broken json line
+    json_lines.write_text('{"Title": "Memento"\n')
+    with pytest.raises(ValueError):
+        list(TitleReader(str(json_lines)))
+
+
+def test_stdin(monkeypatch):
+    """
+    Testing titles read from stdin
+    :param monkeypatch:
+    """
+
+    monkeypatch.setattr('sys.stdin', io.StringIO('Memento\nIn Bruges\n'))
+    assert list(TitleReader('-')) == ['Memento', 'In Bruges']
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import sys
+
+
+class TitleReader:
+    """ Streaming titles from a file or stdin, one title per line,
+    csv with title column or json lines """
+
+    def __init__(self, source, input_format=None):
+        self.source = source  # Path of the file, '-' is stdin
+        self.input_format = input_format or self.guess_format(source)
+
+        self.titles_read = 0
+
+    @staticmethod
+    def guess_format(source):
+        """
+        Format of the file by its extension, stdin is read by lines
+        :param source:
+        :return:
+        """
+
+        extension = os.path.splitext(str(source))[1].lower()
+
+        if extension == '.csv':
+            return 'csv'
+        if extension in ('.jsonl', '.json', '.ndjson'):
+            return 'jsonl'
+
+        return 'lines'
+
+    def __iter__(self):
+        """
+        Iterating over not empty titles of the source
+        :return:
+        """
+
+        if self.source == '-':
+            yield from self.titles(sys.stdin)
+        else:
+            with open(self.source, newline='', encoding='utf-8') as file:
+                yield from self.titles(file)
+
+    def titles(self, file):
+        """
+        Titles of the opened file
+        :param file:
+        :return:
+        """
+
+        if self.input_format == 'csv':
+            values = self.csv_values(file)
+        elif self.input_format == 'jsonl':
+            values = self.jsonl_values(file)
+        else:
+            values = file
+
+        for value in values:
+            title = str(value).strip()
+
+            if title:
+                self.titles_read += 1
+                yield title
+
+    @staticmethod
+    def csv_values(file):
+        """
+        Values of title column, first column if there is no header
+        :param file:
+        :return:
+        """
+
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = [column.strip().lower() for column in header]
+        if 'title' in columns:
+            index = columns.index('title')
+        else:
+            # First row is a title as well
+            index = 0
+            if header:
+                yield header[index]
+
+        for row in reader:
+            if len(row) > index:
+                yield row[index]
+
+    @staticmethod
+    def jsonl_values(file):
+        """
+        Titles of json lines, either strings or objects with title key
+        :param file:
+        :return:
+        """
+
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'Invalid json in line {line_number}: {e}')
+
+            if isinstance(value, dict):
+                value = value.get('title', value.get('Title', ''))
+
+            yield value
@@ -1,15 +1,88 @@
+import importlib
+import io
 import sqlite3
+import sys
 
 from modules.cli.cli import CLInterface
-from modules.commands.data_compare.data_compare import DataCompare
-from modules.commands.data_delete.data_delete import DataDelete
-from modules.commands.data_filter.data_filter import DataFilter
-from modules.commands.data_highscores.data_highscores import DataHighscores
-from modules.commands.data_insert.data_insert import DataInsert
-from modules.commands.data_sort.data_sort import DataSorter
-from modules.commands.data_update.data_update import DataUpdater
-from modules.csv_writer.csv_writer import CSVWriter
 from modules.db_config.db_config import DBConfig
+from modules.table_renderer.table_renderer import TableRenderer
+
+# Classes imported only when they are used, names stay importable from here
+LAZY_IMPORTS = {
+    'ArrowWriter': 'modules.arrow_writer.arrow_writer',
+    'BatchRunner': 'modules.batch_runner.batch_runner',
+    'CSVWriter': 'modules.csv_writer.csv_writer',
+    'DataBulkDelete': 'modules.commands.data_delete.data_delete',
+    'DataBulkInsert': 'modules.commands.data_insert.data_insert',
+    'DataCompare': 'modules.commands.data_compare.data_compare',
+    'DataCounts': 'modules.commands.data_counts.data_counts',
+    'DataDelete': 'modules.commands.data_delete.data_delete',
+    'DataFilter': 'modules.commands.data_filter.data_filter',
+    'DataHighscores': 'modules.commands.data_highscores.data_highscores',
+    'DataIndexes': 'modules.commands.data_indexes.data_indexes',
+    'DataInsert': 'modules.commands.data_insert.data_insert',
+    'DataSorter': 'modules.commands.data_sort.data_sort',
+    'DataStats': 'modules.commands.data_stats.data_stats',
+    'DataUpdater': 'modules.commands.data_update.data_update',
+    'QueryServer': 'modules.query_server.query_server'}
+
+# Keyword of the command, class of its handler and options of the handler
+HANDLERS = {
+    'update': ('DataUpdater', lambda commands: {
+        'mode': commands['update_mode'],
+        'max_requests': commands['max_requests'],
+        'timeout': commands['timeout'],
+        'retries': commands['retries'],
+        'batch_size': commands['batch_size'],
+        'cache_path': commands['cache'],
+        'cache_ttl': commands['cache_ttl'],
+        'rate': commands['rate'],
+        'daily_budget': commands['daily_budget'],
+        'max_attempts': commands['max_attempts']}),
+    'sort_by': ('DataSorter', lambda commands: {
+        'order': commands['order'],
+        'limit': commands['limit'],
+        'after': commands['after']}),
+    'filter_by': ('DataFilter', lambda commands: {
+        'mode': commands['filter_mode']}),
+    'compare': ('DataCompare', lambda commands: {}),
+    'insert': ('DataInsert', lambda commands: {}),
+    'insert_from': ('DataBulkInsert', lambda commands: {
+        'batch_size': commands['batch_size'],
+        'input_format': commands['input_format']}),
+    'delete': ('DataDelete', lambda commands: {}),
+    'delete_from': ('DataBulkDelete', lambda commands: {
+        'batch_size': commands['batch_size'],
+        'input_format': commands['input_format']}),
+    'highscores': ('DataHighscores', lambda commands: {
+        'columns': commands['highscores_columns'],
+        'top_n': commands['top']}),
+    'stats': ('DataStats', lambda commands: {}),
+    'counts': ('DataCounts', lambda commands: {}),
+    'ensure_indexes': ('DataIndexes', lambda commands: {})}
+
+
+def load(name):
+    """
+    Importing the class by its name
+    :param name:
+    :return:
+    """
+    module = importlib.import_module(LAZY_IMPORTS[name])
+    return getattr(module, name)
+
+
+def __getattr__(name):
+    """
+    Lazy access to the classes, e.g. from movies_db import DataFilter
+    :param name:
+    :return:
+    """
+
+    if name in LAZY_IMPORTS:
+        return load(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class Main:
@@ -25,60 +98,120 @@ class Main:
         # Parse commands from args
         commands = CLInterface.get_args()
 
-        # Initialization of DB connection
+        # Initialization of DB connection, opened as it is - indexes are
+        # created by --ensure_indexes, bulk inserts, deletes and the update
         db_name = commands['db_name']
-        db = DBConfig(db_name=db_name)
 
-        # Available handlers of commands
-        handlers = [DataUpdater(db=db), DataSorter(db=db), DataFilter(db=db),
-                    DataCompare(db=db), DataInsert(db=db),
-                    DataDelete(db=db), DataHighscores(db=db)]
+        # Long running server instead of single commands
+        if commands['serve']:
+            query_server = load('QueryServer')(
+                db_name=db_name, host=commands['host'], port=commands['port'],
+                pool_size=commands['pool_size'],
+                filter_mode=commands['filter_mode'])
+            query_server.serve_forever()
+            return
+
+        db = DBConfig(db_name=db_name, arraysize=commands['arraysize'],
+                      profile=commands['profile'])
+
+        # Script of commands run on this connection
+        if commands['batch']:
+            Main.run_batch(commands, db)
+            return
+
+        # Handlers of the given commands only, others aren't even imported
+        handlers = [Main.create_handler(keyword, db, commands)
+                    for keyword in HANDLERS if commands.get(keyword)]
 
         # Performing commands
         Main.handle_commands(commands=commands, handlers=handlers)
 
     @staticmethod
-    def format_results(results):
+    def create_handler(keyword, db, commands):
         """
-        Return formatted result
-        :param results:
+        Creating handler of the command with its options
+        :param keyword:
+        :param db:
+        :param commands:
         :return:
         """
 
-        try:
-            keys = results[0].keys()
-        except IndexError as e:
-            # Empty results case
-            raise e
-        except AttributeError:
-            # Ready to print string
-            return results
+        name, options = HANDLERS[keyword]
+        return load(name)(db=db, **options(commands))
 
-        formatted_results = '\n'  # Newline for styling
+    @staticmethod
+    def run_batch(commands, db):
+        """
+        Running commands of the batch script
+        :param commands: options of the program
+        :param db:
+        :return:
+        """
 
-        for key in keys:
-            formatted_results += ('{:30}'.format(str(key)) + " | ")
+        def output(key, results, line_commands):
+            # Format of the program unless the line sets its own
+            output_format = line_commands['output_format']
+            if output_format == 'table':
+                output_format = commands['output_format']
+
+            Main.return_output(write_csv=line_commands['write_csv'], key=key,
+                               results=results, output_format=output_format,
+                               csv_path=line_commands['csv_path'],
+                               compression=line_commands['compression'],
+                               export_format=line_commands['export_format'],
+                               export_path=line_commands['export_path'],
+                               db=db)
+
+        batch_runner = load('BatchRunner')(
+            db=db, create_handler=Main.create_handler, output=output,
+            keywords=tuple(HANDLERS),
+            transaction_size=commands['transaction_size'])
+
+        try:
+            batch_runner.run(commands['batch'])
+        except (OSError, ValueError) as e:
+            print(str(e))
 
-        formatted_results += '\n'
+    @staticmethod
+    def format_results(results):
+        """
+        Return formatted result
+        :param results:
+        :return:
+        """
 
-        for res in results:
-            for key in res.keys():
-                part = res[f'{key}']
-                formatted_results += ('{:30}'.format(str(part)) + " | ")
-            formatted_results += '\n'
+        formatted_results = io.StringIO()
+        TableRenderer(stream=formatted_results).render(results)
 
-        return formatted_results
+        return formatted_results.getvalue()
 
     @staticmethod
-    def return_output(write_csv, key, results):
-        if write_csv:
-            # User wants to print to csv
-            csv_writer = CSVWriter()
+    def return_output(write_csv, key, results, output_format='table',
+                      csv_path=None, compression=None, export_format=None,
+                      export_path=None, db=None):
+        if export_format:
+            # User wants typed columnar file, rows are written in batches,
+            # columns of the movies table are typed as declared
+            declared_types = {}
+            if db is not None:
+                declared_types = {
+                    column: declared_type for column, (_, declared_type)
+                    in db.column_types.declared_types().items()}
+
+            arrow_writer = load('ArrowWriter')(path=export_path,
+                                               file_format=export_format,
+                                               declared_types=declared_types)
+            arrow_writer.write(keyword=key, data=results)
+            print(arrow_writer.report(), file=sys.stderr)
+        elif write_csv:
+            # User wants to print to csv, rows are written as they are fetched
+            csv_writer = load('CSVWriter')(path=csv_path,
+                                           compression=compression)
             csv_writer.write_csv(keyword=key, data=results)
+            print(csv_writer.report(), file=sys.stderr)
         else:
-            # Standard print to console
-            formatted_results = Main.format_results(results)
-            print(formatted_results)
+            # Standard print to console, rows are printed as they are fetched
+            TableRenderer(output_format=output_format).render(results)
 
     @staticmethod
     def handle_commands(commands, handlers):
@@ -92,6 +225,11 @@ class Main:
         list_of_commands = tuple([command for command in commands.keys()
                                   if command != 'write_csv'])
         write_csv = commands['write_csv']
+        output_format = commands.get('output_format') or 'table'
+        csv_path = commands.get('csv_path')
+        compression = commands.get('compression')
+        export_format = commands.get('export_format')
+        export_path = commands.get('export_path')
 
         for key in list_of_commands:
 
@@ -101,14 +239,22 @@ class Main:
                     if key == handler.get_keyword():
                         param = commands[key]
                         try:
-                            results = handler.handle(parameter=param)
-                        except sqlite3.OperationalError as e:
+                            results = handler.stream(parameter=param)
+                        except (sqlite3.OperationalError, OSError,
+                                ValueError) as e:
+                            # E.g. missing column or file of titles
                             print(str(e))
                             break
 
                         try:
                             Main.return_output(write_csv=write_csv, key=key,
-                                               results=results)
+                                               results=results,
+                                               output_format=output_format,
+                                               csv_path=csv_path,
+                                               compression=compression,
+                                               export_format=export_format,
+                                               export_path=export_path,
+                                               db=handler.db)
                         except IndexError:
                             print(handler.get_keyword() +
                                   ' error: No results found for ' + str(param))